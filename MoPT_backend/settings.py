@@ -43,14 +43,16 @@ INSTALLED_APPS = [
     "ai_insights",
     "campaigns",
     "reports",
-    # 둘 다 살림: HEAD에서 추가된 DRF, main에서 추가된 integrations
-    "rest_framework",
     "integrations",
     "django_extensions",
     "corsheaders",
     "users.apps.UsersConfig",
 ]
 
+# 레거시 경로(/api/insights, /api/dashboard) 연결 여부
+# - 레거시 뷰는 ninja(/api/v1) 빌더를 재사용하는 얇은 어댑터라 DRF 가 필요 없음
+LEGACY_API_ENABLED = os.getenv("LEGACY_API_ENABLED", "1") == "1"
+
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -101,6 +103,22 @@ else:
         }
     }
 
+# Cache
+# - 기본은 프로세스 로컬 메모리. 워커가 여러 개면 공유 백엔드를 지정
+#   (예: DJANGO_CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache,
+#        DJANGO_CACHE_LOCATION=django_cache → manage.py createcachetable)
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "mopt-default"),
+    }
+}
+
+# 인사이트 상세 응답 캐시 TTL(초). 변경 시 시그널로 즉시 무효화됨
+INSIGHT_DETAIL_CACHE_TTL = int(os.getenv("INSIGHT_DETAIL_CACHE_TTL", "300"))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -158,8 +176,20 @@ LAWD_CODE_API_BASE = os.getenv(
 LAWD_API_KEY = os.getenv("LAWD_API_KEY")  # Encoding Key 그대로
 LAWD_API_TIMEOUT = float(os.getenv("LAWD_API_TIMEOUT", "6.0"))
 
+# 법정동 목록 조회 경로(odcloud uddi 경로, 예: "/uddi:xxxx"). 비우면 BASE 그대로 호출
+LAWD_CODE_API_PATH = os.getenv("LAWD_CODE_API_PATH", "")
+
 # sdsc2 동코드 파라미터명(대부분 'key' 사용, 필요하면 'adm_cd' 등으로 교체)
 SDSC_PARAM_KEY_NAME = os.getenv("SDSC_PARAM_KEY_NAME", "key")
+# sdsc2 동코드 구분값(divId).
+# Region.code 는 법정동 코드 API 에서 가져오므로 'ldongCd' (행정동 코드를 쓰면 'adongCd')
+SDSC_DIV_ID = os.getenv("SDSC_DIV_ID", "ldongCd")
+
+# 공공데이터 클라이언트: 커넥션 풀/재시도/동시 요청 수/응답 캐시 TTL(초)
+PUBLIC_API_MAX_WORKERS = int(os.getenv("PUBLIC_API_MAX_WORKERS", "8"))
+PUBLIC_API_RETRIES = int(os.getenv("PUBLIC_API_RETRIES", "3"))
+PUBLIC_API_BACKOFF = float(os.getenv("PUBLIC_API_BACKOFF", "0.5"))
+PUBLIC_API_CACHE_TTL = int(os.getenv("PUBLIC_API_CACHE_TTL", str(60 * 60 * 24)))
 
 # ----------------------------
 # OAuth provider config (main에서 추가된 항목) - 그대로 유지
@@ -167,14 +197,137 @@ SDSC_PARAM_KEY_NAME = os.getenv("SDSC_PARAM_KEY_NAME", "key")
 INTEGRATIONS_OAUTH = {
     "facebook": {
         "client_id": os.getenv("FB_CLIENT_ID", ""),
+        "client_secret": os.getenv("FB_CLIENT_SECRET", ""),
         "auth_base": "https://www.facebook.com/v20.0/dialog/oauth",
+        # 비어 있으면 토큰 교환/계정 조회/갱신은 더미(개발용) 응답
+        # 예) https://graph.facebook.com/v20.0
+        "graph_base": os.getenv("FB_GRAPH_BASE", ""),
+        # 토큰 갱신 엔드포인트만 따로 지정할 때
+        # (기본: {graph_base}/oauth/access_token?grant_type=fb_exchange_token)
+        "token_url": os.getenv("FB_TOKEN_URL", ""),
     },
     "instagram": {
         # Instagram Basic도 Facebook OAuth Dialog를 사용
         "client_id": os.getenv("FB_APP_CLIENT_ID_FOR_IG", ""),
+        "client_secret": os.getenv("FB_APP_CLIENT_SECRET_FOR_IG", ""),
         "auth_base": "https://www.facebook.com/v20.0/dialog/oauth",
+        # 예) https://graph.instagram.com
+        "graph_base": os.getenv("IG_GRAPH_BASE", ""),
+        # 기본: {graph_base}/refresh_access_token?grant_type=ig_refresh_token
+        "token_url": os.getenv("IG_TOKEN_URL", ""),
+    },
+}
+
+# 프로바이더 HTTP 어댑터 (integrations.providers)
+# - 프로바이더별 세션 1개(커넥션 풀), 재시도(지수 백오프 + jitter), 서킷 브레이커
+INTEGRATIONS_HTTP = {
+    "connect_timeout": float(os.getenv("INTEGRATIONS_CONNECT_TIMEOUT", "3.05")),
+    "read_timeout": float(os.getenv("INTEGRATIONS_READ_TIMEOUT", "10.0")),
+    "retries": int(os.getenv("INTEGRATIONS_RETRIES", "3")),
+    "backoff": float(os.getenv("INTEGRATIONS_BACKOFF", "0.3")),
+    "backoff_cap": float(os.getenv("INTEGRATIONS_BACKOFF_CAP", "5.0")),
+    "pool_size": int(os.getenv("INTEGRATIONS_POOL_SIZE", "16")),
+    # 연속 실패 N회 → reset 초 동안 즉시 실패
+    "breaker_failures": int(os.getenv("INTEGRATIONS_BREAKER_FAILURES", "5")),
+    "breaker_reset": float(os.getenv("INTEGRATIONS_BREAKER_RESET", "30")),
+}
+
+# 외부 호출 속도 제한 (integrations.rate_limits, 토큰 버킷 — DB 로 워커 간 공유)
+# - 키: 프로바이더 code (POS 벤더는 "pos"), 값: rate = 초당 토큰, burst = 버킷 크기
+# - 어댑터 호출은 (프로바이더, 계정) 단위 버킷에서 1개씩 차감, 설정 없는 키는 제한 없음
+# - MAX_WAIT: 토큰을 기다리는 최대 초 (넘으면 일시적 실패로 처리)
+PROVIDER_RATE_LIMITS = {
+    "facebook": {
+        "rate": float(os.getenv("FB_RATE_LIMIT", "5")),
+        "burst": float(os.getenv("FB_RATE_BURST", "20")),
+    },
+    "instagram": {
+        "rate": float(os.getenv("IG_RATE_LIMIT", "5")),
+        "burst": float(os.getenv("IG_RATE_BURST", "20")),
     },
 }
+if os.getenv("POS_RATE_LIMIT"):
+    PROVIDER_RATE_LIMITS["pos"] = {
+        "rate": float(os.getenv("POS_RATE_LIMIT")),
+        "burst": float(os.getenv("POS_RATE_BURST") or os.getenv("POS_RATE_LIMIT")),
+    }
+PROVIDER_RATE_LIMIT_MAX_WAIT = float(os.getenv("PROVIDER_RATE_LIMIT_MAX_WAIT", "10"))
+
+# 프로바이더 카탈로그(integrations.catalog) 메모리 스냅샷 최대 보관 초
+# - 관리자 변경은 시그널로 바로 무효화, 공유 캐시가 없을 때 다른 워커 반영 지연 상한
+PROVIDER_CATALOG_TTL = int(os.getenv("PROVIDER_CATALOG_TTL", "300"))
+
+# 광고 성과 동기화 (sync_ad_insights, integrations.ad_sync)
+# - 처음에는 INITIAL_DAYS 일, 이후에는 high-water mark 의 LOOKBACK 일 전부터
+#   (플랫폼 기여 기간 동안 최근 일자 수치가 바뀌므로 다시 받음)
+# - WINDOW_DAYS 일 단위로 나눈 요청을 Graph batch 호출 1번에 최대 BATCH 개
+AD_SYNC = {
+    "initial_days": int(os.getenv("AD_SYNC_INITIAL_DAYS", "30")),
+    "lookback_days": int(os.getenv("AD_SYNC_LOOKBACK_DAYS", "3")),
+    "window_days": int(os.getenv("AD_SYNC_WINDOW_DAYS", "7")),
+    "batch": int(os.getenv("AD_SYNC_BATCH", "50")),
+    "page_limit": int(os.getenv("AD_SYNC_PAGE_LIMIT", "500")),
+    "workers": int(os.getenv("AD_SYNC_WORKERS", "4")),
+}
+
+# 토큰 선제 갱신 (refresh_integration_tokens)
+# - 만료까지 WINDOW 분 이내인 활성 연동을 갱신, 프로바이더별 동시 요청 수 제한
+# - LEASE 초 동안 선점 (여러 실행이 같은 refresh_token 을 두 번 쓰지 않도록)
+TOKEN_REFRESH_WINDOW_MINUTES = int(os.getenv("TOKEN_REFRESH_WINDOW_MINUTES", "1440"))
+TOKEN_REFRESH_PER_PROVIDER = int(os.getenv("TOKEN_REFRESH_PER_PROVIDER", "4"))
+TOKEN_REFRESH_MAX_WORKERS = int(os.getenv("TOKEN_REFRESH_MAX_WORKERS", "16"))
+TOKEN_REFRESH_LEASE_SECONDS = int(os.getenv("TOKEN_REFRESH_LEASE_SECONDS", "300"))
+
+# POS 웹훅 수신 (POST /api/v1/integrations/pos/webhooks/{connection_id})
+# - 서명: HMAC-SHA256(webhook_signing_secret, "{timestamp}." + body)
+# - 타임스탬프가 TOLERANCE 초 이상 차이 나면 거부 (재전송 공격 방지)
+POS_WEBHOOK_TOLERANCE_SECONDS = int(os.getenv("POS_WEBHOOK_TOLERANCE_SECONDS", "300"))
+POS_WEBHOOK_MAX_BODY_BYTES = int(os.getenv("POS_WEBHOOK_MAX_BODY_BYTES", "65536"))
+# 연결별 서명 키 프로세스 캐시 (초) — 연결 해제/키 변경 반영 지연 상한
+POS_WEBHOOK_SECRET_CACHE_TTL = int(os.getenv("POS_WEBHOOK_SECRET_CACHE_TTL", "60"))
+# 동시 요청의 staging INSERT 를 한 트랜잭션으로 묶음 (gunicorn --threads 와 함께)
+POS_WEBHOOK_GROUP_COMMIT = os.getenv("POS_WEBHOOK_GROUP_COMMIT", "1") == "1"
+
+# 재전송 중복 제거 키 (integrations.idempotency, IdempotencyKey)
+# - TTL_SECONDS: 키 보관 기간 — 프로바이더 재전송 기간과 staging 보관(--purge-days)보다 길게
+# - MEMORY_SIZE: 프로세스 메모리 앞단 캐시 최대 키 수 (LRU)
+# - SWEEP_BATCH: purge_idempotency_keys 가 한 번에 지우는 행 수
+IDEMPOTENCY = {
+    "ttl_seconds": int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(7 * 24 * 3600))),
+    "memory_size": int(os.getenv("IDEMPOTENCY_MEMORY_SIZE", "100000")),
+    "sweep_batch": int(os.getenv("IDEMPOTENCY_SWEEP_BATCH", "5000")),
+}
+
+# POS 헬스체크 heartbeat (integrations.heartbeats)
+# - last_ping_at 을 메모리에 모았다가 FLUSH 초마다 한 번에 UPDATE
+# - 캐시 TTL 동안은 조회 시 캐시 값이 DB 보다 최신이면 그 값을 사용
+POS_HEARTBEAT_FLUSH_SECONDS = float(os.getenv("POS_HEARTBEAT_FLUSH_SECONDS", "30"))
+POS_HEARTBEAT_CACHE_TTL = int(os.getenv("POS_HEARTBEAT_CACHE_TTL", "600"))
+
+# POS 벤더 API 주소 (헬스: {base}/stores/{store}/health, 매출: {base}/stores/{store}/sales)
+# - 비어 있으면 그 벤더는 점검/백필하지 않음
+POS_API_BASE_URLS = {
+    "brand_a": os.getenv("POS_BRAND_A_BASE", ""),
+    "brand_b": os.getenv("POS_BRAND_B_BASE", ""),
+}
+
+# POS 연결 일괄 점검 (probe_pos_connections, integrations.pos_probe)
+POS_PROBE = {
+    "concurrency": int(os.getenv("POS_PROBE_CONCURRENCY", "200")),
+    "per_provider": int(os.getenv("POS_PROBE_PER_PROVIDER", "100")),
+    "timeout": float(os.getenv("POS_PROBE_TIMEOUT", "5.0")),
+}
+
+# POS 과거 매출 백필 (backfill_pos_sales, integrations.pos_backfill)
+# - 연결 생성 시 DAYS 일 전 ~ 연결 시각까지 작업 등록
+# - 벤더 요청 속도는 PROVIDER_RATE_LIMITS["pos"] (POS_RATE_LIMIT, 프로세스 간 공유)
+POS_BACKFILL = {
+    "days": int(os.getenv("POS_BACKFILL_DAYS", "180")),
+    "workers": int(os.getenv("POS_BACKFILL_WORKERS", "4")),
+    "page_size": int(os.getenv("POS_BACKFILL_PAGE_SIZE", "500")),
+    "batch_size": int(os.getenv("POS_BACKFILL_BATCH_SIZE", "5000")),
+    "lease_seconds": int(os.getenv("POS_BACKFILL_LEASE_SECONDS", "600")),
+}
 
 # Koyeb 프록시 뒤에서 https 처리
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
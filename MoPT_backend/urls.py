@@ -14,6 +14,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 from ninja import NinjaAPI
@@ -30,11 +31,14 @@ api = NinjaAPI(title="MoPT API", version="1.0", urls_namespace="api-v1")
 api.add_router("/insights", insights_router, tags=["AI인사이트"])
 api.add_router("/campaigns", campaigns_router, tags=["캠페인"])
 api.add_router("/home", home_router, tags=["홈"])
+api.add_router("/integrations", integrations_router, tags=["연동"])
 api.add_router("/reports", reports_router, tags=["리포트"])
 api.add_router("/users", users_router, tags=["내 정보"])
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", api.urls),
-    path("api/", include("MoPT_backend.urls_legacy")),
 ]
+
+if settings.LEGACY_API_ENABLED:
+    urlpatterns.append(path("api/", include("MoPT_backend.urls_legacy")))
@@ -2,9 +2,10 @@
 # -------------------------------------------------------------------
 # ✅ 기존(레거시) 경로만 보관하는 곳
 # - urls.py에서는 이 파일을 /api/ 아래에 include만 함
+# - settings.LEGACY_API_ENABLED=False 면 연결하지 않음
 # - 결과 경로:
-#     * /api/insights/   → ai_insights.urls (DRF 레거시)
-#     * /api/dashboard/  → home.urls (DRF 레거시)
+#     * /api/insights/   → ai_insights.urls (레거시, ninja 빌더 어댑터)
+#     * /api/dashboard/  → home.urls (레거시)
 # -------------------------------------------------------------------
 from django.urls import include, path
 
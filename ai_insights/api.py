@@ -2,17 +2,14 @@
 # -----------------------------------------------------------------------------
 # 목적:
 # - 목록 API에서 icon/ reason_summary.icon 이 'ICON', 'ICON1' 같은 더미가 아니라
-#   "내용과 관련된 진짜 이모지"가 내려가도록 응답 단계에서 계산해서 채웁니다.
+#   "내용과 관련된 진짜 이모지"가 내려가도록 합니다.
 #
 # 방법:
-# - DB 값은 그대로 두되, 응답 직전에 title/태그 등으로 아이콘을 추론하여 주입
-# - 우선순위: "제목 키워드 매핑" > "태그 타입 매핑(growth/retention/expansion)"
-# - 신규(is_new=True): reason_summary.icon 을 계산해 교체
-# - 기존(is_new=False): item.icon 필드를 계산해 교체
-#
-# 장점:
-# - 마이그레이션/시드 수정 없이 즉시 반영
-# - 팀원 코드와 충돌 적음(뷰/스키마 변경 없음)
+# - 아이콘은 저장 시점에 계산해 Insight 에 저장 (ai_insights.icons / signals)
+#   · 신규(is_new=True): reason_icon
+#   · 기존(is_new=False): icon
+# - 우선순위: "제목 키워드 매핑" > "태그 텍스트/타입 매핑" > 기본값
+# - 응답에서는 저장된 값을 그대로 사용 (아직 더미인 행만 즉석 계산)
 # -----------------------------------------------------------------------------
 
 from typing import List, Optional
@@ -20,12 +17,15 @@ from typing import List, Optional
 from django.shortcuts import get_object_or_404
 from ninja import Router, Schema
 
+from . import detail_cache
+from .icons import display_icon
 from .models import (
     Insight,
-    InsightAnalysisItem,
     InsightRecommendation,
     InsightTag,
 )
+from .pagination import DEFAULT_LIMIT, clamp_limit, paginate
+from .search import search as search_insights
 
 router = Router()
 
@@ -89,138 +89,49 @@ class InsightDetailV2Schema(Schema):
     recommendation: Optional[RecommendationSchema]
 
 
-# ======= 이모지 매핑 규칙 =======
-# 1) 제목 키워드 → 이모지 (가장 높은 우선순위)
-TITLE_KEYWORD_EMOJI = [
-    # (키워드, 이모지)
-    ("브런치", "🥐"),
-    ("세트", "🧺"),
-    ("주말", "🗓️"),
-    ("점심", "🍱"),
-    ("할인", "🏷️"),
-    ("SNS", "📣"),
-    ("광고", "🚀"),
-    ("예산", "💰"),
-    ("리텐션", "🔁"),
-    ("재방문", "🔁"),
-    ("리뷰", "⭐"),
-    ("고객", "🧑‍🤝‍🧑"),
-    ("브랜드", "🏷️"),
-    ("인지도", "📈"),
-    ("가격", "⚖️"),
-    ("경쟁", "🥊"),
-    ("신규", "✨"),
-    ("음료", "🥤"),
-    ("여름", "🌞"),
-    ("테이크아웃", "🥡"),
-    ("런치", "🍱"),
-    ("해피아워", "⏳"),
-    ("오피스", "🏙️"),
-]
-
-# 2) 태그 타입 → 이모지 (제목과 매칭 안 되면 사용)
-TAG_TYPE_EMOJI = {
-    "growth": "📈",
-    "retention": "🔁",
-    "expansion": "🧭",
-}
-
-# 3) 세부 태그 텍스트 힌트(선택): 태그에 해시가 포함된 경우도 고려
-TAG_TEXT_HINTS = [
-    ("#브런치", "🥐"),
-    ("#테이크아웃", "🥡"),
-    ("#해피아워", "⏳"),
-    ("#고객경험", "🤝"),
-    ("#경쟁분석", "⚖️"),
-    ("#SNS", "📣"),
-    ("#프로모션", "🎯"),
-]
+# 검색
+class SearchHitSchema(Schema):
+    id: str
+    title: str
+    summary: Optional[str]
+    created_at: str
+    isNew: bool
+    score: float
 
-# ======= 헬퍼 =======
 
+class SearchMetaSchema(Schema):
+    page: int
+    limit: int
+    total: int
 
-def _tags_for(insight: Insight) -> List[TagSchema]:
-    return [
-        TagSchema(text=t.text, type=t.type) for t in insight.tags.all().order_by("id")
-    ]
 
+class SearchResultSchema(Schema):
+    query: str
+    data: List[SearchHitSchema]
+    meta: SearchMetaSchema
 
-def _pick_emoji_from_title(title: str) -> Optional[str]:
-    """제목의 키워드를 보고 가장 먼저 일치하는 이모지를 반환"""
-    if not title:
-        return None
-    t = title.upper()
-    for kw, emo in TITLE_KEYWORD_EMOJI:
-        if kw.upper() in t:
-            return emo
-    return None
 
+# ======= 헬퍼 =======
 
-def _pick_emoji_from_tags(insight: Insight) -> Optional[str]:
-    """
-    태그로 이모지 추론:
-    - 먼저 텍스트 힌트(#브런치 등)가 있으면 그걸 사용
-    - 없으면 type(growth/retention/expansion)으로 매핑
-    """
-    tags = list(insight.tags.all())
-    # 텍스트 힌트 우선
-    for hint, emo in TAG_TEXT_HINTS:
-        for t in tags:
-            if hint in (t.text or ""):
-                return emo
-    # type 기반(첫 번째 태그 우선)
-    for t in tags:
-        emo = TAG_TYPE_EMOJI.get(t.type or "")
-        if emo:
-            return emo
-    return None
-
-
-def _pick_icon_for_new(insight: Insight) -> str:
-    """
-    신규 카드(is_new=True)의 reason_summary.icon 을 채울 때 사용.
-    규칙: 제목 키워드 → 태그 → 기본값
-    """
-    # 1) 제목 기반
-    emo = _pick_emoji_from_title(insight.title)
-    if emo:
-        return emo
-    # 2) 태그 기반
-    emo = _pick_emoji_from_tags(insight)
-    if emo:
-        return emo
-    # 3) 기본값
-    return "✨"
-
-
-def _pick_icon_for_recommended(insight: Insight) -> str:
-    """
-    기존 카드(is_new=False)의 목록 아이콘을 채울 때 사용.
-    규칙: 제목 키워드 → 태그 → 기본값
-    """
-    emo = _pick_emoji_from_title(insight.title)
-    if emo:
-        return emo
-    emo = _pick_emoji_from_tags(insight)
-    if emo:
-        return emo
-    return "📌"
+
+def _tags_for(insight: Insight) -> List[TagSchema]:
+    # prefetch_related("tags") 캐시를 쓰도록 정렬은 파이썬에서 처리
+    tags = sorted(insight.tags.all(), key=lambda t: t.id)
+    return [TagSchema(text=t.text, type=t.type) for t in tags]
 
 
 def _new_strategy_payload(qs):
     """
-    기존 reason_summary.icon 값(ICON1/2/3 등)을 무시하고
-    내용 기반 이모지로 대체해 내려줍니다.
+    reason_summary.icon 은 저장 시점에 계산된 값(reason_icon)을 사용합니다.
     """
     out = []
     for i in qs:
-        computed_icon = _pick_icon_for_new(i)
         out.append(
             NewStrategySchema(
                 id=i.id,
                 title=i.title,
                 reason_summary=ReasonSummarySchema(
-                    icon=computed_icon,  # ✅ 여기서 치환!
+                    icon=display_icon(i),
                     text=i.reason_text or "",
                 ),
                 created_at=i.created_at.isoformat(),
@@ -232,16 +143,14 @@ def _new_strategy_payload(qs):
 
 def _recommended_payload(qs):
     """
-    기존 icon 필드가 'ICON' 등 더미여도,
-    계산된 이모지로 대체해서 내려줍니다.
+    icon 은 저장 시점에 계산된 값(icon)을 사용합니다.
     """
     out = []
     for i in qs:
-        computed_icon = _pick_icon_for_recommended(i)
         out.append(
             RecommendedStrategySchema(
                 id=i.id,
-                icon=computed_icon,  # ✅ 여기서 치환!
+                icon=display_icon(i),
                 title=i.title,
                 tags=_tags_for(i),
             )
@@ -250,20 +159,25 @@ def _recommended_payload(qs):
 
 
 def _detail_v2_payload(insight: Insight) -> InsightDetailV2Schema:
-    # analysis
-    items_qs = InsightAnalysisItem.objects.filter(insight=insight).order_by(
-        "order", "id"
-    )
+    """
+    insight 는 select_related("recommendation") +
+    prefetch_related("tags", "analysis_items") 로 읽어 온 객체를 기대합니다.
+    (그렇지 않아도 동작은 같고 쿼리만 늘어남)
+    """
+    # analysis (모델 기본 정렬: order, id)
     items = [
         AnalysisItemSchema(
             icon=x.icon or "", title=x.title or "", description=x.description or ""
         )
-        for x in items_qs
+        for x in insight.analysis_items.all()
     ]
     analysis = AnalysisSchema(title="AI 분석 근거", items=items)
 
     # recommendation (없을 수도 있음)
-    rec = InsightRecommendation.objects.filter(insight=insight).first()
+    try:
+        rec = insight.recommendation
+    except InsightRecommendation.DoesNotExist:
+        rec = None
     recommendation = None
     if rec:
         recommendation = RecommendationSchema(
@@ -285,6 +199,33 @@ def _detail_v2_payload(insight: Insight) -> InsightDetailV2Schema:
     )
 
 
+def _detail_queryset():
+    # 목록과 같은 기준: 공용 인사이트만 (규칙 엔진의 매장별 인사이트는 노출하지 않음)
+    return (
+        Insight.objects.shared()
+        .select_related("recommendation")
+        .prefetch_related("tags", "analysis_items")
+    )
+
+
+def detail_payload(insight_id: str) -> dict:
+    """
+    상세(V2) 응답 dict (레거시 /api/insights/<id> 와 공용)
+    - 캐시 히트: ORM 조회 없이 렌더링된 dict 반환 (ai_insights.detail_cache)
+    - 캐시 미스: 인사이트+추천 1쿼리, 태그/분석 항목 prefetch 2쿼리 후 캐시에 저장
+      (공용 인사이트만 조회하므로 캐시에도 공용 인사이트만 들어감)
+    - 없거나 매장별 인사이트면 Http404
+    """
+    cached = detail_cache.get_payload(insight_id)
+    if cached is not None:
+        return cached
+
+    insight = get_object_or_404(_detail_queryset(), id=insight_id)
+    payload = _detail_v2_payload(insight).dict()
+    detail_cache.store_payload(insight_id, payload)
+    return payload
+
+
 # ======= Endpoints =======
 
 
@@ -293,31 +234,80 @@ def _detail_v2_payload(insight: Insight) -> InsightDetailV2Schema:
     tags=["AI 인사이트"],
     summary="AI 인사이트(신규/기존) 목록",
 )
-def list_insights(request, kind: Optional[str] = None):
+def list_insights(
+    request,
+    kind: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    new_cursor: Optional[str] = None,
+    recommended_cursor: Optional[str] = None,
+):
     """
     - GET /api/v1/insights
-    - GET /api/v1/insights?kind=new
-    - GET /api/v1/insights?kind=recommended
-
-    변경점:
-    - 응답 생성 시 내용 기반 이모지로 icon 을 계산해 내려줍니다.
+    - GET /api/v1/insights?kind=new&limit=20&new_cursor=...
+    - GET /api/v1/insights?kind=recommended&recommended_cursor=...
+
+    (created_at, id) 커서 페이지네이션 (ai_insights.pagination)
+    - limit 기본 20, 최대 100 (목록별로 적용)
+    - 다음 페이지 커서: new_next_cursor / recommended_next_cursor (없으면 null)
+    - 목록마다 인사이트 1쿼리 + 태그 prefetch 1쿼리
+    - 거의 같은 인사이트(duplicate_of 지정)는 대표만 노출
+    - 매장별 규칙 엔진 인사이트는 제외 (Insight.objects.shared)
     """
     kind = (kind or "").lower()
+    qs = (
+        Insight.objects.shared()
+        .filter(duplicate_of__isnull=True)
+        .prefetch_related("tags")
+    )
+    out = {}
+
+    if kind != "recommended":
+        rows, next_cursor = paginate(qs.filter(is_new=True), new_cursor, limit)
+        out["new_strategies"] = _new_strategy_payload(rows)
+        out["new_next_cursor"] = next_cursor
 
-    if kind == "new":
-        qs_new = Insight.objects.filter(is_new=True).order_by("-created_at")
-        return {"new_strategies": _new_strategy_payload(qs_new)}
+    if kind != "new":
+        rows, next_cursor = paginate(qs.filter(is_new=False), recommended_cursor, limit)
+        out["recommended_strategies"] = _recommended_payload(rows)
+        out["recommended_next_cursor"] = next_cursor
+
+    return out
 
-    if kind == "recommended":
-        qs_rec = Insight.objects.filter(is_new=False).order_by("-created_at")
-        return {"recommended_strategies": _recommended_payload(qs_rec)}
 
-    qs_new = Insight.objects.filter(is_new=True).order_by("-created_at")
-    qs_rec = Insight.objects.filter(is_new=False).order_by("-created_at")
-    return {
-        "new_strategies": _new_strategy_payload(qs_new),
-        "recommended_strategies": _recommended_payload(qs_rec),
-    }
+@router.get(
+    "/search",
+    response=SearchResultSchema,
+    tags=["AI 인사이트"],
+    summary="AI 인사이트 본문 검색",
+)
+def search(request, q: str = "", page: int = 1, limit: int = DEFAULT_LIMIT):
+    """
+    GET /api/v1/insights/search?q=브런치&page=1&limit=20
+
+    - 제목/요약/설명 + 분석 항목 설명 + 추천 설명에서 검색 (ai_insights.search)
+    - 한글은 2-gram 색인, 모든 검색어를 포함하는 인사이트만 관련도 순으로 반환
+    - 매장별 규칙 엔진 인사이트는 제외 (Insight.objects.shared)
+    - limit 기본 20, 최대 100
+    ※ "/{insight_id}" 보다 먼저 등록해야 함
+    """
+    page = max(page, 1)
+    limit = clamp_limit(limit)
+    hits, total = search_insights(q, offset=(page - 1) * limit, limit=limit)
+    return SearchResultSchema(
+        query=q,
+        data=[
+            SearchHitSchema(
+                id=i.id,
+                title=i.title,
+                summary=i.summary,
+                created_at=i.created_at.isoformat(),
+                isNew=bool(i.is_new),
+                score=round(score, 4),
+            )
+            for i, score in hits
+        ],
+        meta=SearchMetaSchema(page=page, limit=limit, total=total),
+    )
 
 
 @router.get(
@@ -331,5 +321,4 @@ def retrieve_insight_v2(request, insight_id: str):
     GET /api/v1/insights/{insight_id}
     (상세는 기존 로직 유지: analysis/recommendation의 아이콘은 DB 값 사용)
     """
-    insight = get_object_or_404(Insight, id=insight_id)
-    return _detail_v2_payload(insight)
+    return detail_payload(insight_id)
@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class AiInsightsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ai_insights"
+
+    def ready(self):
+        # 저장 시점 아이콘 계산 + 상세 응답 캐시 무효화 + 검색 색인 + 유사 인사이트 시그널 연결
+        from .signals import (
+            connect_dedup_signals,
+            connect_detail_cache_signals,
+            connect_icon_signals,
+            connect_search_signals,
+        )
+
+        connect_icon_signals()
+        connect_detail_cache_signals()
+        connect_search_signals()
+        connect_dedup_signals()
@@ -0,0 +1,376 @@
+# ai_insights/dedup.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 문구만 조금 바뀐 "거의 같은" 인사이트를 찾아 대표 인사이트(duplicate_of)로 묶음
+#
+# 방법 (MinHash + LSH):
+# - 제목/요약/추천 문장 → 정규화(숫자 연속은 "0" 하나로) → 문자 3-gram(shingle) 집합
+#   · 규칙 엔진 문구는 템플릿이 같고 숫자만 다르므로 숫자는 비교에서 뺌
+# - NUM_PERM 개의 해시 함수로 최소 해시값(MinHash 서명) 계산
+#   · 두 서명의 일치 비율 ≈ 두 shingle 집합의 Jaccard 유사도
+# - 서명을 BANDS 개 밴드(밴드당 ROWS 개 값)로 나눠 밴드별 해시를 버킷 key 로 저장
+#   · key 가 하나라도 같은 인사이트만 후보 → 전체 비교 없이 인덱스 조회로 후보 찾기
+#   · 버킷 key 에 매장(store_external_id) + 규칙(rule_code)을 넣어 같은 매장·규칙 안에서만 비교
+# - 후보는 WINDOW_DAYS 일 안에 생성된 인사이트만 (오래된 인사이트와 비슷해도 새로 만듦
+#   → 같은 규칙이 다시 발생하면 기간이 지난 뒤에는 새 인사이트가 나옴)
+# - 후보 중 추정 유사도 >= THRESHOLD 이고 더 먼저 생성된 인사이트를 대표로 지정
+# - 문구가 바뀌어 대표와의 유사도가 THRESHOLD 아래로 떨어지면 표시를 풀고 다시 판단
+#
+# 갱신:
+# - 저장 시그널(ai_insights.signals) → 커밋 후 refresh() 로 서명/버킷 갱신 + 중복 표시
+# - 규칙 엔진(ai_insights.engine)은 저장 전에 filter_new() 로 중복 후보를 걸러냄
+# - 기존 데이터: poetry run python manage.py cluster_duplicate_insights
+# - 중복 표시는 update() 로 하므로 대시보드 인사이트 카운터(home.counters)는 직접 조정
+# -----------------------------------------------------------------------------
+import hashlib
+import random
+import re
+import unicodedata
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from home import counters
+
+from .models import Insight, InsightLshBucket, InsightRecommendation, InsightSignature
+
+SHINGLE = 3
+BANDS = 16
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+THRESHOLD = 0.7
+# 후보로 볼 기간 (일): 이보다 먼저 생긴 인사이트와는 비교하지 않음
+WINDOW_DAYS = 14
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+# 해시 함수 계수: 고정 시드 → 프로세스/배포가 달라도 같은 서명
+_rng = random.Random(20250901)
+_PERMS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+_STRIP_RE = re.compile(r"[\W_]+")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+# ----------------------------
+# 서명 계산 (순수 함수)
+# ----------------------------
+def shingles(text: str) -> Set[str]:
+    """공백/기호를 빼고 숫자를 "0" 으로 바꾼 정규화 문자열의 문자 3-gram 집합"""
+    text = _STRIP_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+    text = _DIGITS_RE.sub("0", text)
+    if len(text) <= SHINGLE:
+        return {text} if text else set()
+    return {text[i : i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def _base_hash(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def minhash(shingle_set: Iterable[str]) -> List[int]:
+    bases = [_base_hash(s) for s in shingle_set]
+    if not bases:
+        return [_MASK] * NUM_PERM
+    return [min(((a * x + b) % _PRIME) & _MASK for x in bases) for a, b in _PERMS]
+
+
+def similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """추정 Jaccard 유사도 (서명 일치 비율)"""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(signature: Sequence[int], store: str = "", rule: str = "") -> List[str]:
+    # 규칙이 없는(수동) 인사이트는 예전과 같은 key
+    scope = f"{store}#{rule}" if rule else store
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS : (band + 1) * ROWS]
+        raw = f"{scope}|{band}|{','.join(map(str, chunk))}".encode("utf-8")
+        keys.append(hashlib.blake2b(raw, digest_size=16).hexdigest())
+    return keys
+
+
+def text_for(
+    title: Optional[str],
+    summary: Optional[str],
+    rec_title: Optional[str] = None,
+    rec_description: Optional[str] = None,
+) -> str:
+    return " ".join(p for p in (title, summary, rec_title, rec_description) if p)
+
+
+def signature_for_text(text: str) -> List[int]:
+    return minhash(shingles(text))
+
+
+# ----------------------------
+# 후보 조회
+# ----------------------------
+def window_start(reference=None):
+    """reference(기본: 지금) 기준 후보 기간의 시작 시각"""
+    return (reference or timezone.now()) - timedelta(days=WINDOW_DAYS)
+
+
+def _bucket_rows(keys: Iterable[str], since):
+    """
+    버킷 key 를 공유하고 since 이후 생성된 인사이트의 버킷 행
+    (key 에 매장·규칙이 들어 있으므로 같은 매장·규칙만 나옴)
+    """
+    return InsightLshBucket.objects.filter(
+        key__in=list(keys), insight__created_at__gte=since
+    )
+
+
+def _candidates(
+    keys: Iterable[str], since, exclude: Iterable[str] = ()
+) -> Dict[str, List]:
+    """버킷 key 를 공유하는 (기간 안) 인사이트들의 서명 {id: minhash}"""
+    ids = set(_bucket_rows(keys, since).values_list("insight_id", flat=True)) - set(
+        exclude
+    )
+    if not ids:
+        return {}
+    return dict(
+        InsightSignature.objects.filter(insight_id__in=ids).values_list(
+            "insight_id", "minhash"
+        )
+    )
+
+
+def find_similar(
+    signature: Sequence[int],
+    store: str = "",
+    rule: str = "",
+    since=None,
+    exclude: Iterable[str] = (),
+) -> List[Tuple[str, float]]:
+    """
+    유사도 >= THRESHOLD 인 인사이트 [(id, 유사도)] (높은 순)
+    - 같은 매장·규칙, since(기본: 지금부터 WINDOW_DAYS 전) 이후 생성된 것만
+    """
+    since = since or window_start()
+    keys = band_keys(signature, store, rule)
+    found = []
+    for iid, sig in _candidates(keys, since, exclude).items():
+        sim = similarity(signature, sig)
+        if sim >= THRESHOLD:
+            found.append((iid, sim))
+    found.sort(key=lambda r: (-r[1], r[0]))
+    return found
+
+
+# ----------------------------
+# 저장 (서명 + 버킷)
+# ----------------------------
+def _insight_text(insight: Insight) -> str:
+    try:
+        rec = insight.recommendation
+    except InsightRecommendation.DoesNotExist:
+        rec = None
+    return text_for(
+        insight.title,
+        insight.summary,
+        rec.item_title if rec else None,
+        rec.item_description if rec else None,
+    )
+
+
+def store_signatures(items: Sequence[Tuple[str, str, str, List[int]]]) -> None:
+    """[(insight_id, store, rule, signature)] → 서명 upsert + 버킷 교체"""
+    if not items:
+        return
+    ids = [iid for iid, _, _, _ in items]
+    with transaction.atomic():
+        InsightSignature.objects.bulk_create(
+            [InsightSignature(insight_id=iid, minhash=sig) for iid, _, _, sig in items],
+            update_conflicts=True,
+            unique_fields=["insight"],
+            update_fields=["minhash", "updated_at"],
+        )
+        InsightLshBucket.objects.filter(insight_id__in=ids).delete()
+        InsightLshBucket.objects.bulk_create(
+            [
+                InsightLshBucket(insight_id=iid, band=band, key=key)
+                for iid, store, rule, sig in items
+                for band, key in enumerate(band_keys(sig, store, rule))
+            ]
+        )
+
+
+def refresh(insight_ids: Iterable[str], mark: bool = True) -> int:
+    """
+    인사이트들의 서명/버킷을 다시 만들고, mark=True 면 중복 표시를 다시 판단
+    - 대표가 있는 인사이트: 대표와의 유사도가 THRESHOLD 아래로 떨어졌거나
+      매장·규칙이 달라졌으면 표시를 풀고 다른 대표를 다시 찾음
+    - 대표인 인사이트: 더 이상 비슷하지 않은 중복 인사이트를 떼어 내 같은 방식으로 다시 판단
+    - 대표가 없고 묶인 중복도 없는 인사이트: 더 먼저 생긴 유사 인사이트를 대표로 지정
+    (같은 매장·규칙, 자기 생성 시각 기준 WINDOW_DAYS 일 안에 생긴 인사이트만)
+    반환: duplicate_of 가 바뀐 인사이트 수
+    """
+    ids = list(dict.fromkeys(insight_ids))
+    insights = list(Insight.objects.filter(id__in=ids).select_related("recommendation"))
+    if not insights:
+        return 0
+    items = [
+        (
+            i.id,
+            i.store_external_id,
+            i.rule_code,
+            signature_for_text(_insight_text(i)),
+        )
+        for i in insights
+    ]
+    store_signatures(items)
+    if not mark:
+        return 0
+
+    changed = 0
+    for insight, (iid, store, rule, sig) in zip(insights, items):
+        if insight.duplicate_of_id:
+            canonical = (
+                Insight.objects.filter(pk=insight.duplicate_of_id)
+                .values("store_external_id", "rule_code")
+                .first()
+            )
+            if (
+                canonical
+                and (canonical["store_external_id"], canonical["rule_code"])
+                == (store, rule)
+                and _still_similar(sig, insight.duplicate_of_id)
+            ):
+                continue
+            changed += _reassign(insight, sig)
+            continue
+
+        # 대표: 떼어 낸 중복 인사이트는 다른 대표를 다시 찾음
+        stale = [
+            dup
+            for dup in insight.duplicates.all()
+            if (dup.store_external_id, dup.rule_code) != (store, rule)
+            or not _still_similar(sig, dup.id)
+        ]
+        for dup in stale:
+            changed += _reassign(dup, None)
+        if insight.duplicates.exists():
+            continue
+        changed += _reassign(insight, sig)
+    return changed
+
+
+def _still_similar(sig: Sequence[int], other_id: str) -> bool:
+    """저장된 other 서명과의 유사도 >= THRESHOLD (서명이 없으면 판단하지 않고 유지)"""
+    other = (
+        InsightSignature.objects.filter(insight_id=other_id)
+        .values_list("minhash", flat=True)
+        .first()
+    )
+    if not other:
+        return True
+    return similarity(sig, other) >= THRESHOLD
+
+
+def _reassign(insight: Insight, sig: Optional[Sequence[int]]) -> int:
+    """
+    insight 의 대표를 다시 찾아 저장 (없으면 대표 해제), 바뀌었으면 1
+    - sig 가 None 이면 저장된 서명을 사용 (서명이 없으면 대표 해제만)
+    """
+    if sig is None:
+        sig = (
+            InsightSignature.objects.filter(insight_id=insight.id)
+            .values_list("minhash", flat=True)
+            .first()
+        )
+    target = None
+    if sig:
+        since = window_start(insight.created_at)
+        similar = [
+            sid
+            for sid, _ in find_similar(
+                sig, insight.store_external_id, insight.rule_code, since, [insight.id]
+            )
+        ]
+        older = _older_canonicals(similar, (insight.created_at, insight.id))
+        target = older[0] if older else None
+    if target == insight.duplicate_of_id:
+        return 0
+    Insight.objects.filter(pk=insight.id).update(duplicate_of_id=target)
+    if counters.insight_counted(insight.store_external_id, None):
+        # 대표 해제 → 목록에 다시 보임, 대표 지정 → 목록에서 빠짐
+        was_counted = insight.duplicate_of_id is None
+        if was_counted != (target is None):
+            counters.incr_insight(insight.is_new, 1 if target is None else -1)
+    insight.duplicate_of_id = target
+    return 1
+
+
+def _older_canonicals(ids: Sequence[str], key: Tuple) -> List[str]:
+    """ids 중 key(created_at, id) 보다 먼저 생성된 대표(중복 아님) 인사이트 (유사도 순 유지)"""
+    rows = dict(
+        Insight.objects.filter(id__in=ids, duplicate_of__isnull=True).values_list(
+            "id", "created_at"
+        )
+    )
+    return [i for i in ids if i in rows and (rows[i], i) < key]
+
+
+# ----------------------------
+# 생성 전 걸러내기 (규칙 엔진)
+# ----------------------------
+def filter_new(
+    candidates: Sequence[Tuple[str, str, str, str]],
+) -> Tuple[List[Tuple[str, List[int]]], Dict[str, str]]:
+    """
+    candidates: [(insight_id, store, rule, text)]
+    반환: (저장할 [(id, signature)], 걸러진 {id: 유사한 기존/앞선 id})
+    - 같은 매장·규칙의 최근 WINDOW_DAYS 일 인사이트와 유사하거나,
+      같은 묶음 안의 앞선 후보와 유사하면 제외
+    """
+    keep: List[Tuple[str, List[int]]] = []
+    dropped: Dict[str, str] = {}
+    seen: Dict[str, List[Tuple[str, List[int]]]] = {}  # bucket key → [(id, sig)]
+
+    planned = []
+    for iid, store, rule, text in candidates:
+        sig = signature_for_text(text)
+        planned.append((iid, sig, band_keys(sig, store, rule)))
+    all_keys = {k for _, _, keys in planned for k in keys}
+    existing_keys: Dict[str, Set[str]] = {}  # bucket key → {기존 인사이트 id}
+    for iid, key in _bucket_rows(all_keys, window_start()).values_list(
+        "insight_id", "key"
+    ):
+        existing_keys.setdefault(key, set()).add(iid)
+    existing = dict(
+        InsightSignature.objects.filter(
+            insight_id__in={i for ids in existing_keys.values() for i in ids}
+        ).values_list("insight_id", "minhash")
+    )
+
+    for iid, sig, keys in planned:
+        match = None
+        for key in keys:
+            for other in existing_keys.get(key, ()):
+                if similarity(sig, existing.get(other)) >= THRESHOLD:
+                    match = other
+                    break
+            if match is None:
+                for other, other_sig in seen.get(key, ()):
+                    if similarity(sig, other_sig) >= THRESHOLD:
+                        match = other
+                        break
+            if match:
+                break
+        if match:
+            dropped[iid] = match
+            continue
+        keep.append((iid, sig))
+        for key in keys:
+            seen.setdefault(key, []).append((iid, sig))
+    return keep, dropped
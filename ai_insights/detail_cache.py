@@ -0,0 +1,37 @@
+# ai_insights/detail_cache.py
+# -----------------------------------------------------------------------------
+# 인사이트 상세(V2) 응답 캐시
+# - 렌더링된 dict 를 Django cache 에 insight id 별로 저장
+# - 인사이트/분석 항목/추천/태그가 바뀌면 시그널(ai_insights.signals)이 커밋 후 삭제
+# - 공용 인사이트만 저장 (api.detail_payload 가 shared() 로 조회한 행만 저장)
+#   · 매장 구분(store_external_id)이 바뀌는 저장도 위 시그널이 삭제
+#
+# 주의: 기본 CACHES 는 프로세스별 LocMemCache 입니다.
+#       워커가 여러 개면 공유 캐시(DJANGO_CACHE_BACKEND)를 지정하세요.
+# -----------------------------------------------------------------------------
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+# 응답 포맷이 바뀌면 버전을 올려서 이전 캐시를 무시
+# (v2: 공용 인사이트만 저장 — 이전에 저장된 매장별 인사이트 응답은 무시)
+KEY_PREFIX = "insight_detail:v2:"
+
+
+def cache_key(insight_id: str) -> str:
+    return f"{KEY_PREFIX}{insight_id}"
+
+
+def get_payload(insight_id: str) -> Optional[dict]:
+    return cache.get(cache_key(insight_id))
+
+
+def store_payload(insight_id: str, payload: dict) -> None:
+    cache.set(cache_key(insight_id), payload, settings.INSIGHT_DETAIL_CACHE_TTL)
+
+
+def invalidate(insight_ids: Iterable[str]) -> None:
+    keys = [cache_key(i) for i in insight_ids if i is not None]
+    if keys:
+        cache.delete_many(keys)
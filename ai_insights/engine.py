@@ -0,0 +1,305 @@
+# ai_insights/engine.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - DailyPerformance(캠페인×일) 를 매장(Campaign.store_external_id)별로 묶어
+#   규칙(ai_insights.rules)을 돌리고, 결과를 Insight / InsightAnalysisItem /
+#   InsightRecommendation 으로 한 번에(bulk) 저장
+#
+# 흐름:
+# 1) load_frames: 기간 내 성과를 매장 순으로 스트리밍 → 매장별 열 배열(frame)
+# 2) evaluate: 매장 묶음(batch) 단위로 ProcessPoolExecutor 에서 규칙 평가
+#    (워커는 순수 계산만, DB 접근은 메인 프로세스에서만)
+# 3) write_findings: 묶음 단위로 bulk_create (인사이트/태그 연결/분석 항목/추천)
+#
+# 멱등성 / 중복 억제:
+# - 인사이트 id = gen_ + sha1(매장|규칙|key|기준일) → 같은 날 다시 돌려도 중복 생성 없음
+# - 같은 매장·규칙에 최근(dedup.WINDOW_DAYS) 거의 같은 문구의 인사이트가 있으면 만들지 않음
+#   (ai_insights.dedup, 숫자만 다른 문구는 같은 것으로 봄)
+# -----------------------------------------------------------------------------
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+
+from reports.models import DailyPerformance
+
+from . import dedup, search
+from .icons import compute_icon
+from .models import Insight, InsightAnalysisItem, InsightRecommendation, InsightTag
+from .rules import evaluate_frame
+
+DEFAULT_DAYS = 28
+DEFAULT_BATCH_STORES = 1000
+
+
+def insight_id(store: str, rule: str, key: str, as_of: date) -> str:
+    raw = f"{store}|{rule}|{key}|{as_of.isoformat()}".encode("utf-8")
+    return f"gen_{hashlib.sha1(raw).hexdigest()[:20]}"
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ----------------------------
+# 1) 데이터 적재 (매장별 열 배열)
+# ----------------------------
+def _empty_frame(store: str, start: date, days: int) -> Dict:
+    return {
+        "store": store,
+        "start": start,
+        "days": days,
+        "sales": [0] * days,
+        "spend": [0] * days,
+        "clicks": [0] * days,
+        "impressions": [0] * days,
+        "channels": {},
+    }
+
+
+def load_frames(
+    as_of: date,
+    days: int = DEFAULT_DAYS,
+    stores: Optional[Sequence[str]] = None,
+    chunk_size: int = 5000,
+) -> Iterator[Dict]:
+    """
+    [as_of - days + 1, as_of] 기간 성과를 매장 순으로 한 번 훑어서 frame 을 하나씩 반환
+    (매장 1곳 분량만 메모리에 유지)
+    """
+    start = as_of - timedelta(days=days - 1)
+    qs = DailyPerformance.objects.filter(date__range=(start, as_of)).exclude(
+        campaign__store_external_id=""
+    )
+    if stores:
+        qs = qs.filter(campaign__store_external_id__in=list(stores))
+    rows = (
+        qs.order_by("campaign__store_external_id")
+        .values_list(
+            "campaign__store_external_id",
+            "campaign__channel",
+            "date",
+            "sales",
+            "spend",
+            "clicks",
+            "impressions",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    frame = None
+    for store, channel, day, sales, spend, clicks, impressions in rows:
+        if frame is None or frame["store"] != store:
+            if frame is not None:
+                yield frame
+            frame = _empty_frame(store, start, days)
+        i = (day - start).days
+        frame["sales"][i] += sales
+        frame["spend"][i] += spend
+        frame["clicks"][i] += clicks
+        frame["impressions"][i] += impressions
+        if channel:
+            cols = frame["channels"].get(channel)
+            if cols is None:
+                cols = frame["channels"][channel] = {
+                    "sales": [0] * days,
+                    "spend": [0] * days,
+                }
+            cols["sales"][i] += sales
+            cols["spend"][i] += spend
+    if frame is not None:
+        yield frame
+
+
+# ----------------------------
+# 2) 규칙 평가 (프로세스 풀)
+# ----------------------------
+def evaluate(
+    frames: Iterable[Dict],
+    workers: int = 1,
+    batch_stores: int = DEFAULT_BATCH_STORES,
+) -> Iterator[List[Tuple[str, List[Dict]]]]:
+    """
+    매장 묶음마다 [(store, findings), ...] 를 반환
+    - workers <= 1 이면 현재 프로세스에서 순차 평가
+    - 묶음 단위로 넘겨서 메모리에 올라가는 frame 수를 batch_stores 로 제한
+    """
+    if workers <= 1:
+        for batch in _chunked(frames, batch_stores):
+            yield [(f["store"], evaluate_frame(f)) for f in batch]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _chunked(frames, batch_stores):
+            chunksize = max(1, len(batch) // (workers * 4))
+            results = pool.map(evaluate_frame, batch, chunksize=chunksize)
+            yield [(f["store"], found) for f, found in zip(batch, results)]
+
+
+# ----------------------------
+# 3) 저장 (bulk)
+# ----------------------------
+def _finding_text(finding: Dict) -> str:
+    _, _, rec_item_title, rec_item_desc = finding["recommendation"]
+    return dedup.text_for(
+        finding["title"], finding["summary"], rec_item_title, rec_item_desc
+    )
+
+
+class _TagCache:
+    """(text, type) → InsightTag (없으면 생성, 실행 중 1번만 조회)"""
+
+    def __init__(self):
+        self._tags: Dict[Tuple[str, str], InsightTag] = {}
+
+    def get(self, text: str, type_: str) -> InsightTag:
+        key = (text, type_)
+        tag = self._tags.get(key)
+        if tag is None:
+            tag = InsightTag.objects.filter(text=text, type=type_).first()
+            if tag is None:
+                tag = InsightTag.objects.create(text=text, type=type_)
+            self._tags[key] = tag
+        return tag
+
+
+def write_findings(
+    results: List[Tuple[str, List[Dict]]],
+    as_of: date,
+    tag_cache: Optional[_TagCache] = None,
+) -> Tuple[int, int, int]:
+    """
+    (created, skipped, deduped) 반환
+    - 이미 있는 id(같은 기준일에 이미 생성됨)는 건너뜀
+    - 같은 매장·규칙의 최근 인사이트와 거의 같은 내용(ai_insights.dedup)이면 만들지 않음
+    - 시그널을 타지 않는 bulk_create 이므로 아이콘은 여기서 계산해 넣고 검색 색인을 만듦
+      (매장별 인사이트라 목록/대시보드 카운터에는 들어가지 않음)
+    """
+    tag_cache = tag_cache or _TagCache()
+    planned = {}
+    for store, findings in results:
+        for f in findings:
+            planned[insight_id(store, f["rule"], f["key"], as_of)] = (store, f)
+    if not planned:
+        return 0, 0, 0
+
+    existing = set(
+        Insight.objects.filter(id__in=list(planned)).values_list("id", flat=True)
+    )
+
+    # 같은 매장·규칙의 최근/같은 묶음 인사이트와 거의 같은 문구면 만들지 않음
+    keep, dropped = dedup.filter_new(
+        [
+            (iid, store, f["rule"], _finding_text(f))
+            for iid, (store, f) in planned.items()
+            if iid not in existing
+        ]
+    )
+    signatures = dict(keep)
+
+    insights, links, items, recs = [], [], [], []
+    through = Insight.tags.through
+    for iid, (store, f) in planned.items():
+        if iid not in signatures:
+            continue
+        tags = [tag_cache.get(text, type_) for text, type_ in f["tags"]]
+        insights.append(
+            Insight(
+                id=iid,
+                title=f["title"],
+                summary=f["summary"],
+                reason_text=f["reason_text"],
+                reason_icon=compute_icon(f["title"], tags, is_new=True),
+                is_new=True,
+                store_external_id=store,
+                rule_code=f["rule"],
+            )
+        )
+        links.extend(through(insight_id=iid, insighttag_id=t.pk) for t in tags)
+        items.extend(
+            InsightAnalysisItem(
+                insight_id=iid, icon=icon, title=title, description=desc, order=n
+            )
+            for n, (icon, title, desc) in enumerate(f["items"])
+        )
+        rec_title, rec_icon, rec_item_title, rec_item_desc = f["recommendation"]
+        recs.append(
+            InsightRecommendation(
+                insight_id=iid,
+                title=rec_title,
+                item_icon=rec_icon,
+                item_title=rec_item_title,
+                item_description=rec_item_desc,
+            )
+        )
+
+    if insights:
+        with transaction.atomic():
+            Insight.objects.bulk_create(insights)
+            through.objects.bulk_create(links)
+            InsightAnalysisItem.objects.bulk_create(items)
+            InsightRecommendation.objects.bulk_create(recs)
+            search.index_many(i.id for i in insights)
+            dedup.store_signatures(
+                [
+                    (i.id, i.store_external_id, i.rule_code, signatures[i.id])
+                    for i in insights
+                ]
+            )
+    return len(insights), len(existing), len(dropped)
+
+
+# ----------------------------
+# 전체 실행
+# ----------------------------
+def run(
+    as_of: date,
+    days: int = DEFAULT_DAYS,
+    stores: Optional[Sequence[str]] = None,
+    workers: int = 1,
+    batch_stores: int = DEFAULT_BATCH_STORES,
+    dry_run: bool = False,
+    on_batch=None,
+) -> Dict:
+    """
+    통계 dict 반환: stores, findings, by_rule, created, skipped, deduped, elapsed
+    on_batch(stats) 가 있으면 묶음마다 호출 (진행률 출력용)
+    """
+    stats = {
+        "stores": 0,
+        "findings": 0,
+        "by_rule": {},
+        "created": 0,
+        "skipped": 0,
+        "deduped": 0,
+        "elapsed": 0.0,
+    }
+    started = time.perf_counter()
+    tag_cache = _TagCache()
+    frames = load_frames(as_of, days, stores)
+    for results in evaluate(frames, workers, batch_stores):
+        stats["stores"] += len(results)
+        for _, findings in results:
+            stats["findings"] += len(findings)
+            for f in findings:
+                stats["by_rule"][f["rule"]] = stats["by_rule"].get(f["rule"], 0) + 1
+        if not dry_run:
+            created, skipped, deduped = write_findings(results, as_of, tag_cache)
+            stats["created"] += created
+            stats["skipped"] += skipped
+            stats["deduped"] += deduped
+        stats["elapsed"] = time.perf_counter() - started
+        if on_batch:
+            on_batch(stats)
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
@@ -0,0 +1,127 @@
+# ai_insights/icons.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 인사이트 목록 아이콘("내용과 관련된 진짜 이모지") 계산 규칙을 한 곳에 모음
+# - API / compute_insight_icons 명령 / 저장 시그널이 모두 이 모듈을 사용
+#
+# 규칙: 제목 키워드 > 태그 텍스트 힌트 > 태그 타입 > 기본값
+# 저장 위치:
+# - 신규(is_new=True)  → Insight.reason_icon (reason_summary.icon)
+# - 기존(is_new=False) → Insight.icon (목록용 아이콘)
+#
+# 매칭:
+# - 키워드 표는 import 시 Aho–Corasick 오토마톤(KeywordMatcher)으로 한 번 컴파일
+# - 제목/태그 텍스트를 한 번만 훑어 표에서 가장 앞선 매칭을 반환
+#
+# 주의: 모델을 import 하지 않습니다. (마이그레이션 0005 는 이 규칙의 복사본을 사용)
+# -----------------------------------------------------------------------------
+from typing import Iterable, Optional
+
+from .keyword_matcher import KeywordMatcher
+
+# 1) 제목 키워드 → 이모지 (가장 높은 우선순위)
+TITLE_KEYWORD_EMOJI = [
+    # (키워드, 이모지)
+    ("브런치", "🥐"),
+    ("세트", "🧺"),
+    ("주말", "🗓️"),
+    ("점심", "🍱"),
+    ("할인", "🏷️"),
+    ("SNS", "📣"),
+    ("광고", "🚀"),
+    ("예산", "💰"),
+    ("리텐션", "🔁"),
+    ("재방문", "🔁"),
+    ("리뷰", "⭐"),
+    ("고객", "🧑‍🤝‍🧑"),
+    ("브랜드", "🏷️"),
+    ("인지도", "📈"),
+    ("가격", "⚖️"),
+    ("경쟁", "🥊"),
+    ("신규", "✨"),
+    ("음료", "🥤"),
+    ("여름", "🌞"),
+    ("테이크아웃", "🥡"),
+    ("런치", "🍱"),
+    ("해피아워", "⏳"),
+    ("오피스", "🏙️"),
+]
+
+# 2) 세부 태그 텍스트 힌트: 태그에 해시가 포함된 경우도 고려
+TAG_TEXT_HINTS = [
+    ("#브런치", "🥐"),
+    ("#테이크아웃", "🥡"),
+    ("#해피아워", "⏳"),
+    ("#고객경험", "🤝"),
+    ("#경쟁분석", "⚖️"),
+    ("#SNS", "📣"),
+    ("#프로모션", "🎯"),
+]
+
+# 3) 태그 타입 → 이모지 (제목/힌트와 매칭 안 되면 사용)
+TAG_TYPE_EMOJI = {
+    "growth": "📈",
+    "retention": "🔁",
+    "expansion": "🧭",
+}
+
+TITLE_MATCHER = KeywordMatcher(TITLE_KEYWORD_EMOJI, ignore_case=True)
+TAG_HINT_MATCHER = KeywordMatcher(TAG_TEXT_HINTS)
+
+DEFAULT_NEW_ICON = "✨"
+DEFAULT_RECOMMENDED_ICON = "📌"
+
+# 시드 데이터의 더미 값 ('ICON', 'ICON1' ...) → 아직 계산 전인 값으로 간주
+_PLACEHOLDER_PREFIX = "ICON"
+
+
+def pick_emoji_from_title(title: Optional[str]) -> Optional[str]:
+    """제목에서 표 순서상 가장 앞선 키워드의 이모지를 반환 (대소문자 무시)"""
+    return TITLE_MATCHER.first(title)
+
+
+def pick_emoji_from_tags(tags: Iterable) -> Optional[str]:
+    """
+    태그로 이모지 추론 (tags: text/type 속성을 가진 객체들):
+    - 먼저 텍스트 힌트(#브런치 등)가 있으면 그걸 사용 (힌트 표 순서 우선)
+    - 없으면 type(growth/retention/expansion)으로 매핑 (첫 번째 태그 우선)
+    """
+    tags = list(tags)
+    emo = TAG_HINT_MATCHER.first_of(t.text for t in tags)
+    if emo:
+        return emo
+    for t in tags:
+        emo = TAG_TYPE_EMOJI.get(t.type or "")
+        if emo:
+            return emo
+    return None
+
+
+def compute_icon(title: Optional[str], tags: Iterable, is_new: bool) -> str:
+    """제목 키워드 → 태그 → 기본값(신규 ✨ / 기존 📌)"""
+    return (
+        pick_emoji_from_title(title)
+        or pick_emoji_from_tags(tags)
+        or (DEFAULT_NEW_ICON if is_new else DEFAULT_RECOMMENDED_ICON)
+    )
+
+
+def icon_field(is_new: bool) -> str:
+    """아이콘을 저장하는 필드명"""
+    return "reason_icon" if is_new else "icon"
+
+
+def is_placeholder(value: Optional[str]) -> bool:
+    return not value or value.startswith(_PLACEHOLDER_PREFIX)
+
+
+def display_icon(insight) -> str:
+    """
+    응답용 아이콘: 저장된 값을 그대로 사용하고,
+    아직 계산 전(빈값/더미)인 행만 즉석 계산합니다.
+    (tags 는 prefetch_related("tags") 된 캐시를 사용 → 추가 쿼리 없음)
+    """
+    stored = getattr(insight, icon_field(insight.is_new))
+    if not is_placeholder(stored):
+        return stored
+    return compute_icon(insight.title, insight.tags.all(), insight.is_new)
@@ -0,0 +1,121 @@
+# ai_insights/keyword_matcher.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - (키워드, 값) 목록을 Aho–Corasick 오토마톤으로 한 번 컴파일해 두고
+#   텍스트를 한 번만 훑어서 "우선순위가 가장 높은(목록에서 가장 앞선)" 매칭을 반환
+# - 키워드 수와 무관하게 텍스트 길이에 비례하는 비용
+#
+# 사용:
+#   matcher = KeywordMatcher([("브런치", "🥐"), ("SNS", "📣")], ignore_case=True)
+#   matcher.first("sns 브런치 세트")  # → "🥐" (목록 순서 우선)
+# -----------------------------------------------------------------------------
+from collections import deque
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_NO_MATCH = -1
+
+
+class KeywordMatcher(Generic[V]):
+    """
+    다중 패턴 매처 (Aho–Corasick).
+    - 우선순위 = 패턴 목록의 인덱스 (작을수록 우선)
+    - ignore_case=True 면 패턴/텍스트 모두 str.upper() 후 비교
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, V]], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self._values: List[V] = []
+        # 노드별 전이(dict), 실패 링크, 출력(해당 노드에서 끝나는 최고 우선순위)
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [_NO_MATCH]
+
+        for priority, (keyword, value) in enumerate(patterns):
+            self._values.append(value)
+            if keyword:
+                self._insert(self._norm(keyword), priority)
+        self._build_links()
+
+    def _norm(self, text: str) -> str:
+        return text.upper() if self.ignore_case else text
+
+    def _insert(self, keyword: str, priority: int) -> None:
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(_NO_MATCH)
+            node = nxt
+        if self._out[node] == _NO_MATCH or priority < self._out[node]:
+            self._out[node] = priority
+
+    def _build_links(self) -> None:
+        """
+        BFS 로 실패 링크를 만들고, 실패 체인의 출력을 미리 합쳐 둔 뒤
+        전이표를 DFA 로 펼쳐 둠 (매칭 시 실패 링크를 따라갈 필요 없음)
+        """
+        order = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                inherited = self._out[self._fail[child]]
+                if inherited != _NO_MATCH and (
+                    self._out[child] == _NO_MATCH or inherited < self._out[child]
+                ):
+                    self._out[child] = inherited
+
+        # DFA: 노드별 다음 상태 = 실패 노드의 전이표 + 자기 전이
+        # (BFS 순서라 실패 노드의 전이표가 항상 먼저 완성됨)
+        self._delta: List[dict] = [dict(self._goto[0])] * len(self._goto)
+        for node in order:
+            row = dict(self._delta[self._fail[node]])
+            row.update(self._goto[node])
+            self._delta[node] = row
+
+    def best(self, text: Optional[str]) -> Optional[Tuple[int, V]]:
+        """(우선순위, 값) — 매칭이 없으면 None"""
+        if not text:
+            return None
+        delta, out = self._delta, self._out
+        node = 0
+        best = _NO_MATCH
+        for ch in self._norm(text):
+            node = delta[node].get(ch, 0)
+            p = out[node]
+            if p != _NO_MATCH and (best == _NO_MATCH or p < best):
+                best = p
+                if best == 0:  # 더 높은 우선순위는 없음
+                    break
+        if best == _NO_MATCH:
+            return None
+        return best, self._values[best]
+
+    def first(self, text: Optional[str]) -> Optional[V]:
+        """가장 우선순위가 높은 매칭의 값 — 매칭이 없으면 None"""
+        hit = self.best(text)
+        return hit[1] if hit else None
+
+    def first_of(self, texts: Iterable[Optional[str]]) -> Optional[V]:
+        """여러 텍스트 중 가장 우선순위가 높은 매칭의 값"""
+        found: Optional[Tuple[int, V]] = None
+        for text in texts:
+            hit = self.best(text)
+            if hit and (found is None or hit[0] < found[0]):
+                found = hit
+                if found[0] == 0:
+                    break
+        return found[1] if found else None
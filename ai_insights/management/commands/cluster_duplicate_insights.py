@@ -0,0 +1,189 @@
+# ai_insights/management/commands/cluster_duplicate_insights.py
+# ------------------------------------------------------------
+# 목적:
+#  - 이미 쌓인 인사이트 중 문구만 조금 다른 "거의 같은" 인사이트를 찾아
+#    가장 먼저 생성된 인사이트를 대표로, 나머지는 duplicate_of 로 묶습니다.
+#
+# 방법 (ai_insights.dedup):
+#  1) 서명(MinHash)/LSH 버킷이 없는 인사이트를 청크 단위로 색인 (--rebuild 면 전체)
+#  2) 버킷 key 순으로 한 번 훑어서 같은 key 를 가진 인사이트 쌍만 후보로 모음
+#  3) 후보 쌍의 추정 유사도 >= --threshold 이고 생성 시각 차이가
+#     dedup.WINDOW_DAYS 일 이내면 union-find 로 같은 묶음
+#     (버킷 key 에 매장·규칙이 들어 있으므로 같은 매장·규칙끼리만 후보)
+#  4) 묶음마다 (created_at, id) 가 가장 빠른 인사이트가 대표
+#  5) 바뀐 행만 bulk_update (시그널 없음 → 인사이트 대시보드 카운터는 재계산)
+#
+# 사용 예:
+#   poetry run python manage.py cluster_duplicate_insights --dry-run
+#   poetry run python manage.py cluster_duplicate_insights --threshold 0.8
+#   poetry run python manage.py cluster_duplicate_insights --rebuild
+# ------------------------------------------------------------
+import time
+from datetime import timedelta
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ai_insights import dedup
+from ai_insights.models import Insight, InsightLshBucket, InsightSignature
+from home import counters
+
+
+def _chunked(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i : i + size]
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+class Command(BaseCommand):
+    help = "Cluster near-duplicate insights (MinHash/LSH) and set duplicate_of."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=dedup.THRESHOLD,
+            help=f"같은 인사이트로 볼 최소 추정 유사도 (기본 {dedup.THRESHOLD})",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="한 번에 서명을 만들/불러올 인사이트 수 (기본 500)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="모든 인사이트의 서명/버킷을 다시 만듭니다.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="duplicate_of 는 바꾸지 않고 묶음만 출력합니다. (서명 색인은 생성)",
+        )
+
+    def handle(self, *args, **opts):
+        threshold = opts["threshold"]
+        if not 0 < threshold <= 1:
+            raise CommandError("--threshold 는 0 초과 1 이하여야 합니다.")
+        chunk_size = max(1, opts["chunk_size"])
+        dry = opts["dry_run"]
+        verbose = opts["verbosity"] >= 2
+        started = time.perf_counter()
+
+        if dry:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+
+        # 1) 서명/버킷 색인
+        qs = Insight.objects.order_by("id")
+        if not opts["rebuild"]:
+            qs = qs.filter(signature__isnull=True)
+        todo = list(qs.values_list("id", flat=True))
+        for chunk in _chunked(todo, chunk_size):
+            dedup.refresh(chunk, mark=False)
+        if todo:
+            self.stdout.write(f"서명 생성: {len(todo)}")
+
+        # 2) 같은 버킷 key 를 가진 후보 쌍
+        pairs = set()
+        group_key, group = None, []
+        buckets = InsightLshBucket.objects.order_by("key", "insight_id").values_list(
+            "key", "insight_id"
+        )
+        for key, insight_id in buckets.iterator(chunk_size=5000):
+            if key != group_key:
+                pairs.update(combinations(group, 2))
+                group_key, group = key, []
+            group.append(insight_id)
+        pairs.update(combinations(group, 2))
+
+        # 3) 유사도 + 기간 확인 + union-find
+        ids = sorted({i for pair in pairs for i in pair})
+        signatures, created = {}, {}
+        for chunk in _chunked(ids, chunk_size):
+            for insight_id, minhash, created_at in InsightSignature.objects.filter(
+                insight_id__in=chunk
+            ).values_list("insight_id", "minhash", "insight__created_at"):
+                signatures[insight_id] = minhash
+                created[insight_id] = created_at
+        window = timedelta(days=dedup.WINDOW_DAYS)
+        uf = _UnionFind()
+        for a, b in pairs:
+            if a not in created or b not in created:
+                continue
+            if abs(created[a] - created[b]) > window:
+                continue
+            if dedup.similarity(signatures[a], signatures[b]) >= threshold:
+                uf.union(a, b)
+
+        clusters = {}
+        for insight_id in list(uf.parent):
+            clusters.setdefault(uf.find(insight_id), []).append(insight_id)
+        clusters = [members for members in clusters.values() if len(members) > 1]
+
+        # 4) 대표 지정
+        rows = {}
+        members_all = [i for members in clusters for i in members]
+        for chunk in _chunked(members_all, chunk_size):
+            rows.update(
+                (i.id, i)
+                for i in Insight.objects.filter(id__in=chunk).only(
+                    "id", "title", "created_at", "duplicate_of"
+                )
+            )
+
+        changed = []
+        for members in clusters:
+            members = sorted(
+                (rows[i] for i in members if i in rows),
+                key=lambda i: (i.created_at, i.id),
+            )
+            if len(members) < 2:
+                continue
+            canonical = members[0]
+            self.stdout.write(
+                f"- {canonical.id} ({canonical.title}) ← {len(members) - 1}건"
+            )
+            if verbose:
+                for insight in members[1:]:
+                    self.stdout.write(f"    · {insight.id} ({insight.title})")
+            for insight in members:
+                target = None if insight is canonical else canonical.id
+                if insight.duplicate_of_id != target:
+                    insight.duplicate_of_id = target
+                    changed.append(insight)
+
+        # 5) 반영
+        if changed and not dry:
+            with transaction.atomic():
+                Insight.objects.bulk_update(
+                    changed, ["duplicate_of"], batch_size=chunk_size
+                )
+                counters.recount(counters.insight_keys())
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS("=== cluster_duplicate_insights 결과 ==="))
+        self.stdout.write(f"후보 쌍: {len(pairs)} ({elapsed:.1f}s)")
+        self.stdout.write(f"묶음: {len(clusters)}")
+        self.stdout.write(
+            f"중복 인사이트: {sum(len(m) - 1 for m in clusters)} (기준 {threshold})"
+        )
+        self.stdout.write(f"변경{'(예정)' if dry else ''}: {len(changed)}")
+        self.stdout.write(self.style.SUCCESS("완료."))
@@ -7,104 +7,54 @@
 #
 # 특징:
 #  - 제목 키워드 매핑 > 태그 텍스트 힌트 > 태그 타입 매핑 > 기본값
+#  - 규칙은 ai_insights.icons 를 저장 시그널/API 와 공유
 #  - 여러 번 실행해도 안전(idempotent)
 #  - --dry-run 으로 변경 내역만 미리 보기
+#  - id 순으로 청크 단위 스트리밍(.iterator + 태그 prefetch) → 메모리 일정
+#  - 청크마다 bulk_update 1~2회 + 트랜잭션 커밋, 진행률/처리 속도 출력
+#  - --checkpoint-file 로 중단 지점부터 이어서 실행 (--after 로 직접 지정도 가능)
+#
+# 사용 예:
+#   poetry run python manage.py compute_insight_icons
+#   poetry run python manage.py compute_insight_icons --dry-run -v 2
+#   poetry run python manage.py compute_insight_icons --chunk-size 5000 \
+#       --checkpoint-file /tmp/insight_icons.ckpt
+#   poetry run python manage.py compute_insight_icons --after insight_120000
 # ------------------------------------------------------------
+import os
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
+from ai_insights.icons import compute_icon, icon_field
 from ai_insights.models import Insight
 
-# 1) 제목 키워드 → 이모지 (우선순위 1)
-TITLE_KEYWORD_EMOJI = [
-    ("브런치", "🥐"),
-    ("세트", "🧺"),
-    ("주말", "🗓️"),
-    ("점심", "🍱"),
-    ("할인", "🏷️"),
-    ("SNS", "📣"),
-    ("광고", "🚀"),
-    ("예산", "💰"),
-    ("리텐션", "🔁"),
-    ("재방문", "🔁"),
-    ("리뷰", "⭐"),
-    ("고객", "🧑‍🤝‍🧑"),
-    ("브랜드", "🏷️"),
-    ("인지도", "📈"),
-    ("가격", "⚖️"),
-    ("경쟁", "🥊"),
-    ("신규", "✨"),
-    ("음료", "🥤"),
-    ("여름", "🌞"),
-    ("테이크아웃", "🥡"),
-    ("런치", "🍱"),
-    ("해피아워", "⏳"),
-    ("오피스", "🏙️"),
-]
-
-# 2) 태그 텍스트 힌트 (우선순위 2)
-TAG_TEXT_HINTS = [
-    ("#브런치", "🥐"),
-    ("#테이크아웃", "🥡"),
-    ("#해피아워", "⏳"),
-    ("#고객경험", "🤝"),
-    ("#경쟁분석", "⚖️"),
-    ("#SNS", "📣"),
-    ("#프로모션", "🎯"),
-]
-
-# 3) 태그 타입 매핑 (우선순위 3)
-TAG_TYPE_EMOJI = {
-    "growth": "📈",
-    "retention": "🔁",
-    "expansion": "🧭",
-}
-
-
-def pick_emoji_from_title(title: str) -> str | None:
-    if not title:
+
+def _read_checkpoint(path: str):
+    if not path or not os.path.exists(path):
         return None
-    t = title.upper()
-    for kw, emo in TITLE_KEYWORD_EMOJI:
-        if kw.upper() in t:
-            return emo
-    return None
-
-
-def pick_emoji_from_tags(insight: Insight) -> str | None:
-    tags = list(insight.tags.all())
-    # 텍스트 힌트 우선
-    for hint, emo in TAG_TEXT_HINTS:
-        for t in tags:
-            if hint in (t.text or ""):
-                return emo
-    # 타입 기반
-    for t in tags:
-        emo = TAG_TYPE_EMOJI.get(t.type or "")
-        if emo:
-            return emo
-    return None
-
-
-def compute_for_new(insight: Insight) -> str:
-    # 신규(is_new=True): reason_icon 채움
-    emo = pick_emoji_from_title(insight.title)
-    if emo:
-        return emo
-    emo = pick_emoji_from_tags(insight)
-    if emo:
-        return emo
-    return "✨"  # 기본
-
-
-def compute_for_recommended(insight: Insight) -> str:
-    # 기존(is_new=False): icon 채움
-    emo = pick_emoji_from_title(insight.title)
-    if emo:
-        return emo
-    emo = pick_emoji_from_tags(insight)
-    if emo:
-        return emo
-    return "📌"  # 기본
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip() or None
+
+
+def _write_checkpoint(path: str, last_id: str) -> None:
+    # 임시 파일에 쓰고 교체 → 중간에 죽어도 체크포인트가 깨지지 않음
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(last_id)
+    os.replace(tmp, path)
+
+
+def _chunked(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 class Command(BaseCommand):
@@ -116,39 +66,92 @@ class Command(BaseCommand):
             action="store_true",
             help="DB에 저장하지 않고 변경 예정만 출력합니다.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="한 번에 읽고 bulk_update 할 행 수 (기본 2000)",
+        )
+        parser.add_argument(
+            "--after",
+            default=None,
+            help="이 id 다음부터 처리합니다 (체크포인트 파일보다 우선).",
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            default=None,
+            help="청크마다 마지막 id 를 기록하고, 다음 실행 시 그 다음부터 이어서 처리",
+        )
 
     def handle(self, *args, **opts):
         dry = opts["dry_run"]
+        chunk_size = max(1, opts["chunk_size"])
+        checkpoint = opts["checkpoint_file"]
+        verbose = opts["verbosity"] >= 2
+        after = opts["after"] or _read_checkpoint(checkpoint)
+
+        qs = Insight.objects.only("id", "title", "is_new", "icon", "reason_icon")
+        if after:
+            qs = qs.filter(id__gt=after)
+            self.stdout.write(f"resume: id > {after}")
+        total = qs.count()
+        rows = qs.order_by("id").prefetch_related("tags").iterator(chunk_size)
+
+        if dry:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+
+        scanned = 0
         patched_new = 0
         patched_old = 0
-
-        # 신규 카드 → reason_icon 채우기
-        for ins in Insight.objects.filter(is_new=True):
-            new_icon = compute_for_new(ins)
-            old_icon = ins.reason_icon or ""
-            if old_icon != new_icon:
-                self.stdout.write(
-                    f"[NEW ] {ins.id} '{ins.title}': {old_icon} -> {new_icon}"
-                )
-                if not dry:
-                    ins.reason_icon = new_icon
-                    ins.save(update_fields=["reason_icon"])
-                patched_new += 1
-
-        # 기존 카드 → icon 채우기
-        for ins in Insight.objects.filter(is_new=False):
-            new_icon = compute_for_recommended(ins)
-            old_icon = ins.icon or ""
-            if old_icon != new_icon:
-                self.stdout.write(
-                    f"[RECO] {ins.id} '{ins.title}': {old_icon} -> {new_icon}"
-                )
-                if not dry:
-                    ins.icon = new_icon
-                    ins.save(update_fields=["icon"])
-                patched_old += 1
-
+        started = time.perf_counter()
+        for chunk in _chunked(rows, chunk_size):
+            n_new, n_old = self._process(chunk, dry, verbose)
+            scanned += len(chunk)
+            patched_new += n_new
+            patched_old += n_old
+            self._progress(scanned, total, started, chunk[-1].id)
+            if checkpoint and not dry:
+                _write_checkpoint(checkpoint, chunk[-1].id)
+
+        # 끝까지 처리했으면 체크포인트 제거 (다음 실행은 처음부터)
+        if checkpoint and not dry and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        elapsed = time.perf_counter() - started
         self.stdout.write(self.style.SUCCESS("=== compute_insight_icons 결과 ==="))
+        self.stdout.write(f"scanned: {scanned} ({elapsed:.1f}s)")
         self.stdout.write(f"is_new=True  patched: {patched_new}")
         self.stdout.write(f"is_new=False patched: {patched_old}")
         self.stdout.write(self.style.SUCCESS("완료."))
+
+    def _process(self, chunk, dry: bool, verbose: bool):
+        """청크의 아이콘 계산 → 필드별 bulk_update (시그널 없음)"""
+        changed = {"reason_icon": [], "icon": []}
+        for ins in chunk:
+            field = icon_field(ins.is_new)
+            new_icon = compute_icon(ins.title, ins.tags.all(), ins.is_new)
+            old_icon = getattr(ins, field) or ""
+            if old_icon == new_icon:
+                continue
+            if verbose:
+                label = "NEW " if ins.is_new else "RECO"
+                self.stdout.write(
+                    f"[{label}] {ins.id} '{ins.title}': {old_icon} -> {new_icon}"
+                )
+            setattr(ins, field, new_icon)
+            changed[field].append(ins)
+
+        if not dry:
+            with transaction.atomic():
+                for field, objs in changed.items():
+                    if objs:
+                        Insight.objects.bulk_update(objs, [field])
+        return len(changed["reason_icon"]), len(changed["icon"])
+
+    def _progress(self, scanned: int, total: int, started: float, last_id) -> None:
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        pct = (scanned / total * 100) if total else 100.0
+        self.stdout.write(
+            f"progress: {scanned}/{total} ({pct:.1f}%) "
+            f"{scanned / elapsed:,.0f} rows/s  last_id={last_id}"
+        )
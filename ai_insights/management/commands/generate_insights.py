@@ -0,0 +1,108 @@
+# ai_insights/management/commands/generate_insights.py
+# ------------------------------------------------------------
+# 목적:
+#  - 매장별 일별 성과(DailyPerformance)에 규칙(ai_insights.rules)을 적용해
+#    신규 인사이트(is_new=True)를 자동 생성합니다.
+#
+# 특징:
+#  - 규칙: 전주 대비 매출 급증/급감, 채널별 ROAS 하락, 주말/평일 매출 쏠림
+#  - 매장 묶음(--batch-stores) 단위로 프로세스 풀(--workers)에서 평가
+#  - 인사이트/분석 항목/추천/태그 연결은 묶음마다 bulk_create
+#  - 같은 기준일(--as-of)로 여러 번 실행해도 안전(idempotent)
+#  - 같은 매장에 거의 같은 문구의 인사이트가 있으면 만들지 않음 (MinHash/LSH)
+#  - --dry-run 으로 생성 예정 건수만 확인
+#
+# 사용 예:
+#   poetry run python manage.py generate_insights
+#   poetry run python manage.py generate_insights --as-of 2025-08-31 --workers 8
+#   poetry run python manage.py generate_insights --store store_001 --dry-run
+# ------------------------------------------------------------
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ai_insights import engine
+
+
+class Command(BaseCommand):
+    help = "Generate insights from daily performance with the rule engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--as-of",
+            default=None,
+            help="기준일 YYYY-MM-DD (기본: 오늘). 이 날까지의 성과를 봅니다.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=engine.DEFAULT_DAYS,
+            help=f"분석 기간(일) (기본 {engine.DEFAULT_DAYS}, 최소 14)",
+        )
+        parser.add_argument(
+            "--store",
+            action="append",
+            default=None,
+            help="특정 매장만 (store_external_id, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="규칙 평가 프로세스 수 (1이면 순차 실행)",
+        )
+        parser.add_argument(
+            "--batch-stores",
+            type=int,
+            default=engine.DEFAULT_BATCH_STORES,
+            help=f"한 번에 평가/저장할 매장 수 (기본 {engine.DEFAULT_BATCH_STORES})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="DB에 저장하지 않고 생성 예정 건수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["as_of"]:
+            try:
+                as_of = date.fromisoformat(opts["as_of"])
+            except ValueError:
+                raise CommandError("--as-of 는 YYYY-MM-DD 형식이어야 합니다.")
+        else:
+            as_of = timezone.localdate()
+        days = max(14, opts["days"])
+        dry = opts["dry_run"]
+
+        if dry:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+
+        def progress(stats):
+            rate = stats["stores"] / stats["elapsed"] if stats["elapsed"] else 0
+            self.stdout.write(
+                f"progress: stores={stats['stores']} findings={stats['findings']} "
+                f"created={stats['created']} ({rate:,.0f} stores/s)"
+            )
+
+        stats = engine.run(
+            as_of,
+            days=days,
+            stores=opts["store"],
+            workers=max(1, opts["workers"]),
+            batch_stores=max(1, opts["batch_stores"]),
+            dry_run=dry,
+            on_batch=progress,
+        )
+
+        self.stdout.write(self.style.SUCCESS("=== generate_insights 결과 ==="))
+        self.stdout.write(f"기준일: {as_of} (최근 {days}일)")
+        self.stdout.write(f"매장 수: {stats['stores']} ({stats['elapsed']:.1f}s)")
+        self.stdout.write(f"발견: {stats['findings']}")
+        for rule, n in sorted(stats["by_rule"].items()):
+            self.stdout.write(f"  - {rule}: {n}")
+        self.stdout.write(f"생성: {stats['created']}")
+        self.stdout.write(f"스킵(이미 생성됨): {stats['skipped']}")
+        self.stdout.write(f"스킵(유사 인사이트 있음): {stats['deduped']}")
+        self.stdout.write(self.style.SUCCESS("완료."))
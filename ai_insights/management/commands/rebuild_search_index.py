@@ -0,0 +1,60 @@
+# ai_insights/management/commands/rebuild_search_index.py
+# ------------------------------------------------------------
+# 목적:
+#  - 인사이트 검색 색인(InsightSearchDocument)을 전체 다시 만듭니다.
+#  - 검색 기능 도입 전 데이터, 시그널을 타지 않는 경로(QuerySet.update 등)로
+#    바뀐 본문을 색인에 반영할 때 사용
+#
+# 특징:
+#  - id 순으로 청크 단위 처리 (청크마다 조회 2~3쿼리 + upsert 1쿼리)
+#  - 여러 번 실행해도 안전(idempotent)
+#
+# 사용 예:
+#   poetry run python manage.py rebuild_search_index
+#   poetry run python manage.py rebuild_search_index --chunk-size 1000
+# ------------------------------------------------------------
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai_insights.models import Insight, InsightSearchDocument
+from ai_insights.search import index_many
+
+
+class Command(BaseCommand):
+    help = "Rebuild the insight full-text search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="한 번에 색인할 인사이트 수 (기본 500)",
+        )
+
+    def handle(self, *args, **opts):
+        chunk_size = max(1, opts["chunk_size"])
+        started = time.perf_counter()
+
+        # 인사이트가 지워졌는데 남아 있는 문서 정리
+        orphans, _ = InsightSearchDocument.objects.exclude(
+            insight_id__in=Insight.objects.values("id")
+        ).delete()
+
+        indexed = 0
+        chunk = []
+        ids = Insight.objects.order_by("id").values_list("id", flat=True)
+        for insight_id in ids.iterator(chunk_size=chunk_size):
+            chunk.append(insight_id)
+            if len(chunk) >= chunk_size:
+                indexed += index_many(chunk)
+                chunk = []
+                self.stdout.write(f"progress: {indexed}")
+        if chunk:
+            indexed += index_many(chunk)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS("=== rebuild_search_index 결과 ==="))
+        self.stdout.write(f"색인: {indexed} ({elapsed:.1f}s)")
+        self.stdout.write(f"정리된 문서: {orphans}")
+        self.stdout.write(self.style.SUCCESS("완료."))
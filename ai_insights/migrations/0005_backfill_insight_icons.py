@@ -0,0 +1,92 @@
+from django.db import migrations
+
+# 마이그레이션 시점의 아이콘 규칙 (ai_insights.icons 가 바뀌어도 결과가 달라지지 않도록 복사)
+TITLE_KEYWORD_EMOJI = [
+    ("브런치", "🥐"),
+    ("세트", "🧺"),
+    ("주말", "🗓️"),
+    ("점심", "🍱"),
+    ("할인", "🏷️"),
+    ("SNS", "📣"),
+    ("광고", "🚀"),
+    ("예산", "💰"),
+    ("리텐션", "🔁"),
+    ("재방문", "🔁"),
+    ("리뷰", "⭐"),
+    ("고객", "🧑‍🤝‍🧑"),
+    ("브랜드", "🏷️"),
+    ("인지도", "📈"),
+    ("가격", "⚖️"),
+    ("경쟁", "🥊"),
+    ("신규", "✨"),
+    ("음료", "🥤"),
+    ("여름", "🌞"),
+    ("테이크아웃", "🥡"),
+    ("런치", "🍱"),
+    ("해피아워", "⏳"),
+    ("오피스", "🏙️"),
+]
+
+TAG_TEXT_HINTS = [
+    ("#브런치", "🥐"),
+    ("#테이크아웃", "🥡"),
+    ("#해피아워", "⏳"),
+    ("#고객경험", "🤝"),
+    ("#경쟁분석", "⚖️"),
+    ("#SNS", "📣"),
+    ("#프로모션", "🎯"),
+]
+
+TAG_TYPE_EMOJI = {
+    "growth": "📈",
+    "retention": "🔁",
+    "expansion": "🧭",
+}
+
+
+def compute_icon(title, tags, is_new):
+    """제목 키워드(표 순서, 대소문자 무시) → 태그 힌트(표 순서) → 태그 타입 → 기본값"""
+    upper = (title or "").upper()
+    for keyword, emoji in TITLE_KEYWORD_EMOJI:
+        if keyword.upper() in upper:
+            return emoji
+    tags = list(tags)
+    for hint, emoji in TAG_TEXT_HINTS:
+        if any(hint in (t.text or "") for t in tags):
+            return emoji
+    for t in tags:
+        emoji = TAG_TYPE_EMOJI.get(t.type or "")
+        if emoji:
+            return emoji
+    return "✨" if is_new else "📌"
+
+
+def icon_field(is_new):
+    return "reason_icon" if is_new else "icon"
+
+
+def backfill_icons(apps, schema_editor):
+    """
+    기존 행의 아이콘을 저장 시점 계산 규칙으로 한 번 채웁니다.
+    (이후에는 ai_insights.signals 가 저장 시마다 갱신)
+    """
+    Insight = apps.get_model("ai_insights", "Insight")
+    changed = []
+    for ins in Insight.objects.prefetch_related("tags").iterator(chunk_size=500):
+        field = icon_field(ins.is_new)
+        icon = compute_icon(ins.title, ins.tags.all(), ins.is_new)
+        if getattr(ins, field) != icon:
+            setattr(ins, field, icon)
+            changed.append(ins)
+    Insight.objects.bulk_update(changed, ["icon", "reason_icon"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_insights", "0004_insight_summary_alter_insight_icon_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_icons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_insights", "0005_backfill_insight_icons"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                fields=["is_new", "-created_at", "-id"],
+                name="insight_isnew_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_insights", "0006_insight_isnew_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="insight",
+            name="rule_code",
+            field=models.CharField(blank=True, default="", max_length=50),
+        ),
+        migrations.AddField(
+            model_name="insight",
+            name="store_external_id",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=100
+            ),
+        ),
+    ]
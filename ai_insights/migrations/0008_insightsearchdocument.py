@@ -0,0 +1,92 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+DOC_TABLE = "ai_insights_insightsearchdocument"
+FTS_TABLE = "ai_insights_insightsearch_fts"
+
+# PostgreSQL: tsvector 식 인덱스 (ai_insights.search 의 쿼리와 같은 식)
+PG_CREATE = [
+    f"CREATE INDEX IF NOT EXISTS insight_search_body_gin ON {DOC_TABLE} "
+    "USING GIN (to_tsvector('simple', body))",
+]
+PG_DROP = ["DROP INDEX IF EXISTS insight_search_body_gin"]
+
+# SQLite: 외부 콘텐츠 FTS5 테이블 + 문서 테이블 트리거로 동기화
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"body, content='{DOC_TABLE}', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {DOC_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {DOC_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) "
+    "VALUES ('delete', old.id, old.body); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {DOC_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) "
+    "VALUES ('delete', old.id, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.id, new.body); END",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _run(schema_editor, PG_CREATE)
+    elif vendor == "sqlite":
+        _run(schema_editor, SQLITE_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _run(schema_editor, PG_DROP)
+    elif vendor == "sqlite":
+        _run(schema_editor, SQLITE_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_insights", "0007_insight_store_rule"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InsightSearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("body", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "insight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_document",
+                        to="ai_insights.insight",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
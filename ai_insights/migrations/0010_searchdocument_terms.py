@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai_insights", "0009_insight_dedup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="insightsearchdocument",
+            name="terms",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -15,6 +15,16 @@ class InsightTag(models.Model):
         return f"{self.text} ({self.type})"
 
 
+class InsightQuerySet(models.QuerySet):
+    def shared(self):
+        """
+        공용 피드(목록/검색/대시보드)에 노출할 인사이트
+        - 규칙 엔진이 만든 매장별 인사이트(store_external_id 지정)는 그 매장의 매출/광고비가
+          들어 있으므로 제외 (매장 소유자 기준 조회가 생기기 전까지는 공용 피드에 넣지 않음)
+        """
+        return self.filter(store_external_id="")
+
+
 class Insight(models.Model):
     id = models.CharField(max_length=50, primary_key=True)  # 예: 'insight_001'
     title = models.CharField(max_length=255)
@@ -34,6 +44,32 @@ class Insight(models.Model):
     # 2번 상세 포맷 전용 필드
     summary = models.TextField(null=True, blank=True)  # "상권 주변 ~ 제안합니다."
 
+    # 규칙 엔진(ai_insights.engine)이 만든 인사이트의 매장 / 규칙 (수동 시드는 빈 값)
+    store_external_id = models.CharField(
+        max_length=100, blank=True, default="", db_index=True
+    )
+    rule_code = models.CharField(max_length=50, blank=True, default="")
+
+    # 거의 같은 내용의 인사이트(ai_insights.dedup)면 대표 인사이트를 가리킴 → 목록에서 제외
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates",
+    )
+
+    objects = InsightQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # 목록 커서 페이지네이션: is_new 별 (created_at, id) 역순 탐색
+            models.Index(
+                fields=["is_new", "-created_at", "-id"],
+                name="insight_isnew_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"[{self.id}] {self.title}"
 
@@ -73,3 +109,56 @@ class InsightRecommendation(models.Model):
 
     def __str__(self):
         return f"{self.insight_id} / {self.title}"
+
+
+class InsightSearchDocument(models.Model):
+    """
+    검색용 역색인 문서 (ai_insights.search)
+    - body: 제목/요약/설명/분석 항목/추천 설명을 토큰화한 문자열 (공백 구분)
+      · 한글/한자: 2-gram, 영문/숫자: 단어 그대로(소문자)
+    - PostgreSQL: to_tsvector('simple', body) GIN 인덱스
+    - SQLite: FTS5 가상 테이블(트리거로 동기화)
+    - terms: body + 태그 토큰의 정규화된 가중치 {토큰: 가중치} (지역별 랭킹용)
+    """
+
+    insight = models.OneToOneField(
+        Insight, on_delete=models.CASCADE, related_name="search_document"
+    )
+    body = models.TextField(default="", blank=True)
+    terms = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"search:{self.insight_id}"
+
+
+class InsightSignature(models.Model):
+    """
+    중복 탐지용 MinHash 서명 (ai_insights.dedup)
+    - minhash: 제목/요약/추천 문장의 문자 3-gram 집합에 대한 최소 해시값 목록
+    """
+
+    insight = models.OneToOneField(
+        Insight, on_delete=models.CASCADE, related_name="signature"
+    )
+    minhash = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"minhash:{self.insight_id}"
+
+
+class InsightLshBucket(models.Model):
+    """
+    MinHash LSH 버킷 (밴드마다 1행)
+    - key: (매장, 밴드 번호, 밴드 구간 서명) 해시 → 같은 key 를 공유하면 중복 후보
+    """
+
+    insight = models.ForeignKey(
+        Insight, on_delete=models.CASCADE, related_name="lsh_buckets"
+    )
+    band = models.PositiveSmallIntegerField()
+    key = models.CharField(max_length=32, db_index=True)
+
+    def __str__(self):
+        return f"{self.insight_id} / band {self.band}"
@@ -0,0 +1,69 @@
+# ai_insights/pagination.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 인사이트 목록을 (created_at, id) 기준 커서(keyset) 페이지네이션으로 나눠 내려줌
+# - OFFSET 없이 "마지막으로 본 행 다음"부터 읽으므로 페이지가 깊어져도 비용이 일정
+#
+# 커서:
+# - "<created_at ISO>|<id>" 를 URL-safe base64 로 인코딩한 불투명 문자열
+# - 정렬은 항상 created_at DESC, id DESC (동일 시각이어도 순서가 고정됨)
+# -----------------------------------------------------------------------------
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from ninja.errors import HttpError
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+ORDERING = ("-created_at", "-id")
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """limit 을 1 ~ MAX_LIMIT 범위로 제한 (없으면 DEFAULT_LIMIT)"""
+    if not limit or limit < 1:
+        return DEFAULT_LIMIT
+    return min(int(limit), MAX_LIMIT)
+
+
+def encode_cursor(created_at: datetime, pk: str) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """잘못된 커서는 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, pk = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), pk
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HttpError(400, "Invalid cursor")
+
+
+def paginate(
+    qs: QuerySet, cursor: Optional[str], limit: Optional[int]
+) -> Tuple[List, Optional[str]]:
+    """
+    qs 를 커서 다음부터 limit 개 읽어서 (rows, next_cursor) 반환
+    - limit + 1 개를 읽어 다음 페이지 존재 여부를 판단 (COUNT 쿼리 없음)
+    - 마지막 페이지면 next_cursor=None
+    """
+    limit = clamp_limit(limit)
+    qs = qs.order_by(*ORDERING)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        qs = qs.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    rows = list(qs[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.pk)
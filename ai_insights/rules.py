@@ -0,0 +1,274 @@
+# ai_insights/rules.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 매장별 일별 성과(DailyPerformance 합계)를 보고 인사이트 후보(finding)를 만드는 규칙 모음
+# - ai_insights.engine 이 프로세스 풀에서 evaluate_frame() 을 호출
+#
+# 데이터 형태 (frame, 피클 가능한 dict):
+#   {
+#     "store": "store_001",
+#     "start": date,                       # 창(window) 첫날
+#     "days": 28,                          # 창 길이 (모든 배열 길이)
+#     "sales": [int] * days, "spend": [...], "clicks": [...], "impressions": [...],
+#     "channels": {"instagram": {"sales": [...], "spend": [...]}, ...},
+#   }
+# - 날짜별 값을 열(column) 배열로 들고 있으므로 규칙은 슬라이스 합계만으로 계산
+#   (numpy 없이 순수 파이썬, 행 단위 반복 없음)
+#
+# finding (dict):
+#   rule, key, score, title, summary, reason_text,
+#   tags [(text, type)], items [(icon, title, description)],
+#   recommendation (title, item_icon, item_title, item_description)
+#
+# 주의: 워커 프로세스에서 import 하므로 Django 모델을 import 하지 않습니다.
+# -----------------------------------------------------------------------------
+from typing import Dict, List, Optional
+
+WEEK = 7
+
+# 규칙 임계값 (필요 시 조정)
+WOW_MIN_PREV_SALES = 100_000  # 직전 7일 매출이 이보다 작으면 변동률을 보지 않음
+WOW_SURGE_PCT = 0.30  # +30% 이상 → 급증
+WOW_DROP_PCT = -0.30  # -30% 이하 → 급감
+ROAS_MIN_SPEND = 50_000  # 채널별 주간 광고비 최소치
+ROAS_DROP_PCT = 0.25  # ROAS 25% 이상 하락
+SKEW_HIGH = 1.5  # 주말 평균 / 평일 평균
+SKEW_LOW = 1 / SKEW_HIGH
+SKEW_MIN_DAILY_SALES = 30_000
+
+CHANNEL_LABELS = {
+    "instagram": "인스타그램",
+    "facebook": "페이스북",
+    "naver": "네이버",
+    "kakao": "카카오",
+    "google": "구글",
+}
+
+
+def _pct(cur: float, prev: float) -> float:
+    return (cur - prev) / prev if prev else 0.0
+
+
+def _roas(sales: int, spend: int) -> float:
+    return sales / spend if spend else 0.0
+
+
+def _weekly(values: List[int]):
+    """(최근 7일 합, 직전 7일 합)"""
+    return sum(values[-WEEK:]), sum(values[-2 * WEEK : -WEEK])
+
+
+# ----------------------------
+# 1) 전주 대비 매출 급증/급감
+# ----------------------------
+def wow_sales_change(frame: Dict) -> List[Dict]:
+    if frame["days"] < 2 * WEEK:
+        return []
+    cur, prev = _weekly(frame["sales"])
+    if prev < WOW_MIN_PREV_SALES:
+        return []
+    pct = _pct(cur, prev)
+    spend_cur, spend_prev = _weekly(frame["spend"])
+    ad_desc = (
+        f"같은 기간 광고비 {spend_cur:,}원 (직전 7일 {spend_prev:,}원), "
+        f"ROAS {_roas(cur, spend_cur):.1f}"
+    )
+    sales_desc = f"최근 7일 매출 {cur:,}원, 직전 7일 {prev:,}원 (전주 대비 {pct:+.0%})"
+
+    if pct >= WOW_SURGE_PCT:
+        return [
+            {
+                "rule": "wow_sales_surge",
+                "key": "",
+                "score": pct,
+                "title": f"매출이 전주 대비 {pct:.0%} 증가",
+                "summary": (
+                    f"최근 7일 매출이 전주보다 {pct:.0%} 늘었습니다. "
+                    "상승세가 이어지도록 성과가 좋은 광고에 예산을 더 배분하는 것을 제안합니다."
+                ),
+                "reason_text": f"전주 대비 매출 {pct:+.0%}",
+                "tags": [("#매출상승", "growth"), ("#광고", "growth")],
+                "items": [
+                    ("🧾", "매출 데이터", sales_desc),
+                    ("📊", "광고 성과", ad_desc),
+                ],
+                "recommendation": (
+                    "추천 실행 계획",
+                    "🚀",
+                    "상승 구간 광고 예산 확대",
+                    "매출이 늘어난 기간의 광고 소재와 타겟을 유지하고 일 예산을 20% 늘려 보세요.",
+                ),
+            }
+        ]
+    if pct <= WOW_DROP_PCT:
+        return [
+            {
+                "rule": "wow_sales_drop",
+                "key": "",
+                "score": -pct,
+                "title": f"매출이 전주 대비 {-pct:.0%} 감소",
+                "summary": (
+                    f"최근 7일 매출이 전주보다 {-pct:.0%} 줄었습니다. "
+                    "기존 고객의 재방문을 유도하는 프로모션을 제안합니다."
+                ),
+                "reason_text": f"전주 대비 매출 {pct:+.0%}",
+                "tags": [("#재방문", "retention"), ("#프로모션", "growth")],
+                "items": [
+                    ("🧾", "매출 데이터", sales_desc),
+                    ("📊", "광고 성과", ad_desc),
+                ],
+                "recommendation": (
+                    "추천 실행 계획",
+                    "🎯",
+                    "재방문 고객 할인 프로모션",
+                    "최근 방문 고객 대상 재방문 쿠폰을 발송하고 SNS 에 한정 혜택을 알려 보세요.",
+                ),
+            }
+        ]
+    return []
+
+
+# ----------------------------
+# 2) 채널별 ROAS 하락 (가장 많이 떨어진 채널 1개)
+# ----------------------------
+def channel_roas_drop(frame: Dict) -> List[Dict]:
+    if frame["days"] < 2 * WEEK:
+        return []
+    worst: Optional[Dict] = None
+    for channel, cols in frame["channels"].items():
+        spend_cur, spend_prev = _weekly(cols["spend"])
+        if spend_cur < ROAS_MIN_SPEND or spend_prev < ROAS_MIN_SPEND:
+            continue
+        sales_cur, sales_prev = _weekly(cols["sales"])
+        roas_cur = _roas(sales_cur, spend_cur)
+        roas_prev = _roas(sales_prev, spend_prev)
+        if not roas_prev:
+            continue
+        drop = 1 - roas_cur / roas_prev
+        if drop >= ROAS_DROP_PCT and (worst is None or drop > worst["drop"]):
+            worst = {
+                "channel": channel,
+                "drop": drop,
+                "roas_cur": roas_cur,
+                "roas_prev": roas_prev,
+                "spend_cur": spend_cur,
+            }
+    if worst is None:
+        return []
+
+    label = CHANNEL_LABELS.get(worst["channel"].lower(), worst["channel"])
+    drop = worst["drop"]
+    return [
+        {
+            "rule": "channel_roas_drop",
+            "key": worst["channel"],
+            "score": drop,
+            "title": f"{label} 광고 ROAS {drop:.0%} 하락",
+            "summary": (
+                f"{label} 채널의 광고 효율(ROAS)이 전주보다 {drop:.0%} 떨어졌습니다. "
+                "소재 교체와 예산 재배분을 제안합니다."
+            ),
+            "reason_text": f"{label} ROAS {worst['roas_prev']:.1f} → {worst['roas_cur']:.1f}",
+            "tags": [("#광고효율", "growth"), ("#SNS", "growth")],
+            "items": [
+                (
+                    "📉",
+                    "채널 성과",
+                    f"{label} ROAS 직전 7일 {worst['roas_prev']:.1f} → "
+                    f"최근 7일 {worst['roas_cur']:.1f}",
+                ),
+                ("💰", "광고비", f"최근 7일 {label} 광고비 {worst['spend_cur']:,}원"),
+            ],
+            "recommendation": (
+                "추천 실행 계획",
+                "🔄",
+                f"{label} 소재 교체 및 예산 재배분",
+                "반응이 떨어진 소재를 새 소재로 교체하고, 효율이 좋은 채널로 예산 일부를 옮겨 보세요.",
+            ),
+        }
+    ]
+
+
+# ----------------------------
+# 3) 주말/평일 매출 쏠림
+# ----------------------------
+def weekend_skew(frame: Dict) -> List[Dict]:
+    # 요일별 열: sales[offset::7] 은 모두 같은 요일
+    first_weekday = frame["start"].weekday()
+    weekend, weekday = [], []
+    for offset in range(WEEK):
+        column = frame["sales"][offset::WEEK]
+        (weekend if (first_weekday + offset) % WEEK >= 5 else weekday).extend(column)
+    if len(weekend) < 4 or len(weekday) < 10:
+        return []
+    avg_weekend = sum(weekend) / len(weekend)
+    avg_weekday = sum(weekday) / len(weekday)
+    if min(avg_weekend, avg_weekday) < SKEW_MIN_DAILY_SALES:
+        return []
+    ratio = avg_weekend / avg_weekday
+    desc = (
+        f"최근 {frame['days']}일 주말 일평균 매출 {avg_weekend:,.0f}원, "
+        f"평일 일평균 {avg_weekday:,.0f}원 ({ratio:.1f}배)"
+    )
+
+    if ratio >= SKEW_HIGH:
+        return [
+            {
+                "rule": "weekend_skew",
+                "key": "weekend",
+                "score": ratio,
+                "title": f"주말 매출이 평일의 {ratio:.1f}배",
+                "summary": (
+                    "매출이 주말에 몰려 있습니다. "
+                    "평일 오후 해피아워 등으로 평일 수요를 끌어올리는 것을 제안합니다."
+                ),
+                "reason_text": f"주말/평일 매출 {ratio:.1f}배",
+                "tags": [("#해피아워", "growth"), ("#시간대마케팅", "retention")],
+                "items": [("🗓️", "요일별 매출", desc)],
+                "recommendation": (
+                    "추천 실행 계획",
+                    "⏳",
+                    "평일 해피아워 프로모션",
+                    "평일 오후 한산한 시간대에 음료/세트 할인을 걸고 지역 타겟 광고로 알려 보세요.",
+                ),
+            }
+        ]
+    if ratio <= SKEW_LOW:
+        return [
+            {
+                "rule": "weekend_skew",
+                "key": "weekday",
+                "score": 1 / ratio,
+                "title": f"평일 매출이 주말의 {1 / ratio:.1f}배",
+                "summary": (
+                    "매출이 평일에 몰려 있습니다. "
+                    "주말 브런치/세트 메뉴로 주말 방문을 늘리는 것을 제안합니다."
+                ),
+                "reason_text": f"평일/주말 매출 {1 / ratio:.1f}배",
+                "tags": [("#브런치", "growth"), ("#시간대마케팅", "retention")],
+                "items": [("🗓️", "요일별 매출", desc)],
+                "recommendation": (
+                    "추천 실행 계획",
+                    "🥐",
+                    "주말 브런치 세트 프로모션",
+                    "주말 오전 브런치 세트를 구성하고 주변 주거 지역에 SNS 광고를 집행해 보세요.",
+                ),
+            }
+        ]
+    return []
+
+
+# 규칙 목록 (순서 = 출력 순서)
+RULES = [
+    wow_sales_change,
+    channel_roas_drop,
+    weekend_skew,
+]
+
+
+def evaluate_frame(frame: Dict) -> List[Dict]:
+    """매장 1곳에 모든 규칙 적용 (프로세스 풀 워커에서 호출)"""
+    findings = []
+    for rule in RULES:
+        findings.extend(rule(frame))
+    return findings
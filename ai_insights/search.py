@@ -0,0 +1,214 @@
+# ai_insights/search.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 인사이트 본문 검색 (제목/요약/설명 + 분석 항목 설명 + 추천 설명)
+#
+# 색인:
+# - InsightSearchDocument.body 에 토큰을 공백으로 이어 저장 (저장 시그널로 갱신)
+# - 토큰화: 한글/한자는 2-gram("브런치" → "브런 런치"), 영문/숫자는 단어(소문자)
+# - PostgreSQL: to_tsvector('simple', body) GIN 인덱스 + ts_rank
+# - SQLite: FTS5 외부 콘텐츠 테이블(트리거 동기화) + bm25
+# - 그 외 DB: body LIKE 검색 (토큰 등장 횟수로 정렬)
+#
+# 질의:
+# - 질의도 같은 방식으로 토큰화 → 모든 토큰을 포함하는(AND) 문서만
+# - 한 글자 한글 질의("빵")는 접두어 매칭("빵*")
+# - 공용 인사이트만 (매장별 규칙 엔진 결과는 제외, Insight.objects.shared 와 같은 조건)
+#
+# 용어 벡터 (terms):
+# - 같은 토큰 + 태그 토큰(TAG_WEIGHT 배)으로 1+log(tf) 가중치 → L2 정규화
+# - 색인 후 search_indexed 시그널 발송 (home.ranking 이 지역별 랭킹 갱신에 사용)
+#
+# 기존 데이터 색인: poetry run python manage.py rebuild_search_index
+# -----------------------------------------------------------------------------
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection
+from django.dispatch import Signal
+
+from .models import Insight, InsightRecommendation, InsightSearchDocument
+
+FTS_TABLE = "ai_insights_insightsearch_fts"
+TAG_WEIGHT = 2.0
+
+# index_many 가 문서를 다시 만든 뒤 발송: insight_ids=[...]
+search_indexed = Signal()
+
+# 한글(자모/음절) + CJK 통합 한자 → 2-gram, 그 외 글자/숫자 연속 → 단어
+_CJK = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff"
+_TOKEN_RE = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+
+def _is_cjk(token: str) -> bool:
+    return bool(_CJK_RE.match(token))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """텍스트 → 토큰 목록 (순서 유지, 중복 포함)"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for run in _TOKEN_RE.findall(text):
+        if _is_cjk(run) and len(run) > 1:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def query_tokens(q: Optional[str]) -> List[str]:
+    """질의 토큰 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(tokenize(q)))
+
+
+def _is_prefix(token: str) -> bool:
+    # 한 글자 한글/한자는 문서 쪽에 2-gram 으로만 있으므로 접두어로 찾음
+    return len(token) == 1 and _is_cjk(token)
+
+
+# ----------------------------
+# 색인 갱신
+# ----------------------------
+def term_vector(
+    tokens: Iterable[str], tag_tokens: Iterable[str] = ()
+) -> Dict[str, float]:
+    """토큰 → {토큰: 가중치} (1+log(tf), 태그는 TAG_WEIGHT 배, L2 정규화)"""
+    tf = Counter(tokens)
+    weights = {t: 1.0 + math.log(n) for t, n in tf.items()}
+    for t, n in Counter(tag_tokens).items():
+        weights[t] = weights.get(t, 0.0) + TAG_WEIGHT * (1.0 + math.log(n))
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {t: round(w / norm, 5) for t, w in weights.items()}
+
+
+def _document(insight: Insight) -> Tuple[str, Dict[str, float]]:
+    parts = [insight.title, insight.summary, insight.description]
+    parts.extend(item.description for item in insight.analysis_items.all())
+    try:
+        parts.append(insight.recommendation.item_description)
+    except InsightRecommendation.DoesNotExist:
+        pass
+    tokens = [t for part in parts for t in tokenize(part)]
+    tag_tokens = [t for tag in insight.tags.all() for t in tokenize(tag.text)]
+    return " ".join(tokens), term_vector(tokens, tag_tokens)
+
+
+def index_many(insight_ids: Iterable[str]) -> int:
+    """
+    주어진 인사이트들의 검색 문서를 다시 만들어 upsert (없어진 인사이트는 문서 삭제)
+    반환: 색인한 문서 수
+    """
+    ids = list(dict.fromkeys(insight_ids))
+    if not ids:
+        return 0
+    insights = list(
+        Insight.objects.filter(id__in=ids)
+        .select_related("recommendation")
+        .prefetch_related("analysis_items", "tags")
+    )
+    docs = []
+    for i in insights:
+        body, terms = _document(i)
+        docs.append(InsightSearchDocument(insight_id=i.id, body=body, terms=terms))
+    if docs:
+        InsightSearchDocument.objects.bulk_create(
+            docs,
+            update_conflicts=True,
+            unique_fields=["insight"],
+            update_fields=["body", "terms", "updated_at"],
+        )
+    missing = set(ids) - {i.id for i in insights}
+    if missing:
+        InsightSearchDocument.objects.filter(insight_id__in=missing).delete()
+    search_indexed.send(sender=InsightSearchDocument, insight_ids=ids)
+    return len(docs)
+
+
+# ----------------------------
+# 검색
+# ----------------------------
+def _search_postgresql(tokens, offset, limit):
+    tsquery = " & ".join(f"{t}:*" if _is_prefix(t) else t for t in tokens)
+    table = InsightSearchDocument._meta.db_table
+    joined = f"{table} d JOIN {Insight._meta.db_table} i ON i.id = d.insight_id"
+    where = (
+        "to_tsvector('simple', d.body) @@ to_tsquery('simple', %s)"
+        " AND i.store_external_id = ''"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {joined} WHERE {where}", [tsquery])
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT d.insight_id, "
+            f"ts_rank(to_tsvector('simple', d.body), to_tsquery('simple', %s)) AS score "
+            f"FROM {joined} "
+            f"WHERE {where} ORDER BY score DESC, i.created_at DESC, i.id DESC "
+            f"LIMIT %s OFFSET %s",
+            [tsquery, tsquery, limit, offset],
+        )
+        return cursor.fetchall(), total
+
+
+def _search_sqlite(tokens, offset, limit):
+    match = " ".join(f'"{t}"*' if _is_prefix(t) else f'"{t}"' for t in tokens)
+    table = InsightSearchDocument._meta.db_table
+    joined = (
+        f"{FTS_TABLE} JOIN {table} d ON d.id = {FTS_TABLE}.rowid "
+        f"JOIN {Insight._meta.db_table} i ON i.id = d.insight_id"
+    )
+    where = f"{FTS_TABLE} MATCH %s AND i.store_external_id = ''"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {joined} WHERE {where}", [match])
+        total = cursor.fetchone()[0]
+        # bm25 는 낮을수록 관련도가 높음 → 부호를 바꿔 점수로 사용
+        cursor.execute(
+            f"SELECT d.insight_id, -bm25({FTS_TABLE}) AS score "
+            f"FROM {joined} WHERE {where} "
+            f"ORDER BY score DESC, i.created_at DESC, i.id DESC LIMIT %s OFFSET %s",
+            [match, limit, offset],
+        )
+        return cursor.fetchall(), total
+
+
+def _search_fallback(tokens, offset, limit):
+    qs = InsightSearchDocument.objects.filter(insight__store_external_id="")
+    for t in tokens:
+        qs = qs.filter(body__contains=t)
+    scored = [
+        (insight_id, float(sum(body.count(t) for t in tokens)))
+        for insight_id, body in qs.values_list("insight_id", "body")
+    ]
+    scored.sort(key=lambda r: -r[1])
+    return scored[offset : offset + limit], len(scored)
+
+
+def search(q: Optional[str], offset: int = 0, limit: int = 20):
+    """
+    ([(Insight, score), ...], total) 반환 — 관련도 순
+    """
+    tokens = query_tokens(q)
+    if not tokens:
+        return [], 0
+
+    if connection.vendor == "postgresql":
+        rows, total = _search_postgresql(tokens, offset, limit)
+    elif connection.vendor == "sqlite":
+        rows, total = _search_sqlite(tokens, offset, limit)
+    else:
+        rows, total = _search_fallback(tokens, offset, limit)
+
+    by_id = Insight.objects.in_bulk([insight_id for insight_id, _ in rows])
+    hits: List[Tuple[Insight, float]] = [
+        (by_id[insight_id], float(score))
+        for insight_id, score in rows
+        if insight_id in by_id
+    ]
+    return hits, total
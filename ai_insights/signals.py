@@ -0,0 +1,230 @@
+# ai_insights/signals.py
+# -----------------------------------------------------------------------------
+# 저장 시점 아이콘 계산 (ai_insights.icons)
+# - Insight 저장 / 태그 연결 변경 / 태그 텍스트·타입 변경 시 재계산
+# - 값이 달라졌을 때만 QuerySet.update() 로 기록 (시그널 재귀 없음)
+#
+# 상세 응답 캐시 무효화 (ai_insights.detail_cache)
+# - 인사이트 / 분석 항목 / 추천 / 태그 연결·내용이 바뀌면 커밋 후 해당 인사이트 캐시 삭제
+#   (커밋 전에 지우면 동시 요청이 바뀌기 전 행으로 다시 채워 TTL 동안 남으므로 on_commit,
+#    대상 id 는 연결 행이 사라지기 전인 시그널 시점에 미리 구함)
+#
+# 검색 색인 갱신 (ai_insights.search)
+# - 인사이트 / 분석 항목 / 추천 / 태그 연결이 바뀌면 커밋 후 해당 인사이트 문서를 다시 만듦
+#   (인사이트 삭제 중 자식 삭제 시그널이 와도 커밋 후에는 인사이트가 없으므로 건너뜀)
+#
+# 유사 인사이트 묶기 (ai_insights.dedup)
+# - 인사이트 / 추천이 바뀌면 커밋 후 MinHash 서명·LSH 버킷을 다시 만들고
+#   더 먼저 생긴 거의 같은 인사이트가 있으면 duplicate_of 로 표시
+# -----------------------------------------------------------------------------
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from . import dedup, detail_cache, icons, search
+from .models import Insight, InsightAnalysisItem, InsightRecommendation, InsightTag
+
+
+def refresh_icon(insight: Insight) -> None:
+    """insight 의 아이콘을 다시 계산해서 저장 (변경 시에만 UPDATE)"""
+    field = icons.icon_field(insight.is_new)
+    icon = icons.compute_icon(insight.title, insight.tags.all(), insight.is_new)
+    if getattr(insight, field) != icon:
+        Insight.objects.filter(pk=insight.pk).update(**{field: icon})
+        setattr(insight, field, icon)
+
+
+def _insight_post_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # 아이콘 필드만 저장한 경우(compute_insight_icons 등)는 다시 계산하지 않음
+    if update_fields and set(update_fields) <= {"icon", "reason_icon"}:
+        return
+    refresh_icon(instance)
+
+
+def _insight_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        refresh_icon(instance)
+        return
+    # tag.insights.add(...) 처럼 반대 방향에서 바뀐 경우
+    if pk_set:
+        for insight in Insight.objects.filter(pk__in=pk_set).prefetch_related("tags"):
+            refresh_icon(insight)
+
+
+def _tag_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    for insight in instance.insights.prefetch_related("tags"):
+        refresh_icon(insight)
+
+
+def connect_icon_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    post_save.connect(
+        _insight_post_save,
+        sender=Insight,
+        dispatch_uid="ai_insights_icon_insight_saved",
+        weak=False,
+    )
+    m2m_changed.connect(
+        _insight_tags_changed,
+        sender=Insight.tags.through,
+        dispatch_uid="ai_insights_icon_tags_changed",
+        weak=False,
+    )
+    post_save.connect(
+        _tag_post_save,
+        sender=InsightTag,
+        dispatch_uid="ai_insights_icon_tag_saved",
+        weak=False,
+    )
+
+
+# ----------------------------
+# 상세 응답 캐시 무효화
+# ----------------------------
+def _schedule_invalidate(insight_ids) -> None:
+    ids = list(insight_ids)
+    if ids:
+        transaction.on_commit(lambda: detail_cache.invalidate(ids))
+
+
+def _invalidate_insight(sender, instance, **kwargs):
+    _schedule_invalidate([instance.pk])
+
+
+def _invalidate_parent(sender, instance, **kwargs):
+    # 분석 항목 / 추천: 부모 인사이트 캐시 삭제
+    _schedule_invalidate([instance.insight_id])
+
+
+def _invalidate_tag_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return
+    if not reverse:
+        _schedule_invalidate([instance.pk])
+    elif pk_set:
+        _schedule_invalidate(pk_set)
+    elif action == "pre_clear":
+        # tag.insights.clear(): pk_set 이 없으므로 지우기 전에 연결된 인사이트를 조회
+        _schedule_invalidate(instance.insights.values_list("pk", flat=True))
+
+
+def _invalidate_tag(sender, instance, created=False, **kwargs):
+    # 태그 텍스트/타입 변경·삭제 → 연결된 인사이트 전부
+    # (삭제는 연결 행이 사라지기 전인 pre_delete 에서 처리)
+    if created:
+        return
+    _schedule_invalidate(instance.insights.values_list("pk", flat=True))
+
+
+def connect_detail_cache_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    pairs = [
+        (post_save, _invalidate_insight, Insight),
+        (post_delete, _invalidate_insight, Insight),
+        (post_save, _invalidate_parent, InsightAnalysisItem),
+        (post_delete, _invalidate_parent, InsightAnalysisItem),
+        (post_save, _invalidate_parent, InsightRecommendation),
+        (post_delete, _invalidate_parent, InsightRecommendation),
+        (m2m_changed, _invalidate_tag_links, Insight.tags.through),
+        (post_save, _invalidate_tag, InsightTag),
+        (pre_delete, _invalidate_tag, InsightTag),
+    ]
+    for signal, handler, sender in pairs:
+        uid = f"ai_insights_detail_cache_{handler.__name__}_{sender.__name__}"
+        signal.connect(handler, sender=sender, dispatch_uid=uid, weak=False)
+
+
+# ----------------------------
+# 검색 색인 갱신
+# ----------------------------
+def _schedule_index(insight_id) -> None:
+    transaction.on_commit(lambda: search.index_many([insight_id]))
+
+
+def _index_insight(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # 아이콘 필드만 저장한 경우는 본문이 그대로
+    if update_fields and set(update_fields) <= {"icon", "reason_icon"}:
+        return
+    _schedule_index(instance.pk)
+
+
+def _index_parent(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _schedule_index(instance.insight_id)
+
+
+def _index_tag_links(sender, instance, action, reverse, pk_set, **kwargs):
+    # 태그는 용어 벡터(terms)에 들어가므로 연결이 바뀌면 다시 색인
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        _schedule_index(instance.pk)
+        return
+    ids = list(pk_set or instance.insights.values_list("pk", flat=True))
+    if ids:
+        transaction.on_commit(lambda: search.index_many(ids))
+
+
+def _index_tag(sender, instance, created=False, raw=False, **kwargs):
+    # 태그 텍스트 변경 → 연결된 인사이트 용어 벡터 갱신
+    if raw or created:
+        return
+    ids = list(instance.insights.values_list("pk", flat=True))
+    if ids:
+        transaction.on_commit(lambda: search.index_many(ids))
+
+
+def connect_search_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    pairs = [
+        (post_save, _index_insight, Insight),
+        (m2m_changed, _index_tag_links, Insight.tags.through),
+        (post_save, _index_tag, InsightTag),
+        (post_save, _index_parent, InsightAnalysisItem),
+        (post_delete, _index_parent, InsightAnalysisItem),
+        (post_save, _index_parent, InsightRecommendation),
+        (post_delete, _index_parent, InsightRecommendation),
+    ]
+    for signal, handler, sender in pairs:
+        uid = f"ai_insights_search_{handler.__name__}_{sender.__name__}"
+        signal.connect(handler, sender=sender, dispatch_uid=uid, weak=False)
+
+
+# ----------------------------
+# 유사 인사이트 묶기
+# ----------------------------
+def _schedule_dedup(insight_id) -> None:
+    transaction.on_commit(lambda: dedup.refresh([insight_id]))
+
+
+def _dedup_insight(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # 아이콘/대표 지정만 저장한 경우는 문구가 그대로
+    if update_fields and set(update_fields) <= {"icon", "reason_icon", "duplicate_of"}:
+        return
+    _schedule_dedup(instance.pk)
+
+
+def _dedup_parent(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _schedule_dedup(instance.insight_id)
+
+
+def connect_dedup_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    pairs = [
+        (post_save, _dedup_insight, Insight),
+        (post_save, _dedup_parent, InsightRecommendation),
+        (post_delete, _dedup_parent, InsightRecommendation),
+    ]
+    for signal, handler, sender in pairs:
+        uid = f"ai_insights_dedup_{handler.__name__}_{sender.__name__}"
+        signal.connect(handler, sender=sender, dispatch_uid=uid, weak=False)
@@ -1,73 +1,90 @@
 # ai_insights/views.py
-from rest_framework import generics
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.response import Response
-from rest_framework.views import APIView
+# -----------------------------------------------------------------------------
+# 레거시 경로 (/api/insights) — DRF 없이 ninja(ai_insights.api) 빌더를 재사용하는 얇은 어댑터
+# - 목록: _new_strategy_payload / _recommended_payload (태그 prefetch, 저장된 아이콘)
+# - 상세: detail_payload (상세 응답 캐시 공용)
+# - 응답 모양은 예전 DRF 시리얼라이저와 동일하게 유지
+#   (created_at 은 DRF 처럼 TIME_ZONE 기준 ISO 8601, UTC 면 'Z')
+# - settings.LEGACY_API_ENABLED=False 면 urls.py 에서 연결하지 않음
+# -----------------------------------------------------------------------------
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.views import View
 
+from .api import _new_strategy_payload, _recommended_payload, detail_payload
 from .models import Insight
-from .serializers import InsightDetailSerializer  # 하위호환 (v=1)
-from .serializers import InsightV2DetailSerializer  # 신규 상세 (디폴트)
-from .serializers import (
-    NewStrategySerializer,
-    RecommendedStrategySerializer,
-)
 
 
-class CustomPagination(PageNumberPagination):
-    page_size_query_param = "limit"
+def _legacy_datetime(value) -> str:
+    """DRF DateTimeField 출력과 같은 포맷"""
+    text = timezone.localtime(value).isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+def _json(data, status=200) -> JsonResponse:
+    return JsonResponse(
+        data, status=status, safe=False, json_dumps_params={"ensure_ascii": False}
+    )
 
-    def get_paginated_response(self, data):
-        return Response(
-            {
-                "data": data,
-                "meta": {
-                    "page": self.page.number,
-                    "limit": self.page.paginator.per_page,
-                    "total": self.page.paginator.count,
-                },
-            }
-        )
 
+def _new_strategies(rows):
+    out = []
+    for insight, item in zip(rows, _new_strategy_payload(rows)):
+        data = item.dict()
+        data["created_at"] = _legacy_datetime(insight.created_at)
+        out.append(data)
+    return out
 
-class InsightListView(APIView):
+
+def _recommended_strategies(rows):
+    return [item.dict() for item in _recommended_payload(rows)]
+
+
+class InsightListView(View):
     """
     GET /api/insights
     - 기본: 신규(new) + 기존(recommended)
     - kind=new         → 신규만
     - kind=recommended → 기존만
+    - 거의 같은 인사이트(duplicate_of 지정)는 대표만 노출
+    - 매장별 규칙 엔진 인사이트는 제외 (Insight.objects.shared)
     """
 
     def get(self, request):
         kind = (request.GET.get("kind") or "").lower()
+        qs = (
+            Insight.objects.shared()
+            .filter(duplicate_of__isnull=True)
+            .prefetch_related("tags")
+            .order_by("-created_at")
+        )
 
         if kind == "new":
-            qs_new = Insight.objects.filter(is_new=True).order_by("-created_at")
-            return Response(
-                {"new_strategies": NewStrategySerializer(qs_new, many=True).data}
-            )
+            return _json({"new_strategies": _new_strategies(qs.filter(is_new=True))})
 
         if kind == "recommended":
-            qs_rec = Insight.objects.filter(is_new=False).order_by("-created_at")
-            return Response(
+            return _json(
                 {
-                    "recommended_strategies": RecommendedStrategySerializer(
-                        qs_rec, many=True
-                    ).data
+                    "recommended_strategies": _recommended_strategies(
+                        qs.filter(is_new=False)
+                    )
                 }
             )
 
-        qs_new = Insight.objects.filter(is_new=True).order_by("-created_at")
-        qs_rec = Insight.objects.filter(is_new=False).order_by("-created_at")
-        data = {
-            "new_strategies": NewStrategySerializer(qs_new, many=True).data,
-            "recommended_strategies": RecommendedStrategySerializer(
-                qs_rec, many=True
-            ).data,
-        }
-        return Response(data)
+        rows = list(qs)
+        return _json(
+            {
+                "new_strategies": _new_strategies([i for i in rows if i.is_new]),
+                "recommended_strategies": _recommended_strategies(
+                    [i for i in rows if not i.is_new]
+                ),
+            }
+        )
 
 
-class InsightDetailAPIView(generics.RetrieveAPIView):
+class InsightDetailAPIView(View):
     """
     GET /api/insights/<id>
     - 기본: v2 상세 포맷(요청 예시의 2번)
@@ -75,11 +92,40 @@ class InsightDetailAPIView(generics.RetrieveAPIView):
       예) /api/insights/insight_001?v=1
     """
 
-    queryset = Insight.objects.all()
-    lookup_field = "id"
+    def get(self, request, id):
+        try:
+            if (request.GET.get("v") or "").strip() == "1":
+                return _json(self._v1_payload(id))
+            return _json(detail_payload(id))
+        except Http404 as exc:
+            return _json({"detail": str(exc)}, status=404)
 
-    def get_serializer_class(self):
-        v = (self.request.GET.get("v") or "").strip()
-        if v == "1":
-            return InsightDetailSerializer
-        return InsightV2DetailSerializer
+    def _v1_payload(self, insight_id: str) -> dict:
+        """(하위 호환: 예전 1번 포맷)"""
+        row = (
+            Insight.objects.shared()
+            .filter(id=insight_id)
+            .values(
+                "id",
+                "title",
+                "reason_icon",
+                "reason_text",
+                "description",
+                "created_at",
+                "is_new",
+            )
+            .first()
+        )
+        if row is None:
+            raise Http404("No Insight matches the given query.")
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "reason_summary": {
+                "icon": row["reason_icon"] or "",
+                "text": row["reason_text"] or "",
+            },
+            "description": row["description"],
+            "created_at": _legacy_datetime(row["created_at"]),
+            "is_new": row["is_new"],
+        }
@@ -4,6 +4,8 @@ from typing import Optional
 from django.shortcuts import get_object_or_404
 from ninja import Router
 
+from home import counters
+
 from .models import Campaign
 from .schemas import (
     CampaignDetailOut,
@@ -25,10 +27,17 @@ def list_campaigns(
     request, status: Optional[str] = None, page: int = 1, limit: int = 10
 ):
     qs = Campaign.objects.all()
+    total_key = counters.CAMPAIGNS_TOTAL
     if status and status.lower() != "all":
         qs = qs.filter(status__iexact=status)
-
-    total = qs.count()
+        # 카운터는 정의된 상태값만 (임의 문자열은 카운터 행을 만들지 않고 직접 count)
+        if status.lower() in Campaign.CampaignStatus.values:
+            total_key = counters.campaign_status_key(status)
+        else:
+            total_key = None
+
+    # 전체 개수는 카운터 캐시에서 O(1) 조회
+    total = counters.get_count(total_key) if total_key else qs.count()
     offset = max(page, 1) - 1
     offset *= limit
 
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0002_seed_campaigns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="campaign",
+            name="store_external_id",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                max_length=100,
+                verbose_name="매장 ID",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0003_campaign_store_external_id"),
+        ("integrations", "0018_ad_sync_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="campaign",
+            name="external_id",
+            field=models.CharField(
+                blank=True, default="", max_length=100, verbose_name="플랫폼 캠페인 ID"
+            ),
+        ),
+        migrations.AddField(
+            model_name="campaign",
+            name="integration",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="campaigns",
+                to="integrations.integration",
+                verbose_name="연동",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="campaign",
+            constraint=models.UniqueConstraint(
+                fields=("integration", "external_id"),
+                name="uniq_campaign_integration_external",
+            ),
+        ),
+    ]
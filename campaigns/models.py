@@ -16,6 +16,23 @@ class Campaign(models.Model):
         default=CampaignStatus.ACTIVE,
     )
     channel = models.CharField("채널", max_length=50, blank=True)
+    # 매장 식별자 (PosConnection.store_external_id 와 같은 값)
+    # 인사이트 규칙 엔진이 매장별로 성과를 묶을 때 사용
+    store_external_id = models.CharField(
+        "매장 ID", max_length=100, blank=True, default="", db_index=True
+    )
+    # 광고 플랫폼 동기화(sync_ad_insights)로 들어온 캠페인: 연동 + 플랫폼 캠페인 ID
+    integration = models.ForeignKey(
+        "integrations.Integration",
+        verbose_name="연동",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="campaigns",
+    )
+    external_id = models.CharField(
+        "플랫폼 캠페인 ID", max_length=100, blank=True, default=""
+    )
 
     # 성과 지표
     spend = models.PositiveIntegerField("총 소진액", default=0)
@@ -39,5 +56,13 @@ class Campaign(models.Model):
     created_at = models.DateTimeField("생성일", auto_now_add=True)
     updated_at = models.DateTimeField("수정일", auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["integration", "external_id"],
+                name="uniq_campaign_integration_external",
+            ),
+        ]
+
     def __str__(self):
         return self.name
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import TrendKeyword
+from .models import DashboardCounter, Region, TrendKeyword
 
 
 @admin.register(TrendKeyword)
@@ -9,3 +9,17 @@ class TrendKeywordAdmin(admin.ModelAdmin):
     list_filter = ("region",)
     search_fields = ("region", "keyword")
     ordering = ("-created_at",)
+
+
+@admin.register(Region)
+class RegionAdmin(admin.ModelAdmin):
+    list_display = ("code", "sido", "sigungu", "dong", "is_active", "updated_at")
+    list_filter = ("is_active", "sido")
+    search_fields = ("code", "sigungu", "dong")
+
+
+@admin.register(DashboardCounter)
+class DashboardCounterAdmin(admin.ModelAdmin):
+    list_display = ("key", "value", "updated_at")
+    search_fields = ("key",)
+    readonly_fields = ("updated_at",)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class HomeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "home"
+
+    def ready(self):
+        # 대시보드 카운터 캐시 + 지역별 인사이트 랭킹 유지용 시그널 연결
+        from .signals import connect_counter_signals, connect_ranking_signals
+
+        connect_counter_signals()
+        connect_ranking_signals()
@@ -0,0 +1,133 @@
+# home/counters.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 대시보드/목록 API 의 count() (PostgreSQL 에서는 풀스캔)를 카운터 테이블 조회로 대체
+#
+# 구성:
+# - DashboardCounter(key, value) 1행 = 카운터 1개
+# - home.signals 가 저장/삭제 시 F() 증감으로 유지
+# - 행은 마이그레이션(0009_seed_dashboard_counters)으로 미리 만들어 둠
+#   (조회 시 행이 없으면 실제 count() 로 답하되 행은 만들지 않음 → 증감과 경합 없음)
+# - QuerySet.update()/bulk_create 처럼 시그널을 타지 않는 경로로 바뀐 경우
+#   recount_dashboard_counters 명령으로 재계산
+#
+# 인사이트 카운터는 목록에 보이는 인사이트만 셈 (insights.total, insights.is_new.true/false)
+# - 공용(store_external_id 없음) + 대표(duplicate_of 없음)
+# - 규칙 엔진의 매장별 인사이트, 중복으로 묶인 인사이트는 세지 않음
+# -----------------------------------------------------------------------------
+from typing import Dict, Iterable
+
+from django.db.models import F
+
+from .models import DashboardCounter
+
+INSIGHTS_TOTAL = "insights.total"
+INSIGHTS_IS_NEW_PREFIX = "insights.is_new."
+NOTICES_TOTAL = "notices.total"
+CAMPAIGNS_TOTAL = "campaigns.total"
+CAMPAIGN_STATUS_PREFIX = "campaigns.status."
+
+
+def insights_is_new_key(is_new: bool) -> str:
+    return f"{INSIGHTS_IS_NEW_PREFIX}{'true' if is_new else 'false'}"
+
+
+def insight_keys() -> list[str]:
+    return [INSIGHTS_TOTAL, insights_is_new_key(True), insights_is_new_key(False)]
+
+
+def insight_counted(store_external_id: str, duplicate_of_id) -> bool:
+    """목록에 보이는(카운터에 들어가는) 인사이트인지"""
+    return not store_external_id and duplicate_of_id is None
+
+
+def campaign_status_key(status: str) -> str:
+    return f"{CAMPAIGN_STATUS_PREFIX}{(status or '').lower()}"
+
+
+# ----------------------------
+# 실제 count() (초기화/재계산 전용)
+# ----------------------------
+def _recount(key: str) -> int:
+    from ai_insights.models import Insight
+    from campaigns.models import Campaign
+    from users.models import Notice
+
+    insights = Insight.objects.shared().filter(duplicate_of__isnull=True)
+    if key == INSIGHTS_TOTAL:
+        return insights.count()
+    if key.startswith(INSIGHTS_IS_NEW_PREFIX):
+        is_new = key[len(INSIGHTS_IS_NEW_PREFIX) :] == "true"
+        return insights.filter(is_new=is_new).count()
+    if key == NOTICES_TOTAL:
+        return Notice.objects.count()
+    if key == CAMPAIGNS_TOTAL:
+        return Campaign.objects.count()
+    if key.startswith(CAMPAIGN_STATUS_PREFIX):
+        status = key[len(CAMPAIGN_STATUS_PREFIX) :]
+        return Campaign.objects.filter(status__iexact=status).count()
+    raise KeyError(f"Unknown counter key: {key}")
+
+
+def all_keys() -> list[str]:
+    """재계산 대상 전체 key (캠페인 상태는 choices + 실제 존재하는 값)"""
+    from campaigns.models import Campaign
+
+    statuses = {s.lower() for s in Campaign.CampaignStatus.values}
+    statuses |= {
+        (s or "").lower()
+        for s in Campaign.objects.values_list("status", flat=True).distinct()
+    }
+    return [
+        *insight_keys(),
+        NOTICES_TOTAL,
+        CAMPAIGNS_TOTAL,
+        *sorted(campaign_status_key(s) for s in statuses),
+    ]
+
+
+# ----------------------------
+# 조회
+# ----------------------------
+def get_counts(keys: Iterable[str]) -> Dict[str, int]:
+    """여러 카운터를 1쿼리로 조회 (행이 없는 key 는 실제 count, 저장하지 않음)"""
+    keys = list(dict.fromkeys(keys))
+    out = dict(
+        DashboardCounter.objects.filter(key__in=keys).values_list("key", "value")
+    )
+    for key in keys:
+        if key not in out:
+            out[key] = _recount(key)
+    return out
+
+
+def get_count(key: str) -> int:
+    return get_counts([key])[key]
+
+
+# ----------------------------
+# 증감 (시그널에서 호출)
+# ----------------------------
+def incr(key: str, delta: int = 1) -> None:
+    """
+    행이 있을 때만 원자적으로 증감합니다.
+    (행이 없는 key 는 조회 때 실제 count 로 답하므로 여기서는 건너뜀)
+    """
+    if delta:
+        DashboardCounter.objects.filter(key=key).update(value=F("value") + delta)
+
+
+def incr_insight(is_new: bool, delta: int = 1) -> None:
+    """목록에 보이는 인사이트 증감 (전체 + is_new 별)"""
+    incr(INSIGHTS_TOTAL, delta)
+    incr(insights_is_new_key(is_new), delta)
+
+
+def recount(keys: Iterable[str] | None = None) -> Dict[str, int]:
+    """실제 count() 로 카운터를 다시 맞춥니다."""
+    out: Dict[str, int] = {}
+    for key in keys if keys is not None else all_keys():
+        value = _recount(key)
+        DashboardCounter.objects.update_or_create(key=key, defaults={"value": value})
+        out[key] = value
+    return out
@@ -0,0 +1,162 @@
+# home/management/commands/ingest_public_trends.py
+# ------------------------------------------------------------
+# 목적:
+# - 공공데이터(법정동 코드 + sdsc2 상가업소)로 Region / TrendKeyword 를 채웁니다.
+#
+# 흐름:
+# 1) (--refresh-regions) 법정동 코드 API → Region 업서트
+# 2) Region 의 동 코드별 업종 건수 조회 (풀링/재시도/동시성/TTL 캐시)
+# 3) 시군구 단위로 업종(소분류) 건수 합산 → 상위 N개를 TrendKeyword 로 저장
+#
+# 특징:
+# - 이미 있는 (region, keyword) 는 건너뜀 → 여러 번 실행해도 안전(idempotent)
+# - 캐시 TTL 안의 동 코드는 API 를 다시 호출하지 않음 (--no-cache 로 무시)
+#
+# 사용 예:
+#   poetry run python manage.py ingest_public_trends --refresh-regions
+#   poetry run python manage.py ingest_public_trends --sigungu 강남구 --top 5
+# ------------------------------------------------------------
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from home import ranking
+from home.models import Region, TrendKeyword
+from home.public_api import PublicDataClient
+
+
+def _region_from_lawd_row(row: dict) -> Region | None:
+    """
+    법정동 코드 행 → Region (동 단위 + 현존 코드만)
+    """
+    code = str(row.get("법정동코드") or "").strip()
+    dong = (row.get("읍면동명") or "").strip()
+    if not code or not dong or (row.get("리명") or "").strip():
+        return None
+    if (row.get("삭제일자") or "").strip():
+        return None
+    return Region(
+        code=code,
+        sido=(row.get("시도명") or "").strip(),
+        sigungu=(row.get("시군구명") or "").strip(),
+        dong=dong,
+        is_active=True,
+    )
+
+
+class Command(BaseCommand):
+    help = "Ingest Region / TrendKeyword from public commercial-district APIs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--refresh-regions",
+            action="store_true",
+            help="법정동 코드 API 로 Region 테이블을 먼저 갱신합니다.",
+        )
+        parser.add_argument(
+            "--sigungu",
+            action="append",
+            default=[],
+            help="특정 시군구만 처리 (여러 번 지정 가능).",
+        )
+        parser.add_argument(
+            "--top", type=int, default=5, help="시군구별 저장할 키워드 수."
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None, help="동시 요청 수(기본: 설정값)."
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="응답 캐시를 무시하고 모두 다시 조회합니다.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="TrendKeyword 를 저장하지 않고 결과만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        started = time.monotonic()
+        client = PublicDataClient(max_workers=opts["workers"])
+
+        # 1) Region 갱신
+        if opts["refresh_regions"]:
+            regions = [
+                r
+                for r in map(_region_from_lawd_row, client.iter_lawd_codes())
+                if r is not None
+            ]
+            Region.objects.bulk_create(
+                regions,
+                update_conflicts=True,
+                unique_fields=["code"],
+                update_fields=["sido", "sigungu", "dong", "is_active"],
+                batch_size=1000,
+            )
+            self.stdout.write(f"Region 업서트: {len(regions)}")
+
+        # 2) 동 코드별 업종 건수 조회
+        region_qs = Region.objects.filter(is_active=True)
+        if opts["sigungu"]:
+            region_qs = region_qs.filter(sigungu__in=opts["sigungu"])
+        code_to_sigungu = dict(region_qs.values_list("code", "sigungu"))
+        if not code_to_sigungu:
+            self.stdout.write(self.style.WARNING("처리할 Region 이 없습니다."))
+            return
+
+        results, errors = client.fetch_category_counts_many(
+            code_to_sigungu.keys(), use_cache=not opts["no_cache"]
+        )
+        for code, err in errors.items():
+            self.stderr.write(f"FAIL {code}: {err}")
+
+        # 3) 시군구 단위 업종 건수 합산
+        counters: dict[str, Counter] = defaultdict(Counter)
+        for code, counts in results.items():
+            counters[code_to_sigungu[code]].update(counts)
+
+        top_n = max(1, opts["top"])
+        # 동률이면 이름순 → 실행 순서와 무관하게 같은 결과
+        wanted = {
+            sigungu: sorted(counter, key=lambda kw: (-counter[kw], kw))[:top_n]
+            for sigungu, counter in counters.items()
+            if sigungu
+        }
+
+        # 4) TrendKeyword 저장 (기존 (region, keyword) 는 건너뜀)
+        existing = set(
+            TrendKeyword.objects.filter(region__in=wanted.keys()).values_list(
+                "region", "keyword"
+            )
+        )
+        to_create = [
+            TrendKeyword(region=region, keyword=kw)
+            for region, keywords in wanted.items()
+            for kw in keywords
+            if (region, kw) not in existing
+        ]
+
+        if opts["dry_run"]:
+            for region, keywords in sorted(wanted.items()):
+                self.stdout.write(f"[{region}] {', '.join(keywords)}")
+        elif to_create:
+            with transaction.atomic():
+                TrendKeyword.objects.bulk_create(to_create, batch_size=1000)
+            # bulk_create 는 시그널을 타지 않으므로 지역 벡터 캐시를 비우고
+            # 키워드가 바뀐 지역 랭킹을 바로 재계산
+            ranking.invalidate_vectors()
+            ranking.refresh_regions({kw.region for kw in to_create})
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS("=== ingest_public_trends 결과 ==="))
+        self.stdout.write(f"동 코드: {len(code_to_sigungu)} (실패 {len(errors)})")
+        self.stdout.write(f"시군구: {len(wanted)}")
+        self.stdout.write(
+            f"TrendKeyword 생성: {len(to_create)}"
+            f"{' (dry-run: 0)' if opts['dry_run'] else ''}"
+        )
+        self.stdout.write(f"소요: {elapsed:.1f}s")
+        self.stdout.write(self.style.SUCCESS("완료."))
@@ -10,6 +10,8 @@
 # - --dry-run 옵션으로 변경/삭제 내역을 미리 확인 가능
 # - --casefold 옵션으로 대소문자/공백 차이를 관용 처리
 # - 여러 번 실행해도 안전(idempotent)
+# - 테이블을 한 번만 읽어 메모리에서 이동/병합 대상을 계산하고,
+#   삭제는 청크별 DELETE ... WHERE id IN, 이동은 지역별 UPDATE ... WHERE id IN
 #
 # 사용 예:
 #   poetry run python manage.py normalize_trend_keywords
@@ -17,10 +19,12 @@
 #   poetry run python manage.py normalize_trend_keywords --casefold
 #   poetry run python manage.py normalize_trend_keywords --dry-run --casefold
 # ------------------------------------------------------------
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from django.db.utils import IntegrityError
 
+from home import ranking
 from home.models import TrendKeyword
 
 # ✅ 지역명 매핑 테이블(필요 시 자유롭게 확장)
@@ -82,11 +86,18 @@ class Command(BaseCommand):
             action="store_true",
             help="개별 레코드 변경/삭제 로그를 자세히 출력합니다.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="DELETE/UPDATE 한 번에 묶을 id 개수.",
+        )
 
     def handle(self, *args, **options):
         dry_run: bool = options["dry_run"]
         casefold: bool = options["casefold"]
         verbose_rows: bool = options["verbose_rows"]
+        chunk_size: int = max(1, options["chunk_size"])
 
         # 통계 카운터
         scanned = 0
@@ -95,97 +106,74 @@ class Command(BaseCommand):
         merged_deleted = 0
         skipped = 0
 
-        # 빠른 조회용 전체 레코드
-        qs = TrendKeyword.objects.all().only("id", "region", "keyword")
-        scanned = qs.count()
-
-        # alias/canonical 비교를 빠르게 하기 위한 보조 맵
-        #   key = (norm(region), norm(keyword))  → id set
-        #   canonical 존재 여부 확인에 사용
-        def key(region: str, kw: str) -> tuple[str, str]:
-            return _norm(region, casefold), _norm(kw, casefold)
-
-        # 현재 DB 스냅샷 (canonical 존재 확인/중복 체크에 사용)
-        existing = {}
-        for tk in qs:
-            existing.setdefault(key(tk.region, tk.keyword), set()).add(tk.id)
-
-        # 메인 루프
-        # - REGION_MAP 의 alias 를 모두 돌며 해당 region 레코드를 canonical 로 이동
-        # - 이동하려는 (canonical, keyword) 가 이미 있으면 현재 레코드를 삭제(merge)
-        # - dry-run 이면 DB 반영 없이 로그/카운트만
+        # alias 매칭 키: casefold 면 정규화 값, 아니면 region 원문 그대로(기존 동작)
+        def match_key(region: str) -> str:
+            return _norm(region, True) if casefold else region
+
+        alias_to_canonical = {match_key(a): c for a, c in REGION_MAP.items()}
+
+        # 1) 테이블 1회 스캔
+        #   - occupied: 현재 존재하는 (norm(region), norm(keyword)) 스냅샷
+        #   - candidates: region 이 alias 인 레코드
+        occupied: set[tuple[str, str]] = set()
+        candidates: list[tuple[int, str, str, str]] = []
+        rows = (
+            TrendKeyword.objects.order_by("id")
+            .values_list("id", "region", "keyword")
+            .iterator(chunk_size=chunk_size)
+        )
+        for row_id, region, kw in rows:
+            scanned += 1
+            occupied.add((_norm(region, casefold), _norm(kw, casefold)))
+            canonical = alias_to_canonical.get(match_key(region))
+            if canonical is not None:
+                candidates.append((row_id, region, kw, canonical))
+
         if dry_run:
             self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
 
-        # 트랜잭션(실행 시에만). dry-run 은 읽기만 하므로 트랜잭션 불필요
-        ctx = transaction.atomic if not dry_run else _NullCtx
-
-        with ctx():
-            for alias, canonical in REGION_MAP.items():
-                # alias/canonical 비교를 위한 기준 키
-                alias_key = _norm(alias, casefold)
-                canonical_key = _norm(canonical, casefold)
-
-                # 대상 레코드: region == alias (casefold 옵션 적용)
-                if casefold:
-                    targets = TrendKeyword.objects.all().only("id", "region", "keyword")
-                    targets = [t for t in targets if _norm(t.region, True) == alias_key]
-                else:
-                    targets = list(
-                        TrendKeyword.objects.filter(region=alias).only(
-                            "id", "region", "keyword"
-                        )
+        # 2) 메모리에서 이동/병합 결정 (id 순서 = 먼저 온 레코드가 canonical 자리 차지)
+        delete_ids: list[int] = []
+        move_ids: dict[str, list[int]] = defaultdict(list)
+        touched_regions: set[str] = set()
+        for row_id, old_region, kw, canonical in candidates:
+            canonical_key = _norm(canonical, casefold)
+
+            # 이미 canonical 이면 스킵
+            if _norm(old_region, casefold) == canonical_key:
+                skipped += 1
+                continue
+
+            to_update += 1
+            touched_regions.update((old_region, canonical))
+            target = (canonical_key, _norm(kw, casefold))
+            if target in occupied:
+                # 이동 대상 (canonical, kw) 가 이미 존재 → 중복 병합(현재 레코드 삭제)
+                if verbose_rows:
+                    self.stdout.write(
+                        f"MERGE: [{old_region}] '{kw}' → [{canonical}] (중복 존재: 삭제)"
                     )
-
-                if not targets:
-                    continue
-
-                for row in targets:
-                    old_region = row.region
-                    kw = row.keyword
-
-                    # 이미 canonical 이면 스킵
-                    if _norm(old_region, casefold) == canonical_key:
-                        skipped += 1
-                        continue
-
-                    # 이동 대상 (canonical, kw) 가 이미 존재하면 → 중복 병합(현재 레코드 삭제)
-                    if (canonical_key, _norm(kw, casefold)) in existing:
-                        to_update += 1
-                        if verbose_rows:
-                            self.stdout.write(
-                                f"MERGE: [{old_region}] '{kw}' → [{canonical}] (중복 존재: 삭제)"
-                            )
-                        merged_deleted += 1
-                        if not dry_run:
-                            # 실제 삭제
-                            TrendKeyword.objects.filter(id=row.id).delete()
-                        continue
-
-                    # 존재하지 않으면 → region 을 canonical 로 업데이트
-                    to_update += 1
-                    if verbose_rows:
-                        self.stdout.write(
-                            f"UPDATE: [{old_region}] '{kw}' → [{canonical}]"
-                        )
-                    if not dry_run:
-                        row.region = canonical
-                        try:
-                            row.save(update_fields=["region"])
-                        except IntegrityError:
-                            # unique_together 적용된 경우 혹시 레이스/경합으로 충돌 시 안전하게 삭제로 폴백
-                            TrendKeyword.objects.filter(id=row.id).delete()
-                            merged_deleted += 1
-                        else:
-                            actually_updated += 1
-                            # 스냅샷 갱신
-                            existing.setdefault(
-                                (canonical_key, _norm(kw, casefold)), set()
-                            ).add(row.id)
-                            # 기존 키에서 제거
-                            old_key = (alias_key, _norm(kw, casefold))
-                            if old_key in existing and row.id in existing[old_key]:
-                                existing[old_key].remove(row.id)
+                merged_deleted += 1
+                delete_ids.append(row_id)
+                continue
+
+            if verbose_rows:
+                self.stdout.write(f"UPDATE: [{old_region}] '{kw}' → [{canonical}]")
+            occupied.add(target)
+            move_ids[canonical].append(row_id)
+
+        # 3) 반영: 삭제 먼저(유니크 충돌 방지) → 지역별 이동
+        if not dry_run:
+            with transaction.atomic():
+                for ids in _chunks(delete_ids, chunk_size):
+                    TrendKeyword.objects.filter(id__in=ids).delete()
+                for canonical, ids in move_ids.items():
+                    for chunk in _chunks(ids, chunk_size):
+                        actually_updated += TrendKeyword.objects.filter(
+                            id__in=chunk
+                        ).update(region=canonical)
+                # update()/delete() 로 바뀐 지역은 랭킹 재계산 대상
+                ranking.mark_dirty(touched_regions)
 
         # 요약 출력
         self.stdout.write("")
@@ -202,11 +190,6 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("완료."))
 
 
-class _NullCtx:
-    """dry-run용 더미 컨텍스트 (with _NullCtx(): pass)"""
-
-    def __enter__(self):  # noqa
-        return None
-
-    def __exit__(self, exc_type, exc, tb):  # noqa
-        return False
+def _chunks(ids: list[int], size: int):
+    for i in range(0, len(ids), size):
+        yield ids[i : i + size]
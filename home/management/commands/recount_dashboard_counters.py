@@ -0,0 +1,38 @@
+# home/management/commands/recount_dashboard_counters.py
+# ------------------------------------------------------------
+# 목적:
+# - DashboardCounter(카운터 캐시)를 실제 count() 로 다시 맞춥니다.
+# - QuerySet.update()/bulk_create/raw SQL 등 시그널을 타지 않는 변경 후 실행
+#
+# 사용 예:
+#   poetry run python manage.py recount_dashboard_counters
+#   poetry run python manage.py recount_dashboard_counters --key insights.total
+# ------------------------------------------------------------
+from django.core.management.base import BaseCommand
+
+from home import counters
+from home.models import DashboardCounter
+
+
+class Command(BaseCommand):
+    help = "Recount dashboard counter cache rows from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--key",
+            action="append",
+            default=[],
+            help="특정 key 만 재계산 (여러 번 지정 가능, 기본: 전체).",
+        )
+
+    def handle(self, *args, **opts):
+        keys = opts["key"] or None
+        before = dict(DashboardCounter.objects.values_list("key", "value"))
+        result = counters.recount(keys)
+
+        self.stdout.write(self.style.SUCCESS("=== recount_dashboard_counters 결과 ==="))
+        for key, value in result.items():
+            old = before.get(key)
+            mark = "" if old == value else f" (이전: {old})"
+            self.stdout.write(f"{key}: {value}{mark}")
+        self.stdout.write(self.style.SUCCESS("완료."))
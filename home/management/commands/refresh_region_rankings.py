@@ -0,0 +1,78 @@
+# home/management/commands/refresh_region_rankings.py
+# ------------------------------------------------------------
+# 목적:
+# - 지역별 인사이트 랭킹(RegionInsightRank)을 트렌드 키워드 기준으로 다시 계산합니다.
+# - 기본: dirty 지역(키워드 변경 / 랭킹 행 삭제) + 아직 계산하지 않은 지역만
+# - 인사이트 추가/수정은 검색 색인 시그널로 증분 반영되고, 키워드 변경 등으로 dirty 가 된
+#   지역은 요청 안에서 재계산하지 않으므로 이 명령(--loop 워커)이 모아서 재계산
+# - --loop 초 를 주면 워커처럼 주기적으로 반복 실행
+#
+# 참고:
+# - 점수는 검색 문서의 용어 벡터(terms)를 사용 → 도입 전 데이터는
+#   rebuild_search_index 를 먼저 실행
+#
+# 사용 예:
+#   poetry run python manage.py refresh_region_rankings
+#   poetry run python manage.py refresh_region_rankings --region 강남구
+#   poetry run python manage.py refresh_region_rankings --all
+#   poetry run python manage.py refresh_region_rankings --loop 30
+# ------------------------------------------------------------
+import time
+
+from django.core.management.base import BaseCommand
+
+from home import ranking
+from home.models import RegionRankState, TrendKeyword
+
+
+class Command(BaseCommand):
+    help = "Recompute per-region insight rankings from trend keywords."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--region",
+            action="append",
+            default=[],
+            help="특정 지역만 (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="dirty 여부와 관계없이 전체 지역을 다시 계산합니다.",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            help="0보다 크면 이 간격(초)으로 계속 반복 실행 (dirty 지역만)",
+        )
+
+    def handle(self, *args, **opts):
+        while True:
+            self._run_once(opts)
+            if opts["loop"] <= 0:
+                break
+            # 두 번째 실행부터는 dirty 지역만
+            opts = {**opts, "region": [], "all": False}
+            time.sleep(opts["loop"])
+
+    def _run_once(self, opts):
+        started = time.perf_counter()
+        if opts["region"]:
+            regions = opts["region"]
+        elif opts["all"]:
+            regions = set(TrendKeyword.objects.values_list("region", flat=True))
+            regions |= set(RegionRankState.objects.values_list("region", flat=True))
+        else:
+            regions = ranking.dirty_regions()
+
+        saved = ranking.refresh_regions(regions)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS("=== refresh_region_rankings 결과 ==="))
+        self.stdout.write(f"지역: {len(saved)} ({elapsed:.1f}s)")
+        if opts["verbosity"] >= 2:
+            for region, n in sorted(saved.items()):
+                self.stdout.write(f"  - {region}: {n}")
+        self.stdout.write(f"저장한 랭킹 행: {sum(saved.values())}")
+        self.stdout.write(self.style.SUCCESS("완료."))
@@ -0,0 +1,155 @@
+# home/management/commands/run_public_api_stub.py
+# ------------------------------------------------------------
+# 목적:
+# - 공공데이터 API(sdsc2 / 법정동 코드)를 흉내내는 로컬 스텁 서버
+# - ingest_public_trends 를 실제 키 없이, 대량 지역으로 빠르게 검증할 때 사용
+#
+# 응답 규칙(결정적):
+# - /lawd...                    → 법정동 코드 N개 (page/perPage)
+# - /sdsc2/storeListInDong      → 동 코드 기반으로 업종이 고정된 상가 목록
+#
+# 사용 예:
+#   poetry run python manage.py run_public_api_stub --port 8765 --regions 3500
+#   PUBLIC_API_BASE=http://127.0.0.1:8765/sdsc2 \
+#   LAWD_CODE_API_BASE=http://127.0.0.1:8765/lawd ...
+# ------------------------------------------------------------
+import json
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+_SIGUNGU = [
+    "강남구",
+    "마포구",
+    "용산구",
+    "서초구",
+    "송파구",
+    "성동구",
+    "종로구",
+    "중구",
+]
+_CATEGORIES = [
+    "커피전문점",
+    "한식 음식점",
+    "제과점",
+    "분식",
+    "일식 음식점",
+    "치킨",
+    "피자",
+    "중식 음식점",
+    "주점",
+    "샐러드",
+]
+
+
+def _lawd_rows(total: int, page: int, per_page: int) -> list[dict]:
+    start = (page - 1) * per_page
+    rows = []
+    for i in range(start, min(start + per_page, total)):
+        rows.append(
+            {
+                "법정동코드": f"11{i:08d}",
+                "시도명": "서울특별시",
+                "시군구명": _SIGUNGU[i % len(_SIGUNGU)],
+                "읍면동명": f"테스트{i}동",
+                "리명": "",
+                "삭제일자": "",
+            }
+        )
+    return rows
+
+
+def _stores(dong_code: str, count: int) -> list[dict]:
+    seed = zlib.crc32(dong_code.encode())
+    return [
+        {
+            "bizesId": f"{dong_code}-{n}",
+            "ldongCd": dong_code,
+            "indsSclsNm": _CATEGORIES[(seed + n * n) % len(_CATEGORIES)],
+        }
+        for n in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Run a local stub server for the sdsc2 / LAWD code public APIs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--regions", type=int, default=500, help="법정동 코드 개수."
+        )
+        parser.add_argument("--stores", type=int, default=30, help="동별 상가 개수.")
+        parser.add_argument(
+            "--latency-ms", type=int, default=0, help="응답마다 인위적 지연(ms)."
+        )
+
+    def handle(self, *args, **opts):
+        total = opts["regions"]
+        stores = opts["stores"]
+        latency = opts["latency_ms"] / 1000.0
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):  # noqa: N802
+                url = urlparse(self.path)
+                qs = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                if latency:
+                    time.sleep(latency)
+
+                if url.path.startswith("/lawd"):
+                    page = int(qs.get("page", 1))
+                    per_page = int(qs.get("perPage", 10))
+                    rows = _lawd_rows(total, page, per_page)
+                    body = {
+                        "page": page,
+                        "perPage": per_page,
+                        "totalCount": total,
+                        "currentCount": len(rows),
+                        "data": rows,
+                    }
+                elif url.path.endswith("/storeListInDong"):
+                    code = qs.get(settings.SDSC_PARAM_KEY_NAME, "")
+                    items = _stores(code, stores)
+                    body = {
+                        "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE"},
+                        "body": {
+                            "items": items,
+                            "totalCount": len(items),
+                            "pageNo": int(qs.get("pageNo", 1)),
+                            "numOfRows": int(qs.get("numOfRows", 10)),
+                        },
+                    }
+                else:
+                    self.send_error(404)
+                    return
+
+                payload = json.dumps(body, ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):  # 요청 로그 생략
+                pass
+
+        server = ThreadingHTTPServer((opts["host"], opts["port"]), Handler)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"public api stub on http://{opts['host']}:{opts['port']} "
+                f"(regions={total}, stores={stores})"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
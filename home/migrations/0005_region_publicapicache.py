@@ -0,0 +1,67 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0004_alter_trendkeyword_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Region",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=20, unique=True)),
+                ("sido", models.CharField(blank=True, default="", max_length=50)),
+                (
+                    "sigungu",
+                    models.CharField(
+                        blank=True, db_index=True, default="", max_length=50
+                    ),
+                ),
+                ("dong", models.CharField(blank=True, default="", max_length=50)),
+                ("is_active", models.BooleanField(default=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["code"],
+            },
+        ),
+        migrations.CreateModel(
+            name="PublicApiCache",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("endpoint", models.CharField(max_length=100)),
+                ("dong_code", models.CharField(max_length=20)),
+                ("payload", models.JSONField(blank=True, default=list)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("endpoint", "dong_code"),
+                        name="uniq_public_api_cache_key",
+                    )
+                ],
+            },
+        ),
+    ]
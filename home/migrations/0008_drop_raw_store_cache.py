@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def drop_raw_payloads(apps, schema_editor):
+    """
+    동 코드별 상가 원본 목록 캐시를 삭제합니다.
+    (이후에는 업종별 건수만 "storeListInDong:categories" 로 캐시)
+    """
+    PublicApiCache = apps.get_model("home", "PublicApiCache")
+    PublicApiCache.objects.filter(endpoint="storeListInDong").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0007_region_insight_rank"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_raw_payloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+CAMPAIGN_STATUSES = ("active", "ended")
+
+
+def seed_counters(apps, schema_editor):
+    """
+    카운터 행을 실제 count() 로 미리 만들어 둡니다.
+    (이후에는 home.signals 가 증감, 조회 시 행을 만들지 않음)
+    쓰지 않는 insights.is_new.* 카운터는 삭제합니다.
+    """
+    DashboardCounter = apps.get_model("home", "DashboardCounter")
+    Insight = apps.get_model("ai_insights", "Insight")
+    Notice = apps.get_model("users", "Notice")
+    Campaign = apps.get_model("campaigns", "Campaign")
+
+    DashboardCounter.objects.filter(key__startswith="insights.is_new.").delete()
+
+    values = {
+        "insights.total": Insight.objects.count(),
+        "notices.total": Notice.objects.count(),
+        "campaigns.total": Campaign.objects.count(),
+    }
+    statuses = set(CAMPAIGN_STATUSES)
+    statuses |= {
+        (s or "").lower()
+        for s in Campaign.objects.values_list("status", flat=True).distinct()
+    }
+    for status in statuses:
+        values[f"campaigns.status.{status}"] = Campaign.objects.filter(
+            status__iexact=status
+        ).count()
+
+    for key, value in values.items():
+        DashboardCounter.objects.update_or_create(key=key, defaults={"value": value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0008_drop_raw_store_cache"),
+        ("ai_insights", "0010_searchdocument_terms"),
+        ("campaigns", "0004_campaign_integration_external"),
+        ("users", "0015_seed_demo_users"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
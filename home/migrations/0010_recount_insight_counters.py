@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def recount_insight_counters(apps, schema_editor):
+    """
+    인사이트 카운터를 목록에 보이는 인사이트(공용 + 대표) 기준으로 다시 계산합니다.
+    insights.total 과 insights.is_new.true/false 를 함께 만듭니다.
+    """
+    DashboardCounter = apps.get_model("home", "DashboardCounter")
+    Insight = apps.get_model("ai_insights", "Insight")
+
+    visible = Insight.objects.filter(store_external_id="", duplicate_of__isnull=True)
+    values = {
+        "insights.total": visible.count(),
+        "insights.is_new.true": visible.filter(is_new=True).count(),
+        "insights.is_new.false": visible.filter(is_new=False).count(),
+    }
+    for key, value in values.items():
+        DashboardCounter.objects.update_or_create(key=key, defaults={"value": value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0009_seed_dashboard_counters"),
+        ("ai_insights", "0011_restore_search_fts_triggers"),
+    ]
+
+    operations = [
+        migrations.RunPython(recount_insight_counters, migrations.RunPython.noop),
+    ]
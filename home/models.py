@@ -23,3 +23,105 @@ class TrendKeyword(models.Model):
 
     def __str__(self):
         return f"[{self.region}] {self.keyword}"
+
+
+class Region(models.Model):
+    """
+    공공데이터(법정동 코드) 기준 지역 테이블.
+    - code: 동 코드 (sdsc2 조회 키로 사용)
+    - sido / sigungu / dong: 행정 단위 이름
+    - TrendKeyword.region 에는 sigungu(예: '강남구')를 저장합니다.
+    """
+
+    code = models.CharField(max_length=20, unique=True)
+    sido = models.CharField(max_length=50, blank=True, default="")
+    sigungu = models.CharField(max_length=50, blank=True, default="", db_index=True)
+    dong = models.CharField(max_length=50, blank=True, default="")
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["code"]
+
+    def __str__(self):
+        return f"{self.code} {self.sido} {self.sigungu} {self.dong}".strip()
+
+
+class PublicApiCache(models.Model):
+    """
+    공공데이터 API 응답 캐시 (동 코드 단위).
+    - endpoint + dong_code 조합당 1건, fetched_at 기준으로 TTL 판단
+    """
+
+    endpoint = models.CharField(max_length=100)
+    dong_code = models.CharField(max_length=20)
+    payload = models.JSONField(default=list, blank=True)
+    fetched_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["endpoint", "dong_code"], name="uniq_public_api_cache_key"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint}:{self.dong_code} @ {self.fetched_at:%Y-%m-%d %H:%M}"
+
+
+class DashboardCounter(models.Model):
+    """
+    대시보드/목록용 카운터 캐시 (key 당 1행).
+    - 행은 마이그레이션으로 시드, 이후 시그널로 증감 유지
+    - 어긋나면 recount_dashboard_counters 로 재계산
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+
+class RegionInsightRank(models.Model):
+    """
+    지역별 인사이트 랭킹 (home.ranking 이 미리 계산해 둔 상위 N개).
+    - score: 지역 트렌드 키워드 벡터 · 인사이트 용어 벡터 (코사인 유사도)
+    - 대시보드는 (region, -score) 인덱스로 상위 몇 건만 읽음
+    """
+
+    region = models.CharField(max_length=50)
+    insight = models.ForeignKey(
+        "ai_insights.Insight", on_delete=models.CASCADE, related_name="region_ranks"
+    )
+    score = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["region", "insight"], name="uniq_region_insight_rank"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["region", "-score"], name="region_rank_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.region}] {self.insight_id} ({self.score:.3f})"
+
+
+class RegionRankState(models.Model):
+    """
+    지역별 랭킹 상태.
+    - dirty: 키워드가 바뀌었거나 랭킹 행이 빠져서 전체 재계산이 필요한 지역
+    - refresh_region_rankings 가 dirty 지역만 다시 계산
+    """
+
+    region = models.CharField(max_length=50, unique=True)
+    dirty = models.BooleanField(default=True, db_index=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.region} ({'dirty' if self.dirty else 'ok'})"
@@ -0,0 +1,255 @@
+# home/public_api.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 공공데이터 API(소상공인 상가정보 sdsc2, 법정동 코드 odcloud) 클라이언트
+#
+# 특징:
+# - requests.Session 1개를 커넥션 풀로 재사용 (keep-alive)
+# - urllib3 Retry 로 429/5xx 재시도 + 지수 백오프
+# - ThreadPoolExecutor(max_workers) 로 동시 요청 수 제한
+# - 상가 목록은 페이지를 받을 때마다 업종별 건수로 집계하고 원본 행은 버림
+#   → 동 코드 단위 {업종: 건수} 만 PublicApiCache 테이블에 TTL 캐시
+#   (캐시 조회/저장은 메인 스레드에서 한 번에 처리, 워커 스레드는 HTTP만 수행)
+#
+# 로컬 테스트:
+#   python manage.py run_public_api_stub --port 8765
+#   PUBLIC_API_BASE=http://127.0.0.1:8765/sdsc2 \
+#   LAWD_CODE_API_BASE=http://127.0.0.1:8765/lawd \
+#   PUBLIC_API_KEY=dummy LAWD_API_KEY=dummy \
+#   python manage.py ingest_public_trends --refresh-regions
+# -----------------------------------------------------------------------------
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlencode
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .models import PublicApiCache
+
+STORES_IN_DONG = "storeListInDong"
+# 캐시 endpoint 키: 원본 목록이 아니라 업종별 건수를 저장
+STORE_CATEGORIES = f"{STORES_IN_DONG}:categories"
+
+# 업종 이름 후보 필드 (소분류 → 중분류 순)
+CATEGORY_FIELDS = ("indsSclsNm", "indsMclsNm")
+
+# sdsc2: resultCode "03" = 데이터 없음(정상 응답)
+_SDSC_OK_CODES = {"00", "03"}
+
+
+class PublicApiError(Exception):
+    """공공데이터 API 호출 실패(재시도 후에도 실패한 경우)"""
+
+
+def build_session(pool_size: int, retries: int, backoff: float) -> requests.Session:
+    """커넥션 풀 + 재시도가 설정된 Session 생성"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def store_category(item: Dict[str, Any]) -> str:
+    """상가 1건의 업종 이름 (없으면 빈 문자열)"""
+    for field in CATEGORY_FIELDS:
+        name = (item.get(field) or "").strip()
+        if name:
+            return name
+    return ""
+
+
+def _with_service_key(url: str, key: str, params: Dict[str, Any]) -> str:
+    """
+    serviceKey 는 이미 인코딩된 값(Encoding Key)이므로 다시 인코딩하지 않도록
+    쿼리스트링에 그대로 붙입니다.
+    """
+    return f"{url}?serviceKey={key}&{urlencode(params)}"
+
+
+class PublicDataClient:
+    def __init__(
+        self,
+        *,
+        max_workers: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        self.max_workers = max_workers or settings.PUBLIC_API_MAX_WORKERS
+        self.cache_ttl = (
+            settings.PUBLIC_API_CACHE_TTL if cache_ttl is None else cache_ttl
+        )
+        self.session = session or build_session(
+            pool_size=self.max_workers,
+            retries=settings.PUBLIC_API_RETRIES,
+            backoff=settings.PUBLIC_API_BACKOFF,
+        )
+
+    # ----------------------------
+    # 저수준 GET
+    # ----------------------------
+    def _get_json(self, url: str, timeout: float) -> Dict[str, Any]:
+        try:
+            resp = self.session.get(url, timeout=timeout)
+            resp.raise_for_status()
+            return resp.json()
+        except (requests.RequestException, ValueError) as e:
+            raise PublicApiError(f"{url.split('?')[0]}: {e}") from e
+
+    # ----------------------------
+    # 법정동 코드 목록 (odcloud, page/perPage 페이지네이션)
+    # ----------------------------
+    def iter_lawd_codes(self, per_page: int = 1000) -> Iterator[Dict[str, Any]]:
+        key = settings.LAWD_API_KEY
+        if not key:
+            raise ImproperlyConfigured("LAWD_API_KEY is not set")
+        url = f"{settings.LAWD_CODE_API_BASE}{settings.LAWD_CODE_API_PATH}"
+
+        page = 1
+        while True:
+            data = self._get_json(
+                _with_service_key(url, key, {"page": page, "perPage": per_page}),
+                timeout=settings.LAWD_API_TIMEOUT,
+            )
+            rows = data.get("data") or []
+            yield from rows
+
+            total = int(data.get("totalCount") or 0)
+            if not rows or page * per_page >= total:
+                return
+            page += 1
+
+    # ----------------------------
+    # 동 단위 상가업소 업종 건수 (sdsc2, pageNo/numOfRows 페이지네이션)
+    # ----------------------------
+    def _fetch_category_counts_remote(self, dong_code: str) -> Dict[str, int]:
+        key = settings.PUBLIC_API_KEY
+        if not key:
+            raise ImproperlyConfigured("PUBLIC_API_KEY is not set")
+        url = f"{settings.PUBLIC_API_BASE}/{STORES_IN_DONG}"
+
+        counts: Counter = Counter()
+        page = 1
+        num_rows = 1000  # sdsc2 최대값
+        while True:
+            params = {
+                "divId": settings.SDSC_DIV_ID,
+                settings.SDSC_PARAM_KEY_NAME: dong_code,
+                "type": "json",
+                "pageNo": page,
+                "numOfRows": num_rows,
+            }
+            data = self._get_json(
+                _with_service_key(url, key, params),
+                timeout=settings.PUBLIC_API_TIMEOUT,
+            )
+            header = data.get("header") or {}
+            code = str(header.get("resultCode") or "00")
+            if code not in _SDSC_OK_CODES:
+                raise PublicApiError(
+                    f"{STORES_IN_DONG}({dong_code}): {code} {header.get('resultMsg')}"
+                )
+
+            body = data.get("body") or {}
+            rows = body.get("items") or []
+            # 페이지 단위로 바로 집계 → 메모리에는 업종별 건수만 남음
+            counts.update(filter(None, map(store_category, rows)))
+
+            total = int(body.get("totalCount") or 0)
+            if not rows or page * num_rows >= total:
+                return dict(counts)
+            page += 1
+
+    # ----------------------------
+    # 캐시
+    # ----------------------------
+    def _load_cached(
+        self, endpoint: str, dong_codes: List[str]
+    ) -> Dict[str, Dict[str, int]]:
+        if self.cache_ttl <= 0 or not dong_codes:
+            return {}
+        fresh_after = timezone.now() - timedelta(seconds=self.cache_ttl)
+        rows = PublicApiCache.objects.filter(
+            endpoint=endpoint, dong_code__in=dong_codes, fetched_at__gte=fresh_after
+        ).values_list("dong_code", "payload")
+        return {code: payload for code, payload in rows}
+
+    def _store_cached(self, endpoint: str, results: Dict[str, Dict[str, int]]) -> None:
+        if not results:
+            return
+        now = timezone.now()
+        PublicApiCache.objects.bulk_create(
+            [
+                PublicApiCache(
+                    endpoint=endpoint, dong_code=code, payload=payload, fetched_at=now
+                )
+                for code, payload in results.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["endpoint", "dong_code"],
+            update_fields=["payload", "fetched_at"],
+            batch_size=500,
+        )
+
+    # ----------------------------
+    # 공개 메서드
+    # ----------------------------
+    def fetch_category_counts(
+        self, dong_code: str, *, use_cache: bool = True
+    ) -> Dict[str, int]:
+        results, errors = self.fetch_category_counts_many(
+            [dong_code], use_cache=use_cache
+        )
+        if dong_code in errors:
+            raise errors[dong_code]
+        return results[dong_code]
+
+    def fetch_category_counts_many(
+        self, dong_codes: Iterable[str], *, use_cache: bool = True
+    ) -> tuple[Dict[str, Dict[str, int]], Dict[str, PublicApiError]]:
+        """
+        여러 동 코드의 업종별 상가 건수를 한 번에 조회합니다.
+        - 캐시 적중분은 DB 1회 조회로 가져오고, 나머지만 동시 요청
+        - 반환: (성공 결과 {code: {업종: 건수}}, 실패 {code: error})
+        """
+        codes = list(dict.fromkeys(dong_codes))  # 순서 유지 중복 제거
+        results = self._load_cached(STORE_CATEGORIES, codes) if use_cache else {}
+        misses = [c for c in codes if c not in results]
+
+        fetched: Dict[str, Dict[str, int]] = {}
+        errors: Dict[str, PublicApiError] = {}
+        if misses:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(self._fetch_category_counts_remote, code): code
+                    for code in misses
+                }
+                for fut in as_completed(futures):
+                    code = futures[fut]
+                    try:
+                        fetched[code] = fut.result()
+                    except PublicApiError as e:
+                        errors[code] = e
+
+        self._store_cached(STORE_CATEGORIES, fetched)
+        results.update(fetched)
+        return results, errors
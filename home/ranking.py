@@ -0,0 +1,342 @@
+# home/ranking.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 대시보드 "AI 인사이트 요약"을 지역(region)의 현재 트렌드 키워드와 관련 높은 순으로
+#
+# 점수:
+# - 지역 벡터: 최신 트렌드 키워드 KEYWORDS_PER_REGION 개를 검색과 같은 방식으로 토큰화
+#   (최신일수록 가중치 ↑) → L2 정규화
+# - 인사이트 벡터: 검색 문서의 terms (본문 + 태그, ai_insights.search.term_vector)
+# - score = 두 벡터의 내적 (코사인 유사도)
+#   대표 인사이트(duplicate_of 없음) + 공용 인사이트(매장별 규칙 엔진 결과 제외)만 대상
+#
+# 계산:
+# - 전체 재계산(refresh_regions): 후보 인사이트 벡터를 한 번 훑어서
+#   "지역 키워드에 등장하는 토큰"만 역색인(토큰 → [(후보 번호, 가중치)])으로 만든 뒤
+#   지역마다 토큰별 posting 을 누적 → 모든 후보의 내적을 한 번에 계산, 상위 TOP_N 저장
+# - 증분 갱신(apply_insights): 검색 색인 직후(search_indexed 시그널) 바뀐 인사이트만
+#   · 지역 벡터는 프로세스 메모리에 캐시 (토큰 → 지역 역색인 포함)
+#     키워드 변경 시 커밋 후 폐기 + 공유 버전 키 증가 (다른 워커는 VERSION_CHECK_SECONDS 안에,
+#     공유되지 않는 캐시면 VECTORS_TTL 초 안에 다시 읽음)
+#   · 바뀐 인사이트와 토큰이 겹치는 지역 + 그 인사이트가 이미 들어 있는 지역만 다시 병합
+# - 키워드 변경 / 랭킹 행 삭제 → 해당 지역 dirty 표시만 (요청 안에서는 재계산하지 않음)
+#   dirty 지역은 refresh_region_rankings --loop 워커가 모아서 한 번에 재계산
+#   (그 전까지 조회는 기존 랭킹 + 최신 인사이트로 채움)
+#
+# 조회:
+# - top_insights(region, n): RegionInsightRank (region, -score) 인덱스로 n건
+# -----------------------------------------------------------------------------
+import heapq
+import math
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from ai_insights.models import Insight, InsightSearchDocument
+from ai_insights.search import tokenize
+
+from .models import RegionInsightRank, RegionRankState, TrendKeyword
+
+TOP_N = 20
+KEYWORDS_PER_REGION = 10
+# i 번째(0부터) 최신 키워드 가중치 = 1 / (1 + KEYWORD_DECAY * i)
+KEYWORD_DECAY = 0.2
+
+# 지역 벡터 캐시 (apply_insights 용)
+VECTORS_VERSION_KEY = "home_ranking:vectors_version"
+VECTORS_TTL = 300
+VERSION_CHECK_SECONDS = 5
+
+
+# ----------------------------
+# 벡터
+# ----------------------------
+def region_vector(keywords: Sequence[str]) -> Dict[str, float]:
+    """최신순 키워드 목록 → {토큰: 가중치} (L2 정규화)"""
+    weights: Dict[str, float] = {}
+    for i, keyword in enumerate(keywords):
+        w = 1.0 / (1.0 + KEYWORD_DECAY * i)
+        for t in tokenize(keyword):
+            weights[t] = weights.get(t, 0.0) + w
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {t: w / norm for t, w in weights.items()}
+
+
+def region_vectors(regions: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """{region: 벡터} — regions 가 없으면 키워드가 있는 전체 지역"""
+    qs = TrendKeyword.objects.all()
+    if regions is not None:
+        qs = qs.filter(region__in=list(regions))
+    keywords: Dict[str, List[str]] = {}
+    for region, keyword in qs.order_by("region", "-created_at", "-id").values_list(
+        "region", "keyword"
+    ):
+        bucket = keywords.setdefault(region, [])
+        if len(bucket) < KEYWORDS_PER_REGION:
+            bucket.append(keyword)
+    return {region: region_vector(kws) for region, kws in keywords.items()}
+
+
+class _RegionVectors:
+    def __init__(self, version, vectors: Dict[str, Dict]):
+        now = time.monotonic()
+        self.version = version
+        self.expires = now + VECTORS_TTL
+        self.checked = now
+        self.vectors = vectors
+        # 토큰 → 그 토큰이 벡터에 있는 지역들
+        self.by_token: Dict[str, Set[str]] = {}
+        for region, vec in vectors.items():
+            for t in vec:
+                self.by_token.setdefault(t, set()).add(region)
+
+    def fresh(self) -> bool:
+        now = time.monotonic()
+        if now >= self.expires:
+            return False
+        if now - self.checked >= VERSION_CHECK_SECONDS:
+            if cache.get(VECTORS_VERSION_KEY, 0) != self.version:
+                return False
+            self.checked = now
+        return True
+
+    def regions_for(self, terms: Iterable[str]) -> Set[str]:
+        out: Set[str] = set()
+        for t in terms:
+            out |= self.by_token.get(t, set())
+        return out
+
+
+_vectors: Optional[_RegionVectors] = None
+_vectors_lock = threading.Lock()
+
+
+def cached_region_vectors() -> _RegionVectors:
+    """전체 지역 벡터 (프로세스 캐시, 키워드 변경 시 invalidate_vectors)"""
+    global _vectors
+    current = _vectors
+    if current is not None and current.fresh():
+        return current
+    with _vectors_lock:
+        if _vectors is not None and _vectors is not current and _vectors.fresh():
+            return _vectors  # 기다리는 동안 다른 스레드가 다시 읽음
+        version = cache.get(VECTORS_VERSION_KEY, 0)
+        _vectors = _RegionVectors(version, region_vectors())
+        return _vectors
+
+
+def invalidate_vectors() -> None:
+    """이 프로세스 지역 벡터 캐시 폐기 + 공유 버전 올림"""
+    global _vectors
+    with _vectors_lock:
+        _vectors = None
+    try:
+        cache.incr(VECTORS_VERSION_KEY)
+    except ValueError:  # 키 없음
+        cache.set(VECTORS_VERSION_KEY, 1, None)
+
+
+def dot(query: Dict[str, float], terms: Dict[str, float]) -> float:
+    if len(terms) < len(query):
+        query, terms = terms, query
+    return sum(w * terms.get(t, 0.0) for t, w in query.items())
+
+
+def _candidate_docs(ids: Optional[Iterable[str]] = None):
+    qs = InsightSearchDocument.objects.filter(
+        insight__duplicate_of__isnull=True, insight__store_external_id=""
+    )
+    if ids is not None:
+        qs = qs.filter(insight_id__in=list(ids))
+    return qs.values_list("insight_id", "terms")
+
+
+# ----------------------------
+# dirty 표시
+# ----------------------------
+def mark_dirty(regions: Iterable[str]) -> None:
+    """dirty 표시만 (재계산은 refresh_region_rankings 가 dirty 지역을 모아서 처리)"""
+    regions = sorted(set(r for r in regions if r))
+    if not regions:
+        return
+    RegionRankState.objects.bulk_create(
+        [RegionRankState(region=r, dirty=True) for r in regions],
+        update_conflicts=True,
+        unique_fields=["region"],
+        update_fields=["dirty"],
+    )
+
+
+def dirty_regions() -> List[str]:
+    """dirty 표시된 지역 + 키워드는 있는데 아직 한 번도 계산하지 않은 지역"""
+    dirty = set(
+        RegionRankState.objects.filter(dirty=True).values_list("region", flat=True)
+    )
+    known = set(RegionRankState.objects.values_list("region", flat=True))
+    keyword_regions = set(TrendKeyword.objects.values_list("region", flat=True))
+    return sorted(dirty | (keyword_regions - known))
+
+
+# ----------------------------
+# 전체 재계산
+# ----------------------------
+def refresh_regions(
+    regions: Optional[Iterable[str]] = None, chunk_size: int = 2000
+) -> Dict[str, int]:
+    """
+    regions(기본: dirty_regions()) 의 상위 TOP_N 을 다시 계산해 교체
+    반환: {region: 저장한 행 수}
+    """
+    regions = sorted(set(regions if regions is not None else dirty_regions()))
+    if not regions:
+        return {}
+    vectors = region_vectors(regions)
+    vocab = {t for vec in vectors.values() for t in vec}
+
+    # 지역 키워드 토큰만 역색인: 토큰 → (후보 번호 배열, 가중치 배열)
+    ids: List[str] = []
+    postings: Dict[str, tuple] = {}
+    for insight_id, terms in _candidate_docs().iterator(chunk_size=chunk_size):
+        n = len(ids)
+        ids.append(insight_id)
+        for t in vocab.intersection(terms or ()):
+            entry = postings.get(t)
+            if entry is None:
+                entry = postings[t] = (array("l"), array("d"))
+            entry[0].append(n)
+            entry[1].append(terms[t])
+
+    saved: Dict[str, int] = {}
+    rows: List[RegionInsightRank] = []
+    for region in regions:
+        scores: Dict[int, float] = {}
+        for t, qw in vectors.get(region, {}).items():
+            if t not in postings:
+                continue
+            idx, weights = postings[t]
+            for n, w in zip(idx, weights):
+                scores[n] = scores.get(n, 0.0) + qw * w
+        top = heapq.nlargest(TOP_N, scores.items(), key=lambda kv: (kv[1], ids[kv[0]]))
+        rows.extend(
+            RegionInsightRank(region=region, insight_id=ids[n], score=round(s, 6))
+            for n, s in top
+        )
+        saved[region] = len(top)
+
+    now = timezone.now()
+    with transaction.atomic():
+        RegionInsightRank.objects.filter(region__in=regions).delete()
+        RegionInsightRank.objects.bulk_create(rows, batch_size=1000)
+        RegionRankState.objects.bulk_create(
+            [RegionRankState(region=r, dirty=False, refreshed_at=now) for r in regions],
+            update_conflicts=True,
+            unique_fields=["region"],
+            update_fields=["dirty", "refreshed_at"],
+        )
+    return saved
+
+
+# ----------------------------
+# 증분 갱신
+# ----------------------------
+def apply_insights(insight_ids: Iterable[str]) -> int:
+    """
+    바뀐 인사이트들의 지역별 점수를 계산해 저장된 상위 TOP_N 과 병합
+    - 점수가 0 이 되었거나 중복/삭제된 인사이트는 빠짐 (빈자리가 생기면 dirty)
+    반환: 바뀐 지역 수
+    """
+    ids = set(insight_ids)
+    if not ids:
+        return 0
+    state = cached_region_vectors()
+    docs = dict(_candidate_docs(ids))
+
+    # 지역별 새 점수 (토큰이 겹치는 지역만, 0 초과만)
+    fresh: Dict[str, Dict[str, float]] = {}
+    for insight_id, terms in docs.items():
+        terms = terms or {}
+        for region in state.regions_for(terms):
+            score = dot(state.vectors[region], terms)
+            if score > 0:
+                fresh.setdefault(region, {})[insight_id] = round(score, 6)
+
+    # 바뀐 인사이트가 이미 들어 있는 지역 + 새 점수가 생긴 지역만 현재 랭킹을 읽음
+    touched = set(fresh) | set(
+        RegionInsightRank.objects.filter(insight_id__in=list(ids)).values_list(
+            "region", flat=True
+        )
+    )
+    if not touched:
+        return 0
+    current: Dict[str, Dict[str, float]] = {}
+    for region, insight_id, score in RegionInsightRank.objects.filter(
+        region__in=list(touched)
+    ).values_list("region", "insight_id", "score"):
+        current.setdefault(region, {})[insight_id] = score
+
+    to_delete: Dict[str, List[str]] = {}
+    to_upsert: List[RegionInsightRank] = []
+    dirty: List[str] = []
+    for region in touched:
+        ranks = {k: v for k, v in current.get(region, {}).items() if k not in ids}
+        ranks.update(fresh.get(region, {}))
+        keep = dict(heapq.nlargest(TOP_N, ranks.items(), key=lambda kv: (kv[1], kv[0])))
+        before = current.get(region, {})
+        removed = [k for k in before if k not in keep]
+        if removed:
+            to_delete[region] = removed
+        to_upsert.extend(
+            RegionInsightRank(region=region, insight_id=k, score=v)
+            for k, v in keep.items()
+            if before.get(k) != v
+        )
+        # 기존 상위에서 빠진 행이 있었고 자리가 남으면, 그 아래 후보는 모르므로 재계산 필요
+        if len(keep) < TOP_N and len(before) >= TOP_N:
+            dirty.append(region)
+
+    with transaction.atomic():
+        for region, removed in to_delete.items():
+            RegionInsightRank.objects.filter(
+                region=region, insight_id__in=removed
+            ).delete()
+        if to_upsert:
+            RegionInsightRank.objects.bulk_create(
+                to_upsert,
+                update_conflicts=True,
+                unique_fields=["region", "insight"],
+                update_fields=["score", "updated_at"],
+            )
+        mark_dirty(dirty)
+    return len(touched)
+
+
+# ----------------------------
+# 조회
+# ----------------------------
+def top_insights(region: str, limit: int = 3) -> List[Insight]:
+    """지역 랭킹 상위 인사이트 (랭킹이 모자라면 최신 인사이트로 채움)"""
+    ranked = [
+        r.insight
+        for r in RegionInsightRank.objects.filter(
+            region=region,
+            insight__duplicate_of__isnull=True,
+            insight__store_external_id="",
+        )
+        .select_related("insight")
+        .order_by("-score", "-insight__created_at")[:limit]
+    ]
+    if len(ranked) < limit:
+        ranked.extend(
+            Insight.objects.shared()
+            .filter(duplicate_of__isnull=True)
+            .exclude(id__in=[i.id for i in ranked])
+            .order_by("-created_at")[: limit - len(ranked)]
+        )
+    return ranked
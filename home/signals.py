@@ -0,0 +1,194 @@
+# home/signals.py
+# -----------------------------------------------------------------------------
+# 대시보드 카운터(home.counters) 유지용 시그널
+# - 생성/삭제 → total 증감
+# - Campaign.status 변경 → 이전 key -1, 새 key +1
+# - Insight: 목록에 보이는 인사이트(공용 + 대표)만 전체 / is_new 별로 셈
+#   · is_new / store_external_id / duplicate_of 변경 → 이전 상태 -1, 새 상태 +1
+#   · 삭제 시 SET_NULL 로 대표가 풀리는 중복 인사이트는 다시 보이므로 +1
+#
+# 지역별 인사이트 랭킹(home.ranking) 유지용 시그널
+# - 검색 색인 갱신(search_indexed) → 바뀐 인사이트만 증분 병합
+# - 트렌드 키워드 추가/변경/삭제, 랭킹에 있던 인사이트 삭제 → 지역 dirty 표시
+#   (재계산은 refresh_region_rankings 워커가 처리, 키워드 변경은 커밋 후 지역 벡터 캐시도 폐기)
+# -----------------------------------------------------------------------------
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from ai_insights.models import Insight
+from ai_insights.search import search_indexed
+from campaigns.models import Campaign
+from users.models import Notice
+
+from . import counters, ranking
+from .models import RegionInsightRank, TrendKeyword
+
+
+def _stash_previous(instance, field: str, update_fields=None) -> None:
+    """
+    pre_save: 저장 전 DB 값을 인스턴스에 잠시 보관 (없으면 None)
+    - 새 행이거나 update_fields 에 field 가 없으면 조회하지 않음
+    """
+    previous = None
+    changing = update_fields is None or field in update_fields
+    if changing and not instance._state.adding and instance.pk is not None:
+        previous = (
+            type(instance)
+            .objects.filter(pk=instance.pk)
+            .values_list(field, flat=True)
+            .first()
+        )
+    setattr(instance, f"_counter_prev_{field}", previous)
+
+
+# ----------------------------
+# Insight: 전체 / is_new 별 (목록에 보이는 것만)
+# ----------------------------
+_INSIGHT_FIELDS = ("is_new", "store_external_id", "duplicate_of")
+_UNCHANGED = object()
+
+
+def _insight_state(is_new, store_external_id, duplicate_of_id):
+    """카운터 상태: 보이면 is_new, 안 보이면 None"""
+    if counters.insight_counted(store_external_id, duplicate_of_id):
+        return bool(is_new)
+    return None
+
+
+def _insight_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    changing = update_fields is None or set(_INSIGHT_FIELDS) & set(update_fields)
+    if raw or not changing:
+        instance._counter_prev_state = _UNCHANGED
+        return
+    previous = None
+    if not instance._state.adding:
+        row = (
+            Insight.objects.filter(pk=instance.pk)
+            .values_list("is_new", "store_external_id", "duplicate_of")
+            .first()
+        )
+        previous = _insight_state(*row) if row else None
+    instance._counter_prev_state = previous
+
+
+def _insight_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    state = _insight_state(
+        instance.is_new, instance.store_external_id, instance.duplicate_of_id
+    )
+    previous = None if created else getattr(instance, "_counter_prev_state", state)
+    if previous is _UNCHANGED or previous == state:
+        return
+    if previous is not None:
+        counters.incr_insight(previous, -1)
+    if state is not None:
+        counters.incr_insight(state, 1)
+
+
+def _insight_pre_delete(sender, instance, **kwargs):
+    # 대표가 지워지면 중복 인사이트의 duplicate_of 가 SET_NULL → 다시 보임
+    instance._counter_released = list(
+        instance.duplicates.shared().values_list("is_new", flat=True)
+    )
+
+
+def _insight_post_delete(sender, instance, **kwargs):
+    state = _insight_state(
+        instance.is_new, instance.store_external_id, instance.duplicate_of_id
+    )
+    if state is not None:
+        counters.incr_insight(state, -1)
+    for is_new in getattr(instance, "_counter_released", ()):
+        counters.incr_insight(is_new, 1)
+
+
+# ----------------------------
+# Notice: 전체
+# ----------------------------
+def _notice_post_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.incr(counters.NOTICES_TOTAL, 1)
+
+
+def _notice_post_delete(sender, instance, **kwargs):
+    counters.incr(counters.NOTICES_TOTAL, -1)
+
+
+# ----------------------------
+# Campaign: 전체 / status 별
+# ----------------------------
+def _campaign_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        _stash_previous(instance, "status", update_fields)
+
+
+def _campaign_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    status = str(instance.status or "")
+    previous = getattr(instance, "_counter_prev_status", None)
+    if created:
+        counters.incr(counters.CAMPAIGNS_TOTAL, 1)
+        counters.incr(counters.campaign_status_key(status), 1)
+    elif previous is not None and previous.lower() != status.lower():
+        counters.incr(counters.campaign_status_key(previous), -1)
+        counters.incr(counters.campaign_status_key(status), 1)
+
+
+def _campaign_post_delete(sender, instance, **kwargs):
+    counters.incr(counters.CAMPAIGNS_TOTAL, -1)
+    counters.incr(counters.campaign_status_key(str(instance.status or "")), -1)
+
+
+def connect_counter_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    pairs = [
+        (pre_save, _insight_pre_save, Insight),
+        (post_save, _insight_post_save, Insight),
+        (pre_delete, _insight_pre_delete, Insight),
+        (post_delete, _insight_post_delete, Insight),
+        (post_save, _notice_post_save, Notice),
+        (post_delete, _notice_post_delete, Notice),
+        (pre_save, _campaign_pre_save, Campaign),
+        (post_save, _campaign_post_save, Campaign),
+        (post_delete, _campaign_post_delete, Campaign),
+    ]
+    for signal, handler, sender in pairs:
+        uid = f"home_counter_{handler.__name__}"
+        signal.connect(handler, sender=sender, dispatch_uid=uid, weak=False)
+
+
+# ----------------------------
+# 지역별 인사이트 랭킹
+# ----------------------------
+def _rank_indexed(sender, insight_ids, **kwargs):
+    ranking.apply_insights(insight_ids)
+
+
+def _rank_keyword_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(ranking.invalidate_vectors)
+        ranking.mark_dirty([instance.region])
+
+
+def _rank_insight_pre_delete(sender, instance, **kwargs):
+    # CASCADE 로 랭킹 행이 지워지기 전에 빈자리가 생길 지역을 기록
+    ranking.mark_dirty(
+        RegionInsightRank.objects.filter(insight_id=instance.pk).values_list(
+            "region", flat=True
+        )
+    )
+
+
+def connect_ranking_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    pairs = [
+        (search_indexed, _rank_indexed, None),
+        (post_save, _rank_keyword_changed, TrendKeyword),
+        (post_delete, _rank_keyword_changed, TrendKeyword),
+        (pre_delete, _rank_insight_pre_delete, Insight),
+    ]
+    for signal, handler, sender in pairs:
+        uid = f"home_ranking_{handler.__name__}"
+        signal.connect(handler, sender=sender, dispatch_uid=uid, weak=False)
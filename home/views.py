@@ -1,19 +1,21 @@
 # home/views.py
 from __future__ import annotations
 
-import json
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 
-import requests
-from django.conf import settings
 from django.db.models import Sum
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.utils.dateformat import format as dj_format
 from django.views import View
+from ninja import Schema
+from ninja.errors import HttpError
 
-from ai_insights.models import Insight
+from campaigns.api import list_campaigns
+from home import counters, ranking
 from home.models import TrendKeyword
+from reports.api import get_total_report
+from users.api import list_user_notices
 
 KST = timezone(timedelta(hours=9))
 
@@ -53,29 +55,23 @@ class DashboardSummaryView(View):
     """
 
     # ----------------------------
-    # 내부 공통: 자기 자신에게 API 호출
+    # 내부 공통: ninja(/api/v1) 엔드포인트 함수를 같은 프로세스에서 직접 호출
+    # (예전에는 localhost:8000 으로 HTTP 요청 → 배포 환경에서는 타임아웃)
     # ----------------------------
-    def _safe_get_json(
-        self, path: str, params: Optional[Dict[str, Any]] = None, timeout: float = 3.5
-    ) -> Tuple[bool, Any]:
-        base = "http://localhost:8000"  # 개발 로컬에서만 사용
-        url = f"{base}{path}"
+    def _safe_call(self, view, *args, **kwargs) -> Tuple[bool, Any]:
         try:
-            resp = requests.get(url, params=params or {}, timeout=timeout)
-            resp.raise_for_status()
-            return True, resp.json()
-        except requests.RequestException as e:
-            return False, f"request_error: {e}"
-        except json.JSONDecodeError:
-            return False, "json_decode_error"
+            result = view(self.request, *args, **kwargs)
+        except (Http404, HttpError) as e:
+            return False, f"call_error: {e}"
+        if isinstance(result, Schema):
+            result = result.dict()
+        return True, result
 
     # ----------------------------
     # 캠페인 요약 (진행중 상위 1~2개) — 내부 API 사용
     # ----------------------------
     def _fetch_campaign_summary(self) -> List[Dict[str, Any]]:
-        ok, data = self._safe_get_json(
-            "/api/v1/campaigns", params={"status": "active", "limit": 2}
-        )
+        ok, data = self._safe_call(list_campaigns, status="active", limit=2)
         if not ok or not isinstance(data, dict):
             return []
 
@@ -154,9 +150,12 @@ class DashboardSummaryView(View):
     # ----------------------------
     def _fetch_weekly_sales_api(self, req) -> List[Dict[str, Any]]:
         start_str, end_str = self._calc_from_to(req)
-        ok, data = self._safe_get_json(
-            "/api/v1/reports", params={"startDate": start_str, "endDate": end_str}
-        )
+        try:
+            start_d = date.fromisoformat(start_str)
+            end_d = date.fromisoformat(end_str)
+        except ValueError:
+            return []
+        ok, data = self._safe_call(get_total_report, startDate=start_d, endDate=end_d)
         if not ok or not isinstance(data, dict):
             return []
 
@@ -178,9 +177,7 @@ class DashboardSummaryView(View):
     # ----------------------------
     def _fetch_latest_notice(self, req) -> Dict[str, Any]:
         user_id = getattr(getattr(req, "user", None), "id", None) or 1
-        ok, data = self._safe_get_json(
-            f"/api/v1/users/{user_id}/notices", params={"page": 1, "limit": 1}
-        )
+        ok, data = self._safe_call(list_user_notices, user_id, page=1, limit=1)
         if not ok or not isinstance(data, dict):
             return {}
 
@@ -210,8 +207,8 @@ class DashboardSummaryView(View):
         if not region:
             return JsonResponse({"error": "region parameter is required"}, status=400)
 
-        # 1) AI 인사이트 요약
-        insights_qs = Insight.objects.order_by("-created_at")[:3]
+        # 1) AI 인사이트 요약 — 지역 트렌드 키워드 기준 랭킹(home.ranking) 상위 3건
+        insights_qs = ranking.top_insights(region, 3)
         insights = [
             {
                 "id": i.id,
@@ -220,7 +217,7 @@ class DashboardSummaryView(View):
             }
             for i in insights_qs
         ]
-        insight_count = Insight.objects.count()
+        insight_count = counters.get_count(counters.INSIGHTS_TOTAL)
 
         # 2) 상권 트렌드 키워드
         keywords = list(
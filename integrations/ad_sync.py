@@ -0,0 +1,394 @@
+# integrations/ad_sync.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - Facebook / Instagram 광고 계정의 캠페인별 일 성과(지출/클릭/노출)를
+#   Campaign + DailyPerformance 로 증분 동기화 (sync_ad_insights)
+#
+# 흐름:
+# 1) 활성 연동마다 기간 결정
+#    - 처음: 오늘 - initial_days ~ 오늘
+#    - 이후: AdSyncState.synced_until - lookback_days ~ 오늘 (high-water mark)
+# 2) 기간을 window_days 단위로 나눠 insights 요청을 만들고
+#    Graph batch 엔드포인트(POST / batch=[...])로 한 번에 최대 AD_SYNC["batch"] 개 호출
+#    - 응답에 paging.next 가 있으면 after 커서를 붙인 요청을 다음 batch 에 추가
+#    - HTTP 는 providers 어댑터 (커넥션 풀/재시도/서킷 브레이커), 워커 스레드는 HTTP 만
+#      (어댑터의 속도 제한 버킷 차감만 DB 를 쓰므로 워커가 끝날 때 연결을 닫음)
+# 3) 메인 스레드에서 연동 단위 트랜잭션으로 저장
+#    - Campaign: (integration, external_id) 기준 bulk upsert (이름 갱신)
+#      시그널을 타지 않으므로 새로 생긴 캠페인 수만큼 대시보드 카운터(home.counters) 증가
+#    - DailyPerformance: (date, campaign) 기준 bulk upsert (spend/clicks/impressions,
+#      sales 는 POS 쪽 값 유지)
+#    - 바뀐 캠페인의 누적 지출/클릭/노출/ROAS 재계산
+#    - AdSyncState.synced_until 갱신
+#
+# 광고 계정: Integration.extra["ad_account_id"]
+# - account_id 는 /me 의 사용자 id 라 광고 계정 id 가 아님
+# - 연결(OAuth 콜백) / 동기화 때 비어 있으면 GET /me/adaccounts 로 찾아 첫 활성 계정을 저장
+# - 광고 계정이 없는 연동은 건너뜀 (no_account, 다음 실행에서 다시 찾음)
+# 로컬 테스트: sync_ad_insights --fixture integrations/testdata/graph_ad_insights.json
+# -----------------------------------------------------------------------------
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from campaigns.models import Campaign
+from home import counters
+from reports.models import DailyPerformance
+
+from .models import AdSyncState, Integration
+from .providers import ProviderAdapter, ProviderError, get_adapter, graph_error
+
+AD_PROVIDERS = ("facebook", "instagram")
+INSIGHT_FIELDS = "campaign_id,campaign_name,spend,clicks,impressions"
+
+
+def ad_account_id(integ: Integration) -> str:
+    """저장된 광고 계정 id ("act_..."), 아직 모르면 "" """
+    return (integ.extra or {}).get("ad_account_id") or ""
+
+
+def discover_ad_accounts(adapter: ProviderAdapter, token: str) -> List[str]:
+    """GET /me/adaccounts → 활성(account_status=1) 광고 계정 id 목록"""
+    data = adapter.request(
+        "GET",
+        "/me/adaccounts",
+        params={"fields": "id,account_status", "limit": 100, "access_token": token},
+    )
+    return [
+        str(a["id"])
+        for a in data.get("data") or []
+        if a.get("id") and a.get("account_status", 1) == 1
+    ]
+
+
+def remember_ad_account(integ: Integration, account: str) -> None:
+    """extra["ad_account_id"] 저장 (잠근 현재 행의 extra 에 키만 병합)"""
+    with transaction.atomic():
+        row = (
+            Integration.objects.select_for_update()
+            .filter(pk=integ.pk)
+            .values("extra")
+            .first()
+        )
+        if row is None:
+            return
+        extra = dict(row["extra"] or {})
+        extra["ad_account_id"] = account
+        Integration.objects.filter(pk=integ.pk).update(extra=extra)
+    integ.extra = extra
+
+
+def sync_range(
+    state: Optional[AdSyncState], today: date, since: Optional[date] = None
+) -> Tuple[date, date]:
+    """(시작일, 종료일) — since 를 주면 high-water mark 무시"""
+    conf = settings.AD_SYNC
+    if since is None:
+        if state is not None and state.synced_until:
+            since = state.synced_until - timedelta(days=conf["lookback_days"])
+        else:
+            since = today - timedelta(days=conf["initial_days"])
+    return min(since, today), today
+
+
+def _insights_url(account: str, start: date, end: date, after: str = "") -> str:
+    params = {
+        "level": "campaign",
+        "time_increment": 1,
+        "fields": INSIGHT_FIELDS,
+        "time_range": json.dumps(
+            {"since": start.isoformat(), "until": end.isoformat()},
+            separators=(",", ":"),
+        ),
+        "limit": settings.AD_SYNC["page_limit"],
+    }
+    if after:
+        params["after"] = after
+    return f"{account}/insights?{urlencode(params)}"
+
+
+def _item_error(code: str, item: Optional[Dict]) -> ProviderError:
+    try:
+        error = json.loads((item or {}).get("body") or "{}").get("error") or {}
+    except ValueError:
+        error = {}
+    return graph_error(
+        code, {"message": "batch item failed", **error}, (item or {}).get("code")
+    )
+
+
+# ----------------------------
+# 수집 (워커 스레드, HTTP 만)
+# ----------------------------
+def fetch_rows(
+    adapter: ProviderAdapter, account: str, token: str, start: date, end: date
+) -> List[Dict]:
+    """기간의 캠페인×일 insights 행 전체 (batch + 커서 페이지네이션)"""
+    conf = settings.AD_SYNC
+    pending: List[Tuple[date, date, str]] = []
+    cursor = start
+    while cursor <= end:
+        stop = min(end, cursor + timedelta(days=conf["window_days"] - 1))
+        pending.append((cursor, stop, ""))
+        cursor = stop + timedelta(days=1)
+
+    rows: List[Dict] = []
+    while pending:
+        chunk, pending = pending[: conf["batch"]], pending[conf["batch"] :]
+        batch = [
+            {"method": "GET", "relative_url": _insights_url(account, s, e, after)}
+            for s, e, after in chunk
+        ]
+        results = adapter.request(
+            "POST",
+            "/",
+            idempotent=True,  # 조회만 묶은 batch → 5xx 재시도 가능
+            account=account,  # 광고 계정별 속도 제한 버킷
+            data={
+                "access_token": token,
+                "include_headers": "false",
+                "batch": json.dumps(batch),
+            },
+        )
+        if not isinstance(results, list) or len(results) != len(chunk):
+            raise ProviderError(f"{adapter.code}: malformed batch response")
+        for (s, e, _), item in zip(chunk, results):
+            if not item or item.get("code") != 200:
+                raise _item_error(adapter.code, item)
+            body = json.loads(item["body"])
+            rows.extend(body.get("data") or [])
+            paging = body.get("paging") or {}
+            after = (paging.get("cursors") or {}).get("after")
+            if paging.get("next") and after:
+                pending.append((s, e, after))
+    return rows
+
+
+# ----------------------------
+# 저장 (메인 스레드)
+# ----------------------------
+def _to_int(value) -> int:
+    try:
+        return max(0, int(Decimal(str(value or 0)).quantize(Decimal(1))))
+    except InvalidOperation:
+        return 0
+
+
+def write_rows(integ: Integration, rows: List[Dict]) -> Dict[str, int]:
+    """insights 행 → Campaign / DailyPerformance upsert, 반환: campaigns, rows"""
+    names: Dict[str, str] = {}
+    daily: Dict[Tuple[str, date], Tuple[int, int, int]] = {}
+    for row in rows:
+        cid = str(row.get("campaign_id") or "")
+        if not cid or not row.get("date_start"):
+            continue
+        names[cid] = row.get("campaign_name") or names.get(cid) or cid
+        day = date.fromisoformat(row["date_start"])
+        daily[(cid, day)] = (
+            _to_int(row.get("spend")),
+            _to_int(row.get("clicks")),
+            _to_int(row.get("impressions")),
+        )
+    if not daily:
+        return {"campaigns": 0, "rows": 0}
+
+    first_day: Dict[str, date] = {}
+    for cid, day in daily:
+        first_day[cid] = min(day, first_day.get(cid, day))
+
+    existing = set(
+        Campaign.objects.filter(
+            integration=integ, external_id__in=list(names)
+        ).values_list("external_id", flat=True)
+    )
+    Campaign.objects.bulk_create(
+        [
+            Campaign(
+                integration=integ,
+                external_id=cid,
+                name=name[:255],
+                channel=integ.provider.code,
+                start_date=first_day[cid],
+            )
+            for cid, name in names.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["integration", "external_id"],
+        update_fields=["name", "updated_at"],
+    )
+    # bulk upsert 는 시그널이 없으므로 새로 생긴 캠페인(기본 상태)만 카운터에 반영
+    inserted = len(set(names) - existing)
+    if inserted:
+        counters.incr(counters.CAMPAIGNS_TOTAL, inserted)
+        counters.incr(
+            counters.campaign_status_key(Campaign._meta.get_field("status").default),
+            inserted,
+        )
+    ids = dict(
+        Campaign.objects.filter(
+            integration=integ, external_id__in=list(names)
+        ).values_list("external_id", "id")
+    )
+    DailyPerformance.objects.bulk_create(
+        [
+            DailyPerformance(
+                campaign_id=ids[cid],
+                date=day,
+                spend=spend,
+                clicks=clicks,
+                impressions=impressions,
+            )
+            for (cid, day), (spend, clicks, impressions) in daily.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["date", "campaign"],
+        update_fields=["spend", "clicks", "impressions"],
+        batch_size=1000,
+    )
+
+    # 캠페인 누적 지표 재계산 (바뀐 캠페인만)
+    totals = {
+        t["campaign_id"]: t
+        for t in DailyPerformance.objects.filter(campaign_id__in=ids.values())
+        .values("campaign_id")
+        .annotate(s=Sum("spend"), c=Sum("clicks"), i=Sum("impressions"))
+    }
+    campaigns = list(
+        Campaign.objects.filter(id__in=ids.values()).only(
+            "id", "spend", "sales", "clicks", "impressions", "roas"
+        )
+    )
+    for campaign in campaigns:
+        t = totals.get(campaign.id) or {}
+        campaign.spend = t.get("s") or 0
+        campaign.clicks = t.get("c") or 0
+        campaign.impressions = t.get("i") or 0
+        campaign.roas = (
+            round(Decimal(100 * campaign.sales) / campaign.spend, 2)
+            if campaign.spend
+            else 0
+        )
+    Campaign.objects.bulk_update(
+        campaigns, ["spend", "clicks", "impressions", "roas"], batch_size=1000
+    )
+    return {"campaigns": len(ids), "rows": len(daily)}
+
+
+# ----------------------------
+# 실행
+# ----------------------------
+def sync(
+    integrations: Optional[Sequence[str]] = None,
+    providers: Optional[Sequence[str]] = None,
+    since: Optional[date] = None,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    on_integration=None,
+) -> Dict:
+    """
+    활성 광고 연동 전체(또는 지정한 public_id) 동기화
+    통계 dict 반환: integrations, synced, failed, skipped, no_account,
+                    campaigns, rows, fetched
+    """
+    workers = max(1, workers or settings.AD_SYNC["workers"])
+    today = timezone.localdate()
+    qs = (
+        Integration.objects.filter(
+            status="active", provider__code__in=list(providers or AD_PROVIDERS)
+        )
+        .exclude(access_token="")
+        .select_related("provider")
+        .order_by("id")
+    )
+    if integrations:
+        qs = qs.filter(public_id__in=list(integrations))
+    integs = list(qs)
+    states = {
+        s.integration_id: s
+        for s in AdSyncState.objects.filter(integration__in=[i.id for i in integs])
+    }
+
+    stats = {
+        "integrations": len(integs),
+        "synced": 0,
+        "failed": 0,
+        "skipped": 0,
+        "no_account": 0,
+        "campaigns": 0,
+        "rows": 0,
+        "fetched": 0,
+    }
+    plans = []
+    for integ in integs:
+        adapter = get_adapter(integ.provider.code)
+        if not adapter.enabled:
+            stats["skipped"] += 1  # graph_base 미설정 (더미 모드)
+            continue
+        start, end = sync_range(states.get(integ.id), today, since)
+        plans.append((integ, adapter, start, end))
+
+    def fetch(plan):
+        """(광고 계정, 행, 오류) — 광고 계정이 없으면 ("", None, None)"""
+        integ, adapter, start, end = plan
+        account = ad_account_id(integ)
+        try:
+            if not account:
+                accounts = discover_ad_accounts(adapter, integ.access_token)
+                if not accounts:
+                    return "", None, None
+                account = accounts[0]
+            rows = fetch_rows(adapter, account, integ.access_token, start, end)
+            return account, rows, None
+        except ProviderError as e:
+            return account, None, e
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, plan): plan for plan in plans}
+        for future in as_completed(futures):
+            integ, _, start, end = futures[future]
+            account, rows, error = future.result()
+            outcome = {"start": start, "end": end, "rows": 0, "campaigns": 0}
+            if not account and error is None:
+                stats["no_account"] += 1
+                outcome["skipped"] = "no ad account"
+                if on_integration:
+                    on_integration(integ, outcome)
+                continue
+            if account != ad_account_id(integ) and not dry_run:
+                remember_ad_account(integ, account)
+            now = timezone.now()
+            state = states.get(integ.id) or AdSyncState(integration=integ)
+            state.last_run_at = now
+            if error is not None:
+                stats["failed"] += 1
+                state.last_error = str(error)[:500]
+                outcome["error"] = state.last_error
+                if not dry_run:
+                    state.save()
+            else:
+                stats["fetched"] += len(rows)
+                if not dry_run:
+                    with transaction.atomic():
+                        written = write_rows(integ, rows)
+                        state.synced_until = end
+                        state.last_error = ""
+                        state.campaigns = written["campaigns"]
+                        state.rows = written["rows"]
+                        state.save()
+                    outcome.update(written)
+                    stats["campaigns"] += written["campaigns"]
+                    stats["rows"] += written["rows"]
+                stats["synced"] += 1
+            if on_integration:
+                on_integration(integ, outcome)
+    return stats
@@ -1,6 +1,17 @@
 from django.contrib import admin
 
-from .models import Integration, PosConnection, PosProvider, Provider
+from .models import (
+    AdSyncState,
+    IdempotencyKey,
+    Integration,
+    PosBackfill,
+    PosConnection,
+    PosDailySales,
+    PosProvider,
+    PosWebhookEvent,
+    Provider,
+    RateLimitBucket,
+)
 
 
 # Register your models here.
@@ -44,6 +55,29 @@ class PosConnectionAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PosWebhookEvent)
+class PosWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "connection", "event_id", "received_at", "processed_at")
+    search_fields = ("event_id", "connection__public_id")
+    list_filter = ("processed_at",)
+    readonly_fields = ("connection", "event_id", "body", "received_at", "processed_at")
+
+
+@admin.register(PosDailySales)
+class PosDailySalesAdmin(admin.ModelAdmin):
+    list_display = ("store_external_id", "date", "sales", "refunds", "orders")
+    search_fields = ("store_external_id",)
+    list_filter = ("date",)
+
+
+@admin.register(PosBackfill)
+class PosBackfillAdmin(admin.ModelAdmin):
+    list_display = ("connection", "status", "records", "pages", "updated_at")
+    list_filter = ("status",)
+    search_fields = ("connection__public_id", "connection__store_external_id")
+    readonly_fields = ("cursor", "records", "pages", "locked_until", "finished_at")
+
+
 # 연동해제
 @admin.register(Integration)
 class IntegrationAdmin(admin.ModelAdmin):
@@ -96,3 +130,22 @@ class IntegrationAdmin(admin.ModelAdmin):
         ),
         ("기타", {"fields": ("extra",)}),
     )
+
+
+@admin.register(AdSyncState)
+class AdSyncStateAdmin(admin.ModelAdmin):
+    list_display = ("integration", "synced_until", "campaigns", "rows", "last_run_at")
+    search_fields = ("integration__public_id",)
+    readonly_fields = ("last_run_at", "last_error")
+
+
+@admin.register(RateLimitBucket)
+class RateLimitBucketAdmin(admin.ModelAdmin):
+    list_display = ("key", "tokens", "refilled_at")
+    search_fields = ("key",)
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("key", "expires_at")
+    search_fields = ("key",)
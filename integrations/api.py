@@ -1,6 +1,5 @@
 import secrets
 import uuid
-from datetime import datetime, timedelta
 from datetime import timezone as dt_timezone
 from typing import Any, Dict, List, Optional
 
@@ -11,9 +10,11 @@ from ninja.errors import HttpError
 from ninja.responses import Response
 from pydantic import BaseModel
 
+from . import ad_sync, catalog, heartbeats, pos_backfill, pos_webhooks
 from .models import Integration, PosConnection, PosProvider
-from .models import Provider as ProviderModel
+from .providers import ProviderError, get_adapter
 from .services import build_oauth_url, exchange_code_for_token, fetch_account_info
+from .token_refresh import refresh_one
 
 router = Router(tags=["Integrations"])
 
@@ -31,7 +32,7 @@ class ProvidersResponse(Schema):
 
 @router.get("/providers", response=ProvidersResponse)
 def list_providers(request):
-    qs = ProviderModel.objects.all().order_by("code")
+    qs = catalog.providers()  # 메모리 스냅샷 (쿼리 없음)
     data = [
         ProviderOut(
             id=p.code,  # 명세서의 "id"는 DB의 code를 그대로 사용
@@ -63,10 +64,9 @@ def issue_oauth_url(request, payload: OAuthUrlIn):
     body: {provider, scopes, redirect_uri, prompt?}
     resp: {auth_url, state}
     """
-    # 1) provider 유효성(DB)
-    try:
-        provider = ProviderModel.objects.get(code=payload.provider)
-    except ProviderModel.DoesNotExist:
+    # 1) provider 유효성 (카탈로그 스냅샷)
+    provider = catalog.provider(payload.provider)
+    if provider is None:
         raise HttpError(400, f"Unknown provider: {payload.provider}")
 
     # 2) 스코프: 요청에 명시된 scopes를 우선, 없으면 DB 기본값
@@ -108,31 +108,33 @@ def oauth_callback(request, provider: str, code: str, state: str):
     """
     GET /api/v1/integrations/oauth/callback?provider=instagram&code=XXX&state=YYY
     - provider 유효성 확인
-    - code -> access_token 교환 (더미)
-    - access_token으로 계정 정보 조회 (더미)
+    - code -> access_token 교환
+    - access_token으로 계정 정보 조회
     - Integration upsert (있으면 갱신, 없으면 생성)
     - 명세서 응답 리턴
     """
-    # 1) provider 확인
-    try:
-        p = ProviderModel.objects.get(code=provider)
-    except ProviderModel.DoesNotExist:
+    # 1) provider 확인 (카탈로그 스냅샷)
+    p = catalog.provider(provider)
+    if p is None:
         raise HttpError(400, f"Unknown provider: {provider}")
 
     # 2) state 검증 (실서비스: CSRF 방지로 저장/검증 필요)
     if not state:
         raise HttpError(400, "state is required")
 
-    # 3) code -> token 교환 (더미)
-    token = exchange_code_for_token(provider, code)
-    access_token = token["access_token"]
+    # 3) code -> token 교환 / 4) 계정 정보 조회
+    #    (integrations.providers 어댑터, graph_base 미설정 시 더미)
+    try:
+        token = exchange_code_for_token(provider, code)
+        access_token = token["access_token"]
+        acct = fetch_account_info(provider, access_token)
+    except ProviderError as e:
+        # 무효한 code(프로바이더 400) 는 400, 프로바이더 장애(재시도 실패/서킷 열림)는 502
+        raise HttpError(400 if e.permanent or e.status == 400 else 502, str(e))
     refresh_token = token.get("refresh_token") or ""
     expires_at = token.get("expires_at")
     granted_scopes = token.get("granted_scopes", [])
 
-    # 4) 계정 정보 조회 (더미)
-    acct = fetch_account_info(provider, access_token)
-
     # 5) 연동 저장(업서트)
     User = get_user_model()
     # 인증 안 붙인 개발 단계이므로 우선 첫 사용자(or id=1)에 귀속
@@ -160,6 +162,20 @@ def oauth_callback(request, provider: str, code: str, state: str):
             # connected_at은 처음 생성 시 auto_now_add로, 갱신 시 유지
         },
     )
+    # 6) 광고 계정 찾기 (없거나 실패해도 연결은 유지, sync_ad_insights 가 다시 찾음)
+    adapter = get_adapter(p.code)
+    if (
+        p.code in ad_sync.AD_PROVIDERS
+        and adapter.enabled
+        and not ad_sync.ad_account_id(integ)
+    ):
+        try:
+            accounts = ad_sync.discover_ad_accounts(adapter, access_token)
+        except ProviderError:
+            accounts = []
+        if accounts:
+            ad_sync.remember_ad_account(integ, accounts[0])
+
     ts = integ.connected_at
     if timezone.is_naive(ts):
         ts = timezone.make_aware(ts, timezone=timezone.get_default_timezone())
@@ -230,20 +246,19 @@ def refresh_integration_token(request, integration_id: str):
         # 실제 서비스라면 provider refresh 엔드포인트 호출 실패 케이스 등을 매핑
         raise HttpError(400, "No refresh_token stored for this integration.")
 
-    # ---- 더미 갱신 로직 ----
-    # 실제 구현에서는 provider API 호출로 새 access_token / 만료시각을 받아와야 함
-    now = datetime.now()
-    new_expires = now + timedelta(days=60)  # 예시: 60일 연장
-    # (옵션) access_token 갱신 더미
-    integ.access_token = f"{integ.provider.code}_access_{int(now.timestamp())}"
-    integ.token_expires_at = new_expires
-    integ.save(update_fields=["access_token", "token_expires_at"])
+    # provider 토큰 엔드포인트 호출 (token_url 미설정 시 더미) — 선제 갱신 스케줄러와 같은 경로
+    outcome = refresh_one(integ)
+    if outcome == "failed":
+        raise HttpError(502, "Token refresh failed. Try again later.")
+    if outcome in ("busy", "conflict"):
+        # 선제 갱신 실행이 이미 같은 토큰으로 갱신 중이거나 그 사이 토큰이 바뀜
+        raise HttpError(409, "Token refresh already in progress. Try again later.")
 
     return TokenRefreshOut(
         integration_id=integ.public_id,
         status=integ.status,
         token=TokenInfoOut(expires_at=_to_iso_utc_z(integ.token_expires_at)),
-        message="Token refreshed.",
+        message="Token refreshed." if outcome == "refreshed" else "Token revoked.",
     )
 
 
@@ -261,7 +276,7 @@ class PosProvidersResponse(Schema):
 
 @router.get("/pos/providers", response=PosProvidersResponse)
 def list_pos_providers(request):
-    qs = PosProvider.objects.all().order_by("label")
+    qs = catalog.pos_providers()  # 메모리 스냅샷 (쿼리 없음)
     return {"providers": [{"id": p.code, "label": p.label, "auth": p.auth} for p in qs]}
 
 
@@ -311,9 +326,12 @@ _POS_BRANDS = {
 def _get_or_seed_pos_provider(code: str) -> PosProvider:
     if code not in _POS_BRANDS:
         raise HttpError(400, f"Unknown POS provider: {code}")
-    obj, _ = PosProvider.objects.get_or_create(
-        code=code, defaults={"label": _POS_BRANDS[code]}
-    )
+    obj = catalog.pos_provider(code)
+    if obj is None:
+        # 처음 한 번만 seed (생성 시그널이 카탈로그를 무효화)
+        obj, _ = PosProvider.objects.get_or_create(
+            code=code, defaults={"label": _POS_BRANDS[code]}
+        )
     return obj
 
 
@@ -352,6 +370,8 @@ def create_pos_connection(request, payload: PosConnectionIn):
         webhook_signing_secret=signing_secret,
         status="active",
     )
+    # 5) 과거 매출 백필 작업 등록 (backfill_pos_sales 가 실행)
+    pos_backfill.enqueue(conn)
 
     out = PosConnectionOut(
         connection_id=conn.public_id,
@@ -383,13 +403,13 @@ def get_pos_connection_health(request, connection_id: str):
     except PosConnection.DoesNotExist:
         raise HttpError(404, "POS connection not found")
 
-    conn.last_ping_at = timezone.now()
-    conn.save(update_fields=["last_ping_at"])
+    # last_ping_at 은 메모리 버퍼에 모았다가 주기적으로 한 번에 기록 (heartbeats)
+    heartbeats.record(conn.id, timezone.now())
 
     return PosHealthCheckOut(
         connection_id=conn.public_id,
         status=conn.status,
-        last_ping_at=_to_iso_utc_z(conn.last_ping_at),
+        last_ping_at=_to_iso_utc_z(heartbeats.last_ping(conn)),
         last_error=getattr(conn, "last_error", None),
     )
 
@@ -417,6 +437,7 @@ def disconnect_pos_connection(request, connection_id: str):
     conn.disconnected_at = timezone.now()
     conn.reason = "user_request"
     conn.save(update_fields=["status", "disconnected_at", "reason"])
+    pos_webhooks.forget(conn.public_id)
 
     return PosDisconnectOut(
         integration_id=conn.public_id,  # (스펙 유지: key 이름이 integration_id)
@@ -427,3 +448,24 @@ def disconnect_pos_connection(request, connection_id: str):
         disconnected_at=_to_iso_utc_z(conn.disconnected_at),
         reason=conn.reason,
     )
+
+
+# ---웹훅 수신
+class PosWebhookAck(Schema):
+    received: bool
+    event_id: str
+
+
+@router.post("/pos/webhooks/{connection_id}", response={202: PosWebhookAck})
+def receive_pos_webhook(request, connection_id: str):
+    """
+    POST /api/v1/integrations/pos/webhooks/{connection_id}
+    headers: X-Pos-Timestamp, X-Pos-Signature(sha256=...), X-Pos-Event-Id(선택)
+    - 서명 검증 후 staging(PosWebhookEvent)에 적재만 하고 바로 202
+    - 매출/DailyPerformance 반영은 process_pos_webhooks 배치
+    """
+    try:
+        event_id = pos_webhooks.receive(connection_id, request.META, request.body)
+    except pos_webhooks.WebhookRejected as e:
+        raise HttpError(e.status, str(e))
+    return 202, {"received": True, "event_id": event_id}
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class IntegrationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "integrations"
+
+    def ready(self):
+        # 프로바이더 카탈로그(메모리 스냅샷) 무효화 시그널 연결
+        from .signals import connect_catalog_signals
+
+        connect_catalog_signals()
@@ -0,0 +1,104 @@
+# integrations/catalog.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - Provider / PosProvider 목록(1년에 몇 번 바뀌는 데이터)을 프로세스 메모리에 올려두고
+#   연동 API 의 조회(목록, OAuth URL/콜백, POS 연결 생성)를 쿼리 0건으로 처리
+#
+# 방식:
+# - 처음 조회할 때 두 테이블을 한 번씩 읽어 스냅샷(code → 인스턴스) 생성
+# - 무효화 (integrations.signals)
+#   · 이 프로세스: Provider / PosProvider 저장·삭제 시그널 → 커밋 후 스냅샷 폐기
+#   · 다른 워커: 같은 시점에 Django cache 의 버전 키를 올림
+#     → VERSION_CHECK_SECONDS 마다 버전을 확인해 다르면 다시 읽음
+#     (기본 LocMemCache 는 워커끼리 공유되지 않으므로 PROVIDER_CATALOG_TTL 초가 상한)
+#
+# 주의: 돌려주는 모델 인스턴스는 여러 요청이 공유 → 읽기/FK 지정 용도로만 사용
+# -----------------------------------------------------------------------------
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import PosProvider, Provider
+
+VERSION_KEY = "integrations_catalog:version"
+# 공유 버전 키 확인 간격 (초) — 캐시가 DB/Redis 여도 요청마다 조회하지 않음
+VERSION_CHECK_SECONDS = 5
+
+
+class _Snapshot:
+    def __init__(self, version, providers: Dict, pos_providers: Dict):
+        now = time.monotonic()
+        self.version = version
+        self.expires = now + settings.PROVIDER_CATALOG_TTL
+        self.checked = now
+        self.providers: Dict[str, Provider] = providers
+        self.pos_providers: Dict[str, PosProvider] = pos_providers
+
+    def fresh(self) -> bool:
+        now = time.monotonic()
+        if now >= self.expires:
+            return False
+        if now - self.checked >= VERSION_CHECK_SECONDS:
+            if cache.get(VERSION_KEY, 0) != self.version:
+                return False
+            self.checked = now
+        return True
+
+
+_snapshot: Optional[_Snapshot] = None
+_lock = threading.Lock()
+
+
+def _load() -> _Snapshot:
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.fresh():
+        return snapshot
+    with _lock:
+        if _snapshot is not None and _snapshot is not snapshot and _snapshot.fresh():
+            return _snapshot  # 기다리는 동안 다른 스레드가 다시 읽음
+        version = cache.get(VERSION_KEY, 0)
+        _snapshot = _Snapshot(
+            version,
+            {p.code: p for p in Provider.objects.order_by("code")},
+            {p.code: p for p in PosProvider.objects.order_by("label")},
+        )
+        return _snapshot
+
+
+# ----------------------------
+# 조회
+# ----------------------------
+def providers() -> List[Provider]:
+    """계정 연동 프로바이더 (code 순)"""
+    return list(_load().providers.values())
+
+
+def provider(code: str) -> Optional[Provider]:
+    return _load().providers.get(code)
+
+
+def pos_providers() -> List[PosProvider]:
+    """POS 벤더 (label 순)"""
+    return list(_load().pos_providers.values())
+
+
+def pos_provider(code: str) -> Optional[PosProvider]:
+    return _load().pos_providers.get(code)
+
+
+# ----------------------------
+# 무효화
+# ----------------------------
+def invalidate() -> None:
+    """이 프로세스 스냅샷 폐기 + 공유 버전 올림 (다른 워커는 다음 조회에서 다시 읽음)"""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:  # 키 없음
+        cache.set(VERSION_KEY, 1, None)
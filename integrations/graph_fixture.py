@@ -0,0 +1,134 @@
+# integrations/graph_fixture.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 녹화해 둔 Graph API insights 응답(JSON 파일)으로 동작하는 가짜 Graph API
+#   → 앱 키/네트워크 없이 sync_ad_insights 검증
+#
+# 방식:
+# - requests 전송 어댑터(BaseAdapter)를 providers 어댑터의 세션에 mount
+#   → 재시도/브레이커/batch 조립 등 실제 코드 경로는 그대로 타고 HTTP 만 대체
+# - GET /me/adaccounts: 녹화된 광고 계정 전부 (account_status=1)
+# - POST / (batch): 각 항목의 relative_url 을 해석해
+#   {account}/insights?time_range=...&limit=...&after=... 를 녹화 행에서 잘라 응답
+#   (Graph 와 같은 {"data", "paging": {"cursors", "next"}} 형식, after = base64 오프셋)
+# - access_token 이 "expired" 로 시작하면 OAuthException(code 190)
+# - 녹화에 없는 광고 계정이면 code 100 오류
+#
+# 파일 형식 (integrations/testdata/graph_ad_insights.json):
+#   {"accounts": {"act_1001": [{"campaign_id", "campaign_name", "date_start",
+#                               "date_stop", "spend", "clicks", "impressions"}, ...]}}
+# -----------------------------------------------------------------------------
+import base64
+import json
+from typing import Dict, List
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from .providers import get_adapter
+
+FIXTURE_BASE = "https://graph.fixture.local/v20.0"
+
+
+def _error(code: int, message: str, kind: str = "GraphMethodException") -> Dict:
+    return {
+        "code": 400,
+        "body": json.dumps({"error": {"message": message, "type": kind, "code": code}}),
+    }
+
+
+class FixtureTransport(BaseAdapter):
+    def __init__(self, path: str):
+        super().__init__()
+        with open(path, encoding="utf-8") as f:
+            self.accounts: Dict[str, List[Dict]] = json.load(f)["accounts"]
+        self.calls = 0  # batch 호출 수
+        self.items = 0  # batch 안의 요청 수
+
+    def send(self, request, **kwargs):
+        resp = Response()
+        resp.request = request
+        resp.url = request.url
+        resp.headers["Content-Type"] = "application/json"
+        body = request.body or ""
+        if isinstance(body, bytes):
+            body = body.decode()
+        form = {k: v[-1] for k, v in parse_qs(body).items()}
+        if request.method == "GET" and urlsplit(request.url).path.endswith(
+            "/me/adaccounts"
+        ):
+            resp.status_code = 200
+            resp._content = json.dumps(
+                {"data": [{"id": a, "account_status": 1} for a in self.accounts]}
+            ).encode()
+            return resp
+        if request.method != "POST" or "batch" not in form:
+            resp.status_code = 400
+            resp._content = json.dumps(
+                {
+                    "error": {
+                        "message": "fixture serves adaccounts/batch only",
+                        "type": "Fixture",
+                    }
+                }
+            ).encode()
+            return resp
+
+        self.calls += 1
+        token = form.get("access_token", "")
+        out = []
+        for item in json.loads(form["batch"]):
+            self.items += 1
+            if token.startswith("expired"):
+                out.append(
+                    _error(190, "Error validating access token", "OAuthException")
+                )
+            else:
+                out.append(self._insights(item.get("relative_url", "")))
+        resp.status_code = 200
+        resp._content = json.dumps(out).encode()
+        return resp
+
+    def _insights(self, relative_url: str) -> Dict:
+        parts = urlsplit(relative_url)
+        account, _, edge = parts.path.strip("/").partition("/")
+        if edge != "insights" or account not in self.accounts:
+            return _error(100, f"Unsupported get request. Object '{account}'")
+        qs = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        window = json.loads(qs.get("time_range") or "{}")
+        since, until = window.get("since", ""), window.get("until", "9999-12-31")
+        rows = [r for r in self.accounts[account] if since <= r["date_start"] <= until]
+        offset = int(base64.b64decode(qs["after"]).decode()) if qs.get("after") else 0
+        limit = int(qs.get("limit") or 25)
+        page = rows[offset : offset + limit]
+        body = {"data": page}
+        end = offset + len(page)
+        if page:
+            after = base64.b64encode(str(end).encode()).decode()
+            body["paging"] = {
+                "cursors": {
+                    "before": base64.b64encode(str(offset).encode()).decode(),
+                    "after": after,
+                }
+            }
+            if end < len(rows):
+                query = urlencode({**qs, "after": after})
+                body["paging"][
+                    "next"
+                ] = f"{FIXTURE_BASE}/{parts.path.strip('/')}?{query}"
+        return {"code": 200, "body": json.dumps(body)}
+
+    def close(self):
+        pass
+
+
+def install(path: str, providers=("facebook", "instagram")) -> FixtureTransport:
+    """providers 어댑터 세션에 가짜 Graph 를 mount (graph_base 가 없으면 가짜 주소로)"""
+    transport = FixtureTransport(path)
+    for code in providers:
+        adapter = get_adapter(code)
+        if not adapter.graph_base:
+            adapter.graph_base = FIXTURE_BASE
+        adapter.session.mount(adapter.graph_base, transport)
+    return transport
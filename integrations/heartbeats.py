@@ -0,0 +1,130 @@
+# integrations/heartbeats.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - POS 헬스체크(GET .../health) 마다 last_ping_at UPDATE 하던 것을 모아서 기록
+#
+# 흐름:
+# - record(): 프로세스 메모리 버퍼 {연결 id: 최신 시각} 갱신 + cache 에도 기록
+#   (공유 캐시를 쓰면 다른 워커의 조회도 최신 값을 봄)
+# - 백그라운드 스레드가 POS_HEARTBEAT_FLUSH_SECONDS 마다 버퍼를 비우며
+#   CASE WHEN 한 번의 UPDATE 로 기록 (청크 단위), 프로세스 종료 시에도 flush
+#   → 연결 N개를 초당 여러 번 폴링해도 DB 쓰기는 주기당 청크 수만큼
+# - write(): 시각이 뒤로 가지 않도록 "NULL 이거나 더 오래된 행만" 갱신
+#   (웹훅 배치 process_pos_webhooks 도 같은 함수 사용)
+# - last_ping(): DB 값 / 버퍼 / 캐시 중 가장 최신 값
+# -----------------------------------------------------------------------------
+import atexit
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from django import db
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, Q, Value, When
+
+from .models import PosConnection
+
+KEY_PREFIX = "pos_heartbeat:v1:"
+CHUNK = 500
+
+_buffer: Dict[int, datetime] = {}
+_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+
+def cache_key(conn_id: int) -> str:
+    return f"{KEY_PREFIX}{conn_id}"
+
+
+# ----------------------------
+# 기록
+# ----------------------------
+def write(seen: Dict[int, datetime]) -> int:
+    """{연결 id: 시각} 을 last_ping_at 에 반영 (더 최신일 때만), 갱신 행 수 반환"""
+    updated = 0
+    items = sorted(seen.items())
+    for start in range(0, len(items), CHUNK):
+        chunk = items[start : start + CHUNK]
+        whens = [
+            When(
+                Q(id=conn_id)
+                & (Q(last_ping_at__isnull=True) | Q(last_ping_at__lt=when)),
+                then=Value(when),
+            )
+            for conn_id, when in chunk
+        ]
+        updated += PosConnection.objects.filter(id__in=[c for c, _ in chunk]).update(
+            last_ping_at=Case(*whens, default=F("last_ping_at"))
+        )
+    return updated
+
+
+def record(conn_id: int, when: datetime) -> None:
+    with _lock:
+        if conn_id not in _buffer or _buffer[conn_id] < when:
+            _buffer[conn_id] = when
+    cache.set(cache_key(conn_id), when, settings.POS_HEARTBEAT_CACHE_TTL)
+    _ensure_flusher()
+
+
+def flush() -> int:
+    """이 프로세스 버퍼를 DB 에 기록 (실패하면 버퍼에 되돌림)"""
+    global _buffer
+    with _lock:
+        pending, _buffer = _buffer, {}
+    if not pending:
+        return 0
+    try:
+        return write(pending)
+    except Exception:
+        with _lock:
+            for conn_id, when in pending.items():
+                if conn_id not in _buffer or _buffer[conn_id] < when:
+                    _buffer[conn_id] = when
+        raise
+
+
+def _run() -> None:
+    stop = threading.Event()
+    while not stop.wait(settings.POS_HEARTBEAT_FLUSH_SECONDS):
+        try:
+            flush()
+        except Exception:
+            pass  # 다음 주기에 재시도
+        finally:
+            db.connection.close()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(
+                target=_run, name="pos-heartbeat-flusher", daemon=True
+            )
+            _flusher.start()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    try:
+        flush()
+    except Exception:
+        pass
+
+
+# ----------------------------
+# 조회
+# ----------------------------
+def last_ping(conn: PosConnection) -> Optional[datetime]:
+    """DB 값 / 이 프로세스 버퍼 / 캐시 중 가장 최신 시각"""
+    candidates = [
+        conn.last_ping_at,
+        _buffer.get(conn.id),
+        cache.get(cache_key(conn.id)),
+    ]
+    candidates = [c for c in candidates if c is not None]
+    return max(candidates) if candidates else None
@@ -0,0 +1,149 @@
+# integrations/idempotency.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - POS/광고 플랫폼의 재전송(같은 이벤트를 여러 번 보냄)을 한 번만 반영
+#   → 매출/DailyPerformance 이중 집계 방지
+#
+# 구성:
+# - IdempotencyKey 테이블: (blake2b-128 해시 키, 만료 시각) 만 저장하는 작은 표
+#   · claim_many(): 키 묶음을 INSERT ... ON CONFLICT 한 문장으로 선점
+#     (만료된 키는 다시 선점 가능, RETURNING 으로 "이번에 처음 본 키" 만 돌려받음)
+#     → 반영 트랜잭션 안에서 호출하면 롤백 시 선점도 같이 취소 (정확히 한 번)
+# - 프로세스 메모리 앞단 캐시 (LRU, 해시 조회 O(1))
+#   · seen(): DB 를 보지 않는 사전 확인 — 수신 단계에서 이미 본 키를 바로 걸러냄
+#   · remember() / claim_many() 가 채움 (워커마다 따로, 권위 있는 판단은 DB)
+# - sweep(): 만료된 키를 SWEEP_BATCH 행씩 삭제 (purge_idempotency_keys)
+#
+# 범위(scope): 키 공간 구분 (예: "pos_webhook" + "{연결 id}:{event_id}")
+# -----------------------------------------------------------------------------
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+CHUNK = 400  # 행당 파라미터 2개 → SQLite 변수 한도(999) 안쪽
+
+
+def digest(scope: str, key: str) -> str:
+    return hashlib.blake2b(f"{scope}\0{key}".encode(), digest_size=16).hexdigest()
+
+
+def _ttl(ttl: Optional[int]) -> int:
+    return settings.IDEMPOTENCY["ttl_seconds"] if ttl is None else ttl
+
+
+# ----------------------------
+# 메모리 앞단 캐시
+# ----------------------------
+class _Front:
+    """{해시 키: 만료 epoch 초} LRU (스레드 안전)"""
+
+    def __init__(self):
+        self._items: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            expires = self._items.get(key)
+            if expires is None:
+                return False
+            if expires <= time.time():
+                del self._items[key]
+                return False
+            self._items.move_to_end(key)
+            return True
+
+    def add(self, keys: Iterable[str], expires: float) -> None:
+        limit = max(0, settings.IDEMPOTENCY["memory_size"])
+        with self._lock:
+            for key in keys:
+                self._items[key] = expires
+                self._items.move_to_end(key)
+            while len(self._items) > limit:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_front = _Front()
+
+
+def seen(scope: str, key: str) -> bool:
+    """이 프로세스가 이미 본 키인지 (DB 조회 없음, False 라도 중복일 수 있음)"""
+    return _front.contains(digest(scope, key))
+
+
+def remember(scope: str, key: str, ttl: Optional[int] = None) -> None:
+    _front.add([digest(scope, key)], time.time() + _ttl(ttl))
+
+
+# ----------------------------
+# 선점 (DB)
+# ----------------------------
+def claim_many(scope: str, keys: Iterable[str], ttl: Optional[int] = None) -> Set[str]:
+    """
+    keys 중 이번에 처음 선점한 키 집합 반환 (이미 있고 만료 전이면 제외)
+    - 반영과 같은 트랜잭션 안에서 호출할 것
+    """
+    by_digest: Dict[str, str] = {}
+    for key in keys:
+        by_digest.setdefault(digest(scope, key), key)
+    if not by_digest:
+        return set()
+
+    now = timezone.now()
+    expires = now + timedelta(seconds=_ttl(ttl))
+    adapt = connection.ops.adapt_datetimefield_value
+    table = connection.ops.quote_name(IdempotencyKey._meta.db_table)
+    col = connection.ops.quote_name("key")
+    claimed: Set[str] = set()
+    items = list(by_digest)
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), CHUNK):
+            chunk = items[start : start + CHUNK]
+            params = []
+            for key in chunk:
+                params += [key, adapt(expires)]
+            cursor.execute(
+                f"INSERT INTO {table} ({col}, expires_at) VALUES "
+                + ", ".join(["(%s, %s)"] * len(chunk))
+                + f" ON CONFLICT ({col}) DO UPDATE SET expires_at = excluded.expires_at"
+                f" WHERE {table}.expires_at <= %s RETURNING {col}",
+                params + [adapt(now)],
+            )
+            claimed.update(row[0] for row in cursor.fetchall())
+    _front.add(by_digest, expires.timestamp())
+    return {by_digest[d] for d in claimed}
+
+
+def sweep(batch_size: Optional[int] = None, max_batches: int = 0) -> int:
+    """만료된 키를 batch_size 행씩 삭제 (짧은 트랜잭션 여러 번), 삭제 수 반환"""
+    batch_size = max(1, batch_size or settings.IDEMPOTENCY["sweep_batch"])
+    now = timezone.now()
+    deleted = batches = 0
+    while not max_batches or batches < max_batches:
+        keys = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now).values_list(
+                "key", flat=True
+            )[:batch_size]
+        )
+        if not keys:
+            break
+        count, _ = IdempotencyKey.objects.filter(
+            key__in=keys, expires_at__lte=now
+        ).delete()
+        deleted += count
+        batches += 1
+        if len(keys) < batch_size:
+            break
+    return deleted
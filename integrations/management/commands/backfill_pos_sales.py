@@ -0,0 +1,130 @@
+# integrations/management/commands/backfill_pos_sales.py
+# ------------------------------------------------------------
+# 목적:
+# - POS 연결별 과거 매출을 벤더 매출 API 에서 페이지 단위로 가져와
+#   PosDailySales 에 반영합니다. (integrations.pos_backfill)
+#
+# 특징:
+# - 연결마다 커서 체크포인트(PosBackfill) → 중단돼도 다시 실행하면 이어서 진행
+# - 여러 연결을 워커 스레드(--workers)로 병렬 실행, 벤더별 초당 요청 수 제한(--rate)
+# - 묶음(--batch-size 건)마다 일매출 반영 + 커서 저장을 한 트랜잭션으로
+# - --enqueue-missing: 작업이 없는 기존 활성 연결도 등록
+#
+# 사용 예:
+#   poetry run python manage.py backfill_pos_sales
+#   poetry run python manage.py backfill_pos_sales --enqueue-missing --days 365
+#   poetry run python manage.py backfill_pos_sales --connection pos_9a1b2c3d --retry-failed
+# ------------------------------------------------------------
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from integrations import pos_backfill
+from integrations.models import PosBackfill
+
+
+class Command(BaseCommand):
+    help = "Backfill historical POS sales per connection (resumable)."
+
+    def add_arguments(self, parser):
+        conf = settings.POS_BACKFILL
+        parser.add_argument(
+            "--connection",
+            action="append",
+            default=None,
+            help="특정 연결만 (public_id, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=conf["workers"],
+            help="동시에 백필할 연결 수",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=conf["page_size"],
+            help="매출 API 한 페이지 크기",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=conf["batch_size"],
+            help="이만큼 쌓일 때마다 반영 + 커서 저장",
+        )
+        parser.add_argument(
+            "--enqueue-missing",
+            action="store_true",
+            help="백필 작업이 없는 활성 연결을 먼저 등록합니다.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=conf["days"],
+            help=f"새로 등록하는 작업의 기간(일) (기본 {conf['days']})",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="실패(failed) 작업도 마지막 커서부터 다시 실행합니다.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="실행하지 않고 상태별 작업 수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["enqueue_missing"] and not opts["dry_run"]:
+            added = pos_backfill.enqueue_missing(days=max(1, opts["days"]))
+            self.stdout.write(f"작업 등록: {added}")
+
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+            self.stdout.write(self.style.SUCCESS("=== backfill_pos_sales 결과 ==="))
+            for status, _ in PosBackfill.STATUS_CHOICES:
+                n = PosBackfill.objects.filter(status=status).count()
+                self.stdout.write(f"{status}: {n}")
+            self.stdout.write(self.style.SUCCESS("완료."))
+            return
+
+        started = time.perf_counter()
+        verbose = opts["verbosity"] >= 2
+
+        def progress(job_id, outcome, stats):
+            finished = stats["done"] + stats["failed"] + stats["skipped"]
+            if verbose or outcome["status"] == "failed":
+                self.stdout.write(
+                    f"progress: {finished}/{stats['jobs']} job={job_id} "
+                    f"{outcome['status']} records={outcome.get('records', 0)}"
+                )
+
+        stats = pos_backfill.run(
+            connections=opts["connection"],
+            workers=opts["workers"],
+            page_size=opts["page_size"],
+            batch_size=opts["batch_size"],
+            retry_failed=opts["retry_failed"],
+            on_job=progress,
+        )
+        elapsed = time.perf_counter() - started
+        rate = stats["records"] / elapsed if elapsed else 0
+
+        self.stdout.write(self.style.SUCCESS("=== backfill_pos_sales 결과 ==="))
+        self.stdout.write(f"작업: {stats['jobs']} ({elapsed:.1f}s)")
+        self.stdout.write(f"완료: {stats['done']}")
+        self.stdout.write(f"실패(다음 실행에서 이어서): {stats['failed']}")
+        self.stdout.write(f"건너뜀(매출 API 미설정): {stats['skipped']}")
+        self.stdout.write(f"다른 워커 실행 중: {stats['busy']}")
+        self.stdout.write(f"임대 만료(다른 워커가 이어받음): {stats['lost']}")
+        self.stdout.write(
+            f"레코드: {stats['records']} (페이지 {stats['pages']}, "
+            f"형식 오류 {stats['invalid']}, {rate:,.0f} records/s)"
+        )
+        for code, m in pos_backfill.metrics().items():
+            self.stdout.write(
+                f"  · {code} HTTP: {m['count']}건 (오류 {m['errors']}) "
+                f"p50 {m['p50_ms']}ms / p95 {m['p95_ms']}ms [breaker={m['breaker']}]"
+            )
+        self.stdout.write(self.style.SUCCESS("완료."))
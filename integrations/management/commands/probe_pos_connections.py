@@ -0,0 +1,114 @@
+# integrations/management/commands/probe_pos_connections.py
+# ------------------------------------------------------------
+# 목적:
+# - 활성 POS 연결 전체를 벤더 헬스 API 로 동시에 점검하고
+#   last_ping_at / last_error 를 한 번에 기록합니다. (integrations.pos_probe)
+#
+# 특징:
+# - asyncio 로 동시에 요청, 전체 동시 요청 수(--concurrency) + 벤더별 제한(--per-provider)
+# - 요청마다 타임아웃(--timeout), 실패한 매장 목록 출력(--show)
+# - --loop 초 를 주면 워커처럼 주기적으로 반복 실행
+#
+# 사용 예:
+#   poetry run python manage.py probe_pos_connections
+#   poetry run python manage.py probe_pos_connections --provider brand_a --timeout 2
+#   poetry run python manage.py probe_pos_connections --loop 300
+# ------------------------------------------------------------
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from integrations import pos_probe
+
+
+class Command(BaseCommand):
+    help = "Probe every active POS connection concurrently and record health."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--provider",
+            action="append",
+            default=None,
+            help="특정 POS 벤더만 (code, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.POS_PROBE["concurrency"],
+            help="전체 동시 요청 수",
+        )
+        parser.add_argument(
+            "--per-provider",
+            type=int,
+            default=settings.POS_PROBE["per_provider"],
+            help="벤더별 동시 요청 수",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=settings.POS_PROBE["timeout"],
+            help="요청 하나의 제한 시간(초)",
+        )
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="출력할 실패 매장 수 (기본 20, 0 이면 전부)",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            help="0보다 크면 이 간격(초)으로 계속 반복 실행",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="요청하지 않고 점검 대상 수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+        while True:
+            self._run_once(opts)
+            if opts["loop"] <= 0:
+                break
+            time.sleep(opts["loop"])
+
+    def _run_once(self, opts):
+        stats = pos_probe.probe(
+            providers=opts["provider"],
+            concurrency=opts["concurrency"],
+            per_provider=opts["per_provider"],
+            timeout=opts["timeout"],
+            dry_run=opts["dry_run"],
+        )
+
+        self.stdout.write(self.style.SUCCESS("=== probe_pos_connections 결과 ==="))
+        self.stdout.write(f"대상: {stats['total']} ({stats['elapsed']:.1f}s)")
+        self.stdout.write(f"건너뜀(헬스 API 미설정): {stats['skipped']}")
+        if not opts["dry_run"]:
+            self.stdout.write(f"정상: {stats['ok']}")
+            self.stdout.write(f"실패: {stats['failed']}")
+            self.stdout.write(
+                f"건너뜀(속도 제한, 다음 실행에서 점검): {stats['rate_limited']}"
+            )
+            for code, by in sorted(stats["by_provider"].items()):
+                self.stdout.write(
+                    f"  - {code}: 정상 {by['ok']} / 실패 {by['failed']} / "
+                    f"속도 제한 {by['rate_limited']}"
+                )
+            self.stdout.write(
+                f"응답 시간: p50 {stats['p50_ms']}ms / p95 {stats['p95_ms']}ms"
+            )
+            failures = stats["failures"]
+            shown = failures if opts["show"] <= 0 else failures[: opts["show"]]
+            if shown:
+                self.stdout.write(self.style.WARNING("실패 매장:"))
+            for public_id, code, store, error in shown:
+                self.stdout.write(f"  · {public_id} [{code}] {store}: {error}")
+            if len(shown) < len(failures):
+                self.stdout.write(f"  … 외 {len(failures) - len(shown)}건")
+        self.stdout.write(self.style.SUCCESS("완료."))
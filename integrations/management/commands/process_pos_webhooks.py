@@ -0,0 +1,122 @@
+# integrations/management/commands/process_pos_webhooks.py
+# ------------------------------------------------------------
+# 목적:
+# - 수신해 둔 POS 웹훅(PosWebhookEvent, staging)을 묶음 단위로
+#   매장×일 매출(PosDailySales)과 캠페인 DailyPerformance.sales 에 반영합니다.
+#   (integrations.pos_webhooks)
+#
+# 특징:
+# - 묶음(--batch-size)마다 한 트랜잭션, 미처리 행이 없을 때까지 반복
+# - 미처리 행은 SKIP LOCKED 로 집기 때문에 여러 프로세스를 동시에 띄워도 됨
+# - --loop 초 를 주면 워커처럼 주기적으로 반복 실행
+# - --purge-days 로 반영이 끝난 오래된 staging 행 정리
+#
+# 사용 예:
+#   poetry run python manage.py process_pos_webhooks
+#   poetry run python manage.py process_pos_webhooks --batch-size 5000 --loop 5
+#   poetry run python manage.py process_pos_webhooks --purge-days 7
+# ------------------------------------------------------------
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from integrations import pos_webhooks
+from integrations.models import PosWebhookEvent
+
+
+class Command(BaseCommand):
+    help = "Fold staged POS webhook events into daily sales and DailyPerformance."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="한 트랜잭션에서 반영할 이벤트 수 (기본 2000)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=0,
+            help="한 번 실행에서 처리할 최대 묶음 수 (0 = 미처리 행이 없을 때까지)",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            help="0보다 크면 이 간격(초)으로 계속 반복 실행",
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=0,
+            help="0보다 크면 반영이 끝난 지 N일 지난 staging 행을 삭제",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="반영하지 않고 미처리 이벤트 수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+            pending = PosWebhookEvent.objects.filter(processed_at__isnull=True).count()
+            self.stdout.write(f"미처리 이벤트: {pending}")
+            self.stdout.write(self.style.SUCCESS("완료."))
+            return
+        while True:
+            self._run_once(opts)
+            if opts["loop"] <= 0:
+                break
+            time.sleep(opts["loop"])
+
+    def _run_once(self, opts):
+        started = time.perf_counter()
+        batch_size = max(1, opts["batch_size"])
+        totals = {
+            "batches": 0,
+            "events": 0,
+            "applied": 0,
+            "invalid": 0,
+            "duplicates": 0,
+            "sales_rows": 0,
+            "performance_rows": 0,
+        }
+        while not opts["max_batches"] or totals["batches"] < opts["max_batches"]:
+            stats = pos_webhooks.process_pending(batch_size)
+            if not stats["events"]:
+                break
+            totals["batches"] += 1
+            for key, n in stats.items():
+                totals[key] += n
+            if opts["verbosity"] >= 2:
+                self.stdout.write(
+                    f"progress: batch={totals['batches']} events={totals['events']}"
+                )
+            if stats["events"] < batch_size:
+                break
+
+        purged = 0
+        if opts["purge_days"] > 0:
+            purged = pos_webhooks.purge_processed(
+                timezone.now() - timedelta(days=opts["purge_days"])
+            )
+        elapsed = time.perf_counter() - started
+        rate = totals["events"] / elapsed if elapsed else 0
+
+        self.stdout.write(self.style.SUCCESS("=== process_pos_webhooks 결과 ==="))
+        self.stdout.write(
+            f"이벤트: {totals['events']} (묶음 {totals['batches']}, "
+            f"{elapsed:.1f}s, {rate:,.0f} events/s)"
+        )
+        self.stdout.write(f"반영: {totals['applied']}")
+        self.stdout.write(f"형식 오류: {totals['invalid']}")
+        self.stdout.write(f"중복(재전송, 건너뜀): {totals['duplicates']}")
+        self.stdout.write(f"매장 일매출 행: {totals['sales_rows']}")
+        self.stdout.write(f"DailyPerformance 행: {totals['performance_rows']}")
+        if opts["purge_days"] > 0:
+            self.stdout.write(f"정리(staging 삭제): {purged}")
+        self.stdout.write(self.style.SUCCESS("완료."))
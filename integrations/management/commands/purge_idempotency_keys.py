@@ -0,0 +1,74 @@
+# integrations/management/commands/purge_idempotency_keys.py
+# ------------------------------------------------------------
+# 목적:
+# - 만료된 재전송 중복 제거 키(IdempotencyKey)를 묶음 단위로 삭제합니다.
+#   (integrations.idempotency.sweep)
+#
+# 특징:
+# - --batch-size 행씩 짧은 트랜잭션으로 삭제 → 큰 DELETE 한 번으로 테이블을 오래 잠그지 않음
+# - --loop 초 를 주면 워커처럼 주기적으로 반복 실행
+#
+# 사용 예:
+#   poetry run python manage.py purge_idempotency_keys
+#   poetry run python manage.py purge_idempotency_keys --batch-size 10000 --loop 3600
+# ------------------------------------------------------------
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from integrations import idempotency
+from integrations.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency keys in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IDEMPOTENCY["sweep_batch"],
+            help="한 번에 삭제할 행 수 (기본 IDEMPOTENCY_SWEEP_BATCH)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=0,
+            help="한 번 실행에서 삭제할 최대 묶음 수 (0 = 만료 키가 없을 때까지)",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            help="0보다 크면 이 간격(초)으로 계속 반복 실행",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="삭제하지 않고 만료/전체 키 수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+            expired = IdempotencyKey.objects.filter(
+                expires_at__lte=timezone.now()
+            ).count()
+            self.stdout.write(
+                f"만료 키: {expired} / 전체 {IdempotencyKey.objects.count()}"
+            )
+            self.stdout.write(self.style.SUCCESS("완료."))
+            return
+        while True:
+            started = time.perf_counter()
+            deleted = idempotency.sweep(opts["batch_size"], opts["max_batches"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS("=== purge_idempotency_keys 결과 ==="))
+            self.stdout.write(f"삭제: {deleted} ({elapsed:.1f}s)")
+            self.stdout.write(f"남은 키: {IdempotencyKey.objects.count()}")
+            self.stdout.write(self.style.SUCCESS("완료."))
+            if opts["loop"] <= 0:
+                break
+            time.sleep(opts["loop"])
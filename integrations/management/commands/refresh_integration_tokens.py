@@ -0,0 +1,120 @@
+# integrations/management/commands/refresh_integration_tokens.py
+# ------------------------------------------------------------
+# 목적:
+# - 만료가 가까운 연동(Integration) 토큰을 사용자 요청 전에 미리 갱신합니다.
+#   (integrations.token_refresh)
+#
+# 특징:
+# - (status, token_expires_at) 인덱스로 만료 임박 연동만 스캔
+# - 프로바이더별 동시 요청 수 제한(--per-provider), 전체 워커 수(--workers)
+# - 묶음(--batch-size)마다 선점(임대) 후 갱신 → 여러 실행이 동시에 돌아도 같은 연동은 한 번만
+# - --loop 초 를 주면 워커처럼 주기적으로 반복 실행
+#
+# 사용 예:
+#   poetry run python manage.py refresh_integration_tokens
+#   poetry run python manage.py refresh_integration_tokens --window-minutes 60 --dry-run
+#   poetry run python manage.py refresh_integration_tokens --loop 300
+# ------------------------------------------------------------
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from integrations import providers, token_refresh
+
+
+class Command(BaseCommand):
+    help = "Refresh integration tokens that expire within a time window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window-minutes",
+            type=int,
+            default=settings.TOKEN_REFRESH_WINDOW_MINUTES,
+            help="지금부터 이 시간(분) 안에 만료되는 토큰을 갱신",
+        )
+        parser.add_argument(
+            "--per-provider",
+            type=int,
+            default=settings.TOKEN_REFRESH_PER_PROVIDER,
+            help="프로바이더별 동시 갱신 요청 수",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.TOKEN_REFRESH_MAX_WORKERS,
+            help="전체 동시 요청 스레드 수",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="한 번에 불러와 갱신/저장할 연동 수 (기본 200)",
+        )
+        parser.add_argument(
+            "--provider",
+            action="append",
+            default=None,
+            help="특정 프로바이더만 (code, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            help="0보다 크면 이 간격(초)으로 계속 반복 실행",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="갱신하지 않고 대상 건수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+        while True:
+            self._run_once(opts)
+            if opts["loop"] <= 0:
+                break
+            time.sleep(opts["loop"])
+
+    def _run_once(self, opts):
+        started = time.perf_counter()
+
+        def progress(stats):
+            done = stats["refreshed"] + stats["failed"] + stats["revoked"]
+            self.stdout.write(f"progress: {done}/{stats['due']}")
+
+        stats = token_refresh.refresh_due(
+            window=timedelta(minutes=max(0, opts["window_minutes"])),
+            per_provider=opts["per_provider"],
+            max_workers=opts["workers"],
+            batch_size=max(1, opts["batch_size"]),
+            providers=opts["provider"],
+            dry_run=opts["dry_run"],
+            on_batch=progress,
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS("=== refresh_integration_tokens 결과 ==="))
+        self.stdout.write(
+            f"대상: {stats['due']} (만료 {opts['window_minutes']}분 이내, {elapsed:.1f}s)"
+        )
+        for code, by in sorted(stats["by_provider"].items()):
+            self.stdout.write(
+                f"  - {code}: 대상 {by['due']} / 갱신 {by['refreshed']} / "
+                f"실패 {by['failed']} / 해지 {by['revoked']}"
+            )
+        self.stdout.write(f"갱신: {stats['refreshed']}")
+        self.stdout.write(f"실패(다음 실행에서 재시도): {stats['failed']}")
+        self.stdout.write(f"해지(refresh_token 무효): {stats['revoked']}")
+        self.stdout.write(f"건너뜀(다른 실행이 갱신 중): {stats['busy']}")
+        self.stdout.write(f"충돌(그 사이 토큰 변경, 기록 안 함): {stats['conflict']}")
+        for code, m in providers.metrics().items():
+            self.stdout.write(
+                f"  · {code} HTTP: {m['count']}건 (오류 {m['errors']}) "
+                f"p50 {m['p50_ms']}ms / p95 {m['p95_ms']}ms / 최대 {m['max_ms']}ms "
+                f"[breaker={m['breaker']}]"
+            )
+        self.stdout.write(self.style.SUCCESS("완료."))
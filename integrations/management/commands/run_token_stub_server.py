@@ -0,0 +1,298 @@
+# integrations/management/commands/run_token_stub_server.py
+# ------------------------------------------------------------
+# 목적:
+# - 프로바이더(Graph API 형태) OAuth/계정 엔드포인트를 흉내내는 로컬 가짜 서버
+# - refresh_integration_tokens / OAuth 콜백 / providers 어댑터를
+#   실제 앱 키 없이, 대량 요청으로 검증할 때 사용
+#
+# 응답 규칙(결정적):
+# - POST /token, /oauth/token (grant_type=refresh_token)
+#   · refresh_token 이 "revoked" 로 시작 → 400 {"error": "invalid_grant"}
+#   · refresh_token 이 "flaky" 로 시작   → 503 (일시 실패)
+#   · 그 외 → 200 {"access_token", "refresh_token", "expires_in"}
+# - GET /oauth/access_token?code=... → code 가 "bad" 로 시작하면 400 OAuthException
+# - GET /oauth/access_token?grant_type=fb_exchange_token&fb_exchange_token=...
+#   GET /refresh_access_token?grant_type=ig_refresh_token&access_token=...
+#   (Facebook / Instagram 장기 토큰 갱신, 토큰 접두어 규칙은 POST /token 과 같음)
+#   · "revoked" → 400 OAuthException code 190, "flaky" → 503, 그 외 → 200 새 토큰
+# - GET /me?access_token=...&fields=... → 계정 정보 (token 으로 결정되는 id)
+# - GET /stores/{store}/health (POS 벤더 헬스 API, probe_pos_connections)
+#   · Authorization 헤더 없음 → 401
+#   · store 가 "down" 으로 시작 → 503, "degraded" 로 시작 → 200 {"status": "degraded"}
+#   · 그 외 → 200 {"status": "ok"}
+# - GET /stores/{store}/sales?since&until&limit&cursor (POS 매출 API, backfill_pos_sales)
+#   · since~until 사이에 매장마다 하루 --sales-per-day 건 (결정적, 10건 중 1건은 환불)
+#   · cursor = 다음 오프셋, 마지막 페이지면 next_cursor=null
+# - --down: 모든 요청에 503 (서킷 브레이커 검증), --fail-rate: 무작위 503 비율
+# - 동시에 처리 중인 요청 수의 최대값을 /stats 로 확인 (동시성 제한 검증용)
+#
+# 사용 예:
+#   poetry run python manage.py run_token_stub_server --port 8766 --latency-ms 50
+#   FB_GRAPH_BASE=http://127.0.0.1:8766 IG_GRAPH_BASE=http://127.0.0.1:8766 \
+#   poetry run python manage.py refresh_integration_tokens
+# ------------------------------------------------------------
+import json
+import random
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Run a local fake provider (OAuth token / Graph account / POS health)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8766)
+        parser.add_argument(
+            "--latency-ms", type=int, default=0, help="응답마다 인위적 지연(ms)."
+        )
+        parser.add_argument(
+            "--expires-in", type=int, default=60 * 60 * 24 * 60, help="토큰 수명(초)."
+        )
+        parser.add_argument(
+            "--fail-rate", type=float, default=0.0, help="무작위 503 응답 비율(0~1)."
+        )
+        parser.add_argument(
+            "--down", action="store_true", help="모든 요청에 503 (장애 흉내)."
+        )
+        parser.add_argument(
+            "--sales-per-day",
+            type=int,
+            default=20,
+            help="매출 API 가 돌려줄 매장별 하루 주문 수.",
+        )
+
+    def handle(self, *args, **opts):
+        latency = opts["latency_ms"] / 1000.0
+        expires_in = opts["expires_in"]
+        fail_rate = opts["fail_rate"]
+        down = opts["down"]
+        per_day = max(1, opts["sales_per_day"])
+        lock = threading.Lock()
+        stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+        def sales_page(store, qs):
+            """since~until 을 하루 per_day 건으로 나눈 결정적 주문 목록의 한 페이지"""
+            since = datetime.fromisoformat(qs["since"])
+            until = datetime.fromisoformat(qs["until"])
+            step = timedelta(days=1) / per_day
+            total = max(0, int((until - since) / step))
+            offset = int(qs.get("cursor") or 0)
+            limit = int(qs.get("limit") or 100)
+            data = []
+            for i in range(offset, min(total, offset + limit)):
+                seed = zlib.crc32(f"{store}:{i}".encode())
+                data.append(
+                    {
+                        "id": f"{store}-{i}",
+                        "type": "order.refunded" if seed % 10 == 0 else "order.paid",
+                        "amount": 1000 + seed % 50 * 100,
+                        "occurred_at": (since + step * i).isoformat(),
+                    }
+                )
+            end = offset + len(data)
+            return {"data": data, "next_cursor": str(end) if end < total else None}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _begin(self) -> bool:
+                """통계 갱신 + 지연/장애 흉내. False 면 이미 503 응답함"""
+                with lock:
+                    stats["requests"] += 1
+                    stats["in_flight"] += 1
+                    stats["max_in_flight"] = max(
+                        stats["max_in_flight"], stats["in_flight"]
+                    )
+                if latency:
+                    time.sleep(latency)
+                if down or (fail_rate and random.random() < fail_rate):
+                    self._send(503, {"error": "temporarily_unavailable"})
+                    return False
+                return True
+
+            def _end(self):
+                with lock:
+                    stats["in_flight"] -= 1
+
+            def do_GET(self):  # noqa: N802
+                url = urlparse(self.path)
+                qs = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                if url.path == "/stats":
+                    with lock:
+                        self._send(200, dict(stats))
+                    return
+                is_health = url.path.startswith("/stores/") and url.path.endswith(
+                    "/health"
+                )
+                is_sales = url.path.startswith("/stores/") and url.path.endswith(
+                    "/sales"
+                )
+                if (
+                    url.path
+                    not in ("/oauth/access_token", "/refresh_access_token", "/me")
+                    and not is_health
+                    and not is_sales
+                ):
+                    self.send_error(404)
+                    return
+                try:
+                    if not self._begin():
+                        return
+                    if is_sales:
+                        store = unquote(url.path[len("/stores/") : -len("/sales")])
+                        self._send(200, sales_page(store, qs))
+                    elif is_health:
+                        store = unquote(url.path[len("/stores/") : -len("/health")])
+                        auth = self.headers.get("Authorization", "")
+                        if not auth.startswith("Bearer ") or not auth[7:].strip():
+                            self._send(401, {"message": "missing api key"})
+                        elif store.startswith("down"):
+                            self._send(503, {"status": "down"})
+                        elif store.startswith("degraded"):
+                            self._send(
+                                200,
+                                {"status": "degraded", "message": "printer offline"},
+                            )
+                        else:
+                            self._send(200, {"status": "ok"})
+                    elif qs.get("grant_type") in (
+                        "fb_exchange_token",
+                        "ig_refresh_token",
+                    ):
+                        token = qs.get("fb_exchange_token") or qs.get(
+                            "access_token", ""
+                        )
+                        if not token or token.startswith("revoked"):
+                            self._send(
+                                400,
+                                {
+                                    "error": {
+                                        "message": "Error validating access token",
+                                        "type": "OAuthException",
+                                        "code": 190,
+                                    }
+                                },
+                            )
+                        elif token.startswith("flaky"):
+                            self._send(503, {"error": "temporarily_unavailable"})
+                        else:
+                            self._send(
+                                200,
+                                {
+                                    "access_token": f"stub_{uuid.uuid4().hex}",
+                                    "expires_in": expires_in,
+                                    "token_type": "bearer",
+                                },
+                            )
+                    elif url.path == "/oauth/access_token":
+                        code = qs.get("code", "")
+                        if not code or code.startswith("bad"):
+                            self._send(
+                                400,
+                                {
+                                    "error": {
+                                        "message": "Invalid verification code",
+                                        "type": "OAuthException",
+                                    }
+                                },
+                            )
+                        else:
+                            self._send(
+                                200,
+                                {
+                                    "access_token": f"stub_{code}",
+                                    "refresh_token": f"rt_{code}",
+                                    "expires_in": expires_in,
+                                    "token_type": "bearer",
+                                },
+                            )
+                    else:
+                        token = qs.get("access_token", "")
+                        account_id = str(1784140000000000 + zlib.crc32(token.encode()))
+                        self._send(
+                            200,
+                            {
+                                "id": account_id,
+                                "name": f"stub {account_id[-4:]}",
+                                "username": f"stub_{account_id[-4:]}",
+                                "account_type": "BUSINESS",
+                            },
+                        )
+                finally:
+                    self._end()
+
+            def do_POST(self):  # noqa: N802
+                if urlparse(self.path).path not in ("/token", "/oauth/token"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                form = {
+                    k: v[-1]
+                    for k, v in parse_qs(self.rfile.read(length).decode()).items()
+                }
+                try:
+                    if not self._begin():
+                        return
+                    token = form.get("refresh_token", "")
+                    if form.get("grant_type") != "refresh_token" or not token:
+                        self._send(400, {"error": "invalid_request"})
+                    elif token.startswith("revoked"):
+                        self._send(
+                            400,
+                            {
+                                "error": "invalid_grant",
+                                "error_description": "refresh token revoked",
+                            },
+                        )
+                    elif token.startswith("flaky"):
+                        self._send(503, {"error": "temporarily_unavailable"})
+                    else:
+                        self._send(
+                            200,
+                            {
+                                "access_token": f"stub_{uuid.uuid4().hex}",
+                                "refresh_token": token,
+                                "expires_in": expires_in,
+                                "token_type": "bearer",
+                            },
+                        )
+                finally:
+                    self._end()
+
+            def log_message(self, *args):  # 요청 로그 생략
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # 기본 backlog(5)면 동시 접속이 몰릴 때 SYN 재전송으로 1초씩 지연
+            request_queue_size = 1024
+            daemon_threads = True
+
+        server = Server((opts["host"], opts["port"]), Handler)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"fake provider on http://{opts['host']}:{opts['port']} "
+                f"(latency={opts['latency_ms']}ms, fail_rate={fail_rate}, down={down})"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
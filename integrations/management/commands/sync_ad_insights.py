@@ -0,0 +1,127 @@
+# integrations/management/commands/sync_ad_insights.py
+# ------------------------------------------------------------
+# 목적:
+# - Facebook / Instagram 연동의 광고 캠페인 일 성과(지출/클릭/노출)를
+#   Campaign + DailyPerformance 로 증분 동기화합니다. (integrations.ad_sync)
+#
+# 특징:
+# - 연동별 high-water mark(AdSyncState) 이후만, 최근 lookback 일은 다시 받음
+# - Graph batch 엔드포인트 + 커서 페이지네이션, 연동 여러 개를 워커(--workers)로 병렬 수집
+# - 연동 단위 트랜잭션으로 bulk upsert
+# - --fixture: 녹화된 응답 파일로 동작하는 가짜 Graph API 사용 (네트워크/앱 키 불필요)
+#
+# 사용 예:
+#   poetry run python manage.py sync_ad_insights
+#   poetry run python manage.py sync_ad_insights --since 2026-09-01 --provider instagram
+#   poetry run python manage.py sync_ad_insights \
+#       --fixture integrations/testdata/graph_ad_insights.json --since 2026-09-01
+# ------------------------------------------------------------
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations import ad_sync, graph_fixture, providers
+
+
+class Command(BaseCommand):
+    help = "Sync daily ad campaign metrics from Facebook/Instagram integrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--integration",
+            action="append",
+            default=None,
+            help="특정 연동만 (public_id, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--provider",
+            action="append",
+            default=None,
+            choices=ad_sync.AD_PROVIDERS,
+            help="특정 플랫폼만 (여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--since",
+            default=None,
+            help="시작일 YYYY-MM-DD (지정하면 high-water mark 무시)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.AD_SYNC["workers"],
+            help="동시에 수집할 연동 수",
+        )
+        parser.add_argument(
+            "--fixture",
+            default=None,
+            help="녹화된 Graph 응답 JSON 으로 가짜 Graph API 사용",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="수집만 하고 DB에 저장하지 않습니다.",
+        )
+
+    def handle(self, *args, **opts):
+        since = None
+        if opts["since"]:
+            try:
+                since = date.fromisoformat(opts["since"])
+            except ValueError:
+                raise CommandError("--since 는 YYYY-MM-DD 형식이어야 합니다.")
+        transport = None
+        if opts["fixture"]:
+            try:
+                transport = graph_fixture.install(opts["fixture"])
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"fixture 를 읽을 수 없습니다: {e}")
+            self.stdout.write(self.style.WARNING(f"** fixture: {opts['fixture']} **"))
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+
+        verbose = opts["verbosity"] >= 2
+
+        def progress(integ, outcome):
+            if "error" in outcome:
+                self.stdout.write(
+                    self.style.WARNING(f"- {integ.public_id}: {outcome['error']}")
+                )
+            elif verbose and "skipped" in outcome:
+                self.stdout.write(f"- {integ.public_id}: {outcome['skipped']}")
+            elif verbose:
+                self.stdout.write(
+                    f"- {integ.public_id}: {outcome['start']}~{outcome['end']} "
+                    f"campaigns={outcome['campaigns']} rows={outcome['rows']}"
+                )
+
+        started = time.perf_counter()
+        stats = ad_sync.sync(
+            integrations=opts["integration"],
+            providers=opts["provider"],
+            since=since,
+            workers=opts["workers"],
+            dry_run=opts["dry_run"],
+            on_integration=progress,
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS("=== sync_ad_insights 결과 ==="))
+        self.stdout.write(f"연동: {stats['integrations']} ({elapsed:.1f}s)")
+        self.stdout.write(f"동기화: {stats['synced']}")
+        self.stdout.write(f"실패: {stats['failed']}")
+        self.stdout.write(f"건너뜀(graph_base 미설정): {stats['skipped']}")
+        self.stdout.write(f"건너뜀(광고 계정 없음): {stats['no_account']}")
+        self.stdout.write(f"수집 행: {stats['fetched']}")
+        self.stdout.write(f"캠페인: {stats['campaigns']} / 일 성과 행: {stats['rows']}")
+        if transport is not None:
+            self.stdout.write(
+                f"batch 호출: {transport.calls} (요청 {transport.items}개)"
+            )
+        for code, m in providers.metrics().items():
+            self.stdout.write(
+                f"  · {code} HTTP: {m['count']}건 (오류 {m['errors']}) "
+                f"p50 {m['p50_ms']}ms / p95 {m['p95_ms']}ms [breaker={m['breaker']}]"
+            )
+        self.stdout.write(self.style.SUCCESS("완료."))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0014_rename_pos_prov_store_idx_pos_prov_store_idx_v2"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="integration",
+            index=models.Index(
+                fields=["status", "token_expires_at"], name="integ_status_expires_idx"
+            ),
+        ),
+    ]
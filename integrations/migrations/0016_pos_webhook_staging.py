@@ -0,0 +1,105 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:59
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0015_integration_status_expires_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PosDailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("store_external_id", models.CharField(max_length=100)),
+                ("date", models.DateField()),
+                ("sales", models.PositiveIntegerField(default=0)),
+                ("refunds", models.PositiveIntegerField(default=0)),
+                ("orders", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "connection",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_sales",
+                        to="integrations.posconnection",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "pos_daily_sales",
+                "indexes": [
+                    models.Index(
+                        fields=["store_external_id", "date"],
+                        name="pos_sales_store_date_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("connection", "date"), name="uniq_pos_daily_sales"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PosWebhookEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event_id", models.CharField(max_length=100)),
+                ("body", models.TextField()),
+                (
+                    "received_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, default="")),
+                (
+                    "connection",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="webhook_events",
+                        to="integrations.posconnection",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "pos_webhook_events",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("processed_at__isnull", True)),
+                        fields=["id"],
+                        name="pos_webhook_pending_idx",
+                    ),
+                    models.Index(
+                        fields=["processed_at"], name="pos_webhook_processed_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("connection", "event_id"), name="uniq_pos_webhook_event"
+                    )
+                ],
+            },
+        ),
+    ]
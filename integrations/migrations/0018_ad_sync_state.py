@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0017_pos_backfill"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AdSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("synced_until", models.DateField(blank=True, null=True)),
+                ("last_run_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("campaigns", models.PositiveIntegerField(default=0)),
+                ("rows", models.PositiveIntegerField(default=0)),
+                (
+                    "integration",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ad_sync",
+                        to="integrations.integration",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ad_sync_states",
+            },
+        ),
+    ]
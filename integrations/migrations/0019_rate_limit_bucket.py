@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0018_ad_sync_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimitBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=200, unique=True)),
+                ("tokens", models.FloatField(default=0)),
+                ("refilled_at", models.FloatField(default=0)),
+            ],
+            options={
+                "db_table": "rate_limit_buckets",
+            },
+        ),
+    ]
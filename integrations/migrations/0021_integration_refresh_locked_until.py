@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0020_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="integration",
+            name="refresh_locked_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
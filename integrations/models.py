@@ -67,9 +67,16 @@ class Integration(models.Model):
 
     extra = models.JSONField(default=dict, blank=True)
 
+    # 토큰 선제 갱신 임대 만료 시각 (integrations.token_refresh, 실행 중인 갱신이 선점)
+    refresh_locked_until = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         indexes = [
             models.Index(fields=["user", "provider", "account_id"]),
+            # 토큰 선제 갱신 스캔: status='active' AND token_expires_at <= 기준
+            models.Index(
+                fields=["status", "token_expires_at"], name="integ_status_expires_idx"
+            ),
         ]
 
     def save(self, *args, **kwargs):
@@ -143,3 +150,174 @@ class PosConnection(models.Model):
                 name="uniq_active_pos_store_per_provider_v2",
             ),
         ]
+
+
+# ---POS 웹훅 수신
+class PosWebhookEvent(models.Model):
+    """
+    서명 검증을 통과한 POS 웹훅 원문 (staging, append-only)
+    - 수신 시에는 INSERT 1건만, 파싱/집계는 process_pos_webhooks 배치에서
+    - processed_at 이 비어 있는 행 = 아직 반영 안 됨
+    """
+
+    connection = models.ForeignKey(
+        PosConnection, on_delete=models.CASCADE, related_name="webhook_events"
+    )
+    # 재전송 중복 제거용 (X-Pos-Event-Id, 없으면 본문 sha256)
+    event_id = models.CharField(max_length=100)
+    body = models.TextField()
+    received_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "pos_webhook_events"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["connection", "event_id"], name="uniq_pos_webhook_event"
+            ),
+        ]
+        indexes = [
+            # 미처리 행만 담는 부분 인덱스 → 배치가 id 순으로 바로 집음
+            models.Index(
+                fields=["id"],
+                condition=Q(processed_at__isnull=True),
+                name="pos_webhook_pending_idx",
+            ),
+            models.Index(fields=["processed_at"], name="pos_webhook_processed_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.connection_id}:{self.event_id}"
+
+
+class PosDailySales(models.Model):
+    """POS 웹훅을 매장(연결)×일 단위로 합산한 매출"""
+
+    connection = models.ForeignKey(
+        PosConnection, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    store_external_id = models.CharField(max_length=100)
+    date = models.DateField()
+    sales = models.PositiveIntegerField(default=0)  # 결제 금액 합계
+    refunds = models.PositiveIntegerField(default=0)  # 환불 금액 합계
+    orders = models.PositiveIntegerField(default=0)  # 결제 건수
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "pos_daily_sales"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["connection", "date"], name="uniq_pos_daily_sales"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["store_external_id", "date"], name="pos_sales_store_date_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.store_external_id} {self.date}"
+
+
+class PosBackfill(models.Model):
+    """
+    연결별 과거 매출 백필 작업 + 체크포인트 (backfill_pos_sales)
+    - cursor: 벤더 매출 API 의 다음 페이지 커서 (배치 저장과 같은 트랜잭션에서 갱신)
+    - locked_until: 실행 중인 워커의 임대 만료 시각 (죽은 워커의 작업은 만료 후 재개)
+    """
+
+    STATUS_CHOICES = (
+        ("pending", "pending"),
+        ("running", "running"),
+        ("done", "done"),
+        ("failed", "failed"),
+    )
+
+    connection = models.OneToOneField(
+        PosConnection, on_delete=models.CASCADE, related_name="backfill"
+    )
+    since = models.DateTimeField()
+    until = models.DateTimeField()
+    cursor = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    records = models.PositiveIntegerField(default=0)
+    pages = models.PositiveIntegerField(default=0)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "pos_backfills"
+        indexes = [
+            models.Index(
+                fields=["status", "locked_until"], name="pos_backfill_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.connection_id}:{self.status}"
+
+
+# ---광고 성과 동기화
+class AdSyncState(models.Model):
+    """
+    연동(Integration)별 광고 성과 동기화 high-water mark (sync_ad_insights)
+    - synced_until: 마지막으로 성공한 동기화의 종료일 (다음 실행은 여기서 lookback 일 전부터)
+    """
+
+    integration = models.OneToOneField(
+        Integration, on_delete=models.CASCADE, related_name="ad_sync"
+    )
+    synced_until = models.DateField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    campaigns = models.PositiveIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "ad_sync_states"
+
+    def __str__(self):
+        return f"{self.integration_id}:{self.synced_until}"
+
+
+# ---외부 호출 속도 제한
+class RateLimitBucket(models.Model):
+    """
+    프로바이더(+계정)별 토큰 버킷 (integrations.rate_limits)
+    - 모든 워커/배치가 같은 행을 조건부 UPDATE 로 차감 → 프로세스 간 공유
+    - tokens: 마지막 리필 시점의 남은 토큰 (429 페널티면 음수)
+    - refilled_at: 마지막 리필 시각 (epoch 초)
+    """
+
+    key = models.CharField(max_length=200, unique=True)
+    tokens = models.FloatField(default=0)
+    refilled_at = models.FloatField(default=0)
+
+    class Meta:
+        db_table = "rate_limit_buckets"
+
+    def __str__(self):
+        return f"{self.key}:{self.tokens:.1f}"
+
+
+# ---중복 수신 방지
+class IdempotencyKey(models.Model):
+    """
+    재전송 중복 제거용 처리 완료 키 (integrations.idempotency)
+    - key: blake2b-128(scope + 원래 키) hex → 길이 고정 32자, PK 인덱스 하나만 사용
+    - expires_at 이 지나면 없는 것으로 취급하고 sweep 이 묶음 단위로 삭제
+    """
+
+    key = models.CharField(max_length=32, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotency_keys"
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,282 @@
+# integrations/pos_backfill.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - POS 연결 생성 시 과거 매출(기본 180일)을 벤더 매출 API 에서 가져와
+#   PosDailySales 에 반영 (backfill_pos_sales)
+#
+# 흐름:
+# 1) 연결 생성(create_pos_connection) → PosBackfill 작업 등록 (since ~ 연결 시각)
+# 2) 작업마다 임대(locked_until)를 잡고 워커 스레드에서 실행 (여러 연결 병렬)
+# 3) GET {base}/stores/{store}/sales?since&until&limit&cursor 를 페이지 단위로
+#    제너레이터(iter_pages)로 흘려보내며 (매장, 일자)별 합계만 메모리에 누적
+#    - HTTP 재시도/백오프/서킷 브레이커는 providers.ProviderAdapter 재사용
+#    - 속도 제한도 어댑터가 요청마다 rate_limits 공유 버킷("pos:{벤더}")에서 차감
+#      → 웹훅/점검/다른 백필 프로세스와 합산해 PROVIDER_RATE_LIMITS["pos"] 를 지킴
+# 4) batch_size 건이 쌓이면 "일매출 증가 + 다음 커서 저장" 을 한 트랜잭션으로
+#    → 중간에 죽어도 마지막 체크포인트 커서부터 재개, 같은 페이지를 두 번 더하지 않음
+#    - 체크포인트는 (이전 커서, 내 임대) 가 그대로일 때만 저장 (펜싱)
+#      → 임대가 만료돼 다른 워커가 이어받았으면 0행 → 롤백하고 중단 (이중 합산 없음)
+# 5) next_cursor 가 없으면 done, 벤더 오류면 failed (커서는 마지막 체크포인트 유지)
+#
+# 벤더 응답 예:
+#   {"data": [{"id": "...", "type": "order.paid", "amount": 12000,
+#              "occurred_at": "2026-05-01T12:00:00+09:00"}, ...],
+#    "next_cursor": "500"}          # 마지막 페이지면 null
+#   - 레코드 형식은 웹훅 본문과 같음 (pos_webhooks.parse_record)
+# -----------------------------------------------------------------------------
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from django import db
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import PosBackfill, PosConnection
+from .pos_webhooks import add_daily_sales, parse_record
+from .providers import ProviderAdapter, ProviderError
+
+RESUMABLE = ("pending", "running")
+
+
+class LeaseLost(Exception):
+    """체크포인트 시점에 임대/커서가 바뀜 (다른 워커가 작업을 이어받음)"""
+
+
+_clients: Dict[str, ProviderAdapter] = {}
+_clients_lock = threading.Lock()
+
+
+def client_for(code: str) -> Optional[ProviderAdapter]:
+    """벤더별 HTTP 클라이언트 (base URL 미설정이면 None)"""
+    base = settings.POS_API_BASE_URLS.get(code) or ""
+    if not base:
+        return None
+    with _clients_lock:
+        client = _clients.get(code)
+        if client is None:
+            client = ProviderAdapter({"graph_base": base}, settings.INTEGRATIONS_HTTP)
+            client.code = f"pos:{code}"
+            _clients[code] = client
+    return client
+
+
+def metrics() -> Dict[str, Dict]:
+    return {code: client.metrics() for code, client in sorted(_clients.items())}
+
+
+# ----------------------------
+# 작업 등록
+# ----------------------------
+def enqueue(conn: PosConnection, days: Optional[int] = None) -> PosBackfill:
+    """연결의 백필 작업 (이미 있으면 그대로)"""
+    days = settings.POS_BACKFILL["days"] if days is None else days
+    until = conn.connected_at or timezone.now()
+    job, _ = PosBackfill.objects.get_or_create(
+        connection=conn,
+        defaults={"since": until - timedelta(days=days), "until": until},
+    )
+    return job
+
+
+def enqueue_missing(days: Optional[int] = None) -> int:
+    """작업이 없는 활성 연결 모두 등록"""
+    conns = PosConnection.objects.filter(status="active", backfill__isnull=True)
+    return sum(1 for conn in conns.iterator() if enqueue(conn, days))
+
+
+# ----------------------------
+# 페이지 스트림
+# ----------------------------
+def iter_pages(
+    client: ProviderAdapter,
+    job: PosBackfill,
+    store: str,
+    page_size: int,
+) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+    """(레코드 목록, 다음 커서) 를 페이지마다 yield (커서는 job.cursor 부터)"""
+    cursor = job.cursor
+    path = f"/stores/{quote(store, safe='')}/sales"
+    while True:
+        params = {
+            "since": job.since.isoformat(),
+            "until": job.until.isoformat(),
+            "limit": page_size,
+        }
+        if cursor:
+            params["cursor"] = cursor
+        page = client.request("GET", path, params=params)
+        cursor = page.get("next_cursor") or None
+        yield page.get("data") or [], cursor
+        if not cursor:
+            return
+
+
+# ----------------------------
+# 실행
+# ----------------------------
+def claim(job_id: int, statuses: Sequence[str] = RESUMABLE):
+    """
+    임대가 비어 있거나 만료된 작업만 running 으로 가져옴
+    반환: 잡은 임대의 만료 시각 (펜싱 값), 못 잡으면 None
+    """
+    now = timezone.now()
+    until = now + timedelta(seconds=settings.POS_BACKFILL["lease_seconds"])
+    claimed = PosBackfill.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        pk=job_id,
+        status__in=list(statuses),
+    ).update(status="running", locked_until=until)
+    return until if claimed == 1 else None
+
+
+def run_job(
+    job: PosBackfill,
+    page_size: int,
+    batch_size: int,
+    lease_until=None,
+) -> Dict:
+    """
+    작업 하나 실행 (claim 된 상태), 결과 dict: status, records, pages, invalid
+    lease_until: claim() 이 돌려준 내 임대 (기본: job.locked_until)
+    """
+    conn = job.connection
+    client = client_for(conn.provider.code)
+    result = {"status": "failed", "records": 0, "pages": 0, "invalid": 0}
+    # 내 임대 + 마지막으로 저장한 커서 (체크포인트/종료 기록의 펜싱 조건)
+    fence = {"locked_until": lease_until or job.locked_until, "cursor": job.cursor}
+
+    def mine():
+        return PosBackfill.objects.filter(pk=job.pk, **fence)
+
+    if client is None:
+        mine().update(
+            status="pending", locked_until=None, last_error="no sales API configured"
+        )
+        result["status"] = "skipped"
+        return result
+
+    lease = timedelta(seconds=settings.POS_BACKFILL["lease_seconds"])
+    deltas: Dict[Tuple[int, object], List[int]] = defaultdict(lambda: [0, 0, 0])
+    pending = {"records": 0, "pages": 0}
+
+    def checkpoint(next_cursor: Optional[str]) -> None:
+        now = timezone.now()
+        done = not next_cursor
+        locked_until = None if done else now + lease
+        with transaction.atomic():
+            # 펜싱 먼저: 0행이면 매출 증가분도 함께 롤백
+            updated = mine().update(
+                cursor=next_cursor or "",
+                records=F("records") + pending["records"],
+                pages=F("pages") + pending["pages"],
+                status="done" if done else "running",
+                locked_until=locked_until,
+                finished_at=now if done else None,
+                last_error="",
+                updated_at=now,
+            )
+            if updated != 1:
+                raise LeaseLost(f"backfill {job.pk}: lease lost")
+            add_daily_sales(deltas, {conn.id: conn.store_external_id})
+        fence.update(locked_until=locked_until, cursor=next_cursor or "")
+        result["records"] += pending["records"]
+        result["pages"] += pending["pages"]
+        deltas.clear()
+        pending.update(records=0, pages=0)
+
+    try:
+        for records, next_cursor in iter_pages(
+            client, job, conn.store_external_id, page_size
+        ):
+            for record in records:
+                try:
+                    kind, amount, day, _ = parse_record(record, job.until)
+                except (ValueError, TypeError):
+                    result["invalid"] += 1
+                    continue
+                delta = deltas[(conn.id, day)]
+                if kind == "order.paid":
+                    delta[0] += amount
+                    delta[2] += 1
+                else:
+                    delta[1] += amount
+            pending["records"] += len(records)
+            pending["pages"] += 1
+            if pending["records"] >= batch_size or not next_cursor:
+                checkpoint(next_cursor)
+    except LeaseLost:
+        # 다른 워커가 이어받음 → 아무것도 기록하지 않고 손 뗌
+        result["status"] = "lost"
+        return result
+    except ProviderError as e:
+        # 마지막 체크포인트 이후 누적분은 버림 (커서가 그대로라 다음 실행에서 다시 받음)
+        mine().update(status="failed", locked_until=None, last_error=str(e)[:500])
+        return result
+    result["status"] = "done"
+    return result
+
+
+def run(
+    connections: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    page_size: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    retry_failed: bool = False,
+    on_job=None,
+) -> Dict:
+    """
+    재개 가능한 작업 모두 실행 (connections: 연결 public_id 로 제한)
+    통계 dict 반환: jobs, done, failed, skipped, busy, lost, records, pages, invalid
+    """
+    conf = settings.POS_BACKFILL
+    workers = max(1, workers or conf["workers"])
+    page_size = max(1, page_size or conf["page_size"])
+    batch_size = max(1, batch_size or conf["batch_size"])
+    statuses = RESUMABLE + (("failed",) if retry_failed else ())
+
+    qs = PosBackfill.objects.filter(status__in=statuses)
+    if connections:
+        qs = qs.filter(connection__public_id__in=list(connections))
+    job_ids = list(qs.order_by("created_at", "id").values_list("id", flat=True))
+
+    stats = {
+        "jobs": len(job_ids),
+        "done": 0,
+        "failed": 0,
+        "skipped": 0,
+        "busy": 0,
+        "lost": 0,
+        "records": 0,
+        "pages": 0,
+        "invalid": 0,
+    }
+    lock = threading.Lock()
+
+    def work(job_id: int) -> None:
+        try:
+            lease_until = claim(job_id, statuses)
+            if lease_until is None:
+                outcome = {"status": "busy"}  # 다른 워커가 실행 중
+            else:
+                job = PosBackfill.objects.select_related(
+                    "connection", "connection__provider"
+                ).get(pk=job_id)
+                outcome = run_job(job, page_size, batch_size, lease_until)
+            with lock:
+                stats[outcome["status"]] += 1
+                for key in ("records", "pages", "invalid"):
+                    stats[key] += outcome.get(key, 0)
+                if on_job:
+                    on_job(job_id, outcome, stats)
+        finally:
+            db.connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(work, job_ids))
+    return stats
@@ -0,0 +1,277 @@
+# integrations/pos_probe.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 활성 PosConnection 전체를 POS 벤더 헬스 API 로 동시에 점검 (probe_pos_connections)
+#
+# 흐름:
+# 1) 활성 연결을 (id, public_id, 매장, 벤더, api_key) 로만 읽음
+# 2) asyncio 로 동시에 GET {base}/stores/{store_external_id}/health
+#    - 전체 동시 요청 수(concurrency) + 벤더별 세마포어(per_provider)
+#    - 요청마다 타임아웃, 인증은 Authorization: Bearer {credentials.api_key}
+#    - PROVIDER_RATE_LIMITS["pos"] 가 있으면 벤더별 공유 토큰 버킷(rate_limits.aacquire)
+#      → 토큰을 못 얻으면 요청하지 않고 건너뜀(rate_limited, 기록하지 않음)
+#    - 응답 본문은 Content-Length / chunked / 연결 종료까지 세 가지 모두 처리
+#    - 200 + JSON 객체 {"status": "ok"} (또는 status 없음) → 정상
+#      그 외(200 이어도 JSON 객체가 아니면) → 오류 문자열
+# 3) 결과를 한 번에 기록 (점검한 연결만)
+#    - 정상: last_ping_at (heartbeats.write, 더 최신일 때만) + last_error 비움
+#    - 실패: last_error = 사유 (last_ping_at 은 그대로)
+#    - 속도 제한으로 건너뛴 연결은 last_error / last_ping_at 모두 그대로
+#
+# 설정:
+# - POS_API_BASE_URLS[벤더 code] 가 비어 있으면 그 벤더는 점검하지 않음(skipped)
+#
+# 로컬 테스트:
+#   poetry run python manage.py run_token_stub_server --port 8766 --latency-ms 50
+#   POS_BRAND_A_BASE=http://127.0.0.1:8766 poetry run python manage.py probe_pos_connections
+# -----------------------------------------------------------------------------
+import asyncio
+import json
+import ssl
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Q, TextField, Value, When
+from django.utils import timezone
+
+from . import heartbeats, rate_limits
+from .models import PosConnection
+
+CHUNK = 500
+# 속도 제한 토큰을 못 얻어 요청하지 않은 연결 (결과 기록 없이 건너뜀)
+RATE_LIMITED = "rate limited (not probed)"
+
+
+# ----------------------------
+# 최소 HTTP/1.1 클라이언트 (GET 전용, 표준 라이브러리만 사용)
+# ----------------------------
+async def _get(url: str, headers: Dict[str, str]) -> Tuple[int, bytes]:
+    parts = urlsplit(url)
+    https = parts.scheme == "https"
+    port = parts.port or (443 if https else 80)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=ssl.create_default_context() if https else None
+    )
+    try:
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        lines = [f"GET {path} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        lines += ["Accept: application/json", "Connection: close", "", ""]
+        writer.write("\r\n".join(lines).encode())
+        await writer.drain()
+
+        status_line = await reader.readline()
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise ConnectionError(f"bad status line: {status_line[:50]!r}")
+        length, chunked = None, False
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value.lower()
+        if chunked:  # chunked 가 Content-Length 보다 우선 (RFC 9112)
+            body = await _read_chunked(reader)
+        elif length is not None:
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read()
+        return status, body
+    finally:
+        writer.close()
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Transfer-Encoding: chunked 본문 → 원문 (chunk 확장/trailer 는 버림)"""
+    parts = []
+    while True:
+        size_line = await reader.readline()
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError:
+            raise ConnectionError(f"bad chunk size: {size_line[:50]!r}")
+        if size == 0:
+            break
+        parts.append(await reader.readexactly(size))
+        await reader.readline()  # chunk 끝 CRLF
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+        pass  # trailer
+    return b"".join(parts)
+
+
+def _health_error(status: int, body: bytes) -> Optional[str]:
+    """응답 → 오류 사유 (정상이면 None)"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if status != 200:
+        message = data.get("message") if isinstance(data, dict) else None
+        return f"HTTP {status}" + (f": {message}" if message else "")
+    if not isinstance(data, dict):
+        # 프록시 오류 페이지 등: 200 이어도 헬스 응답이 아니면 정상으로 보지 않음
+        return "invalid health response (not a JSON object)"
+    state = data.get("status", "ok")
+    if state != "ok":
+        return f"{state}" + (f": {data['message']}" if data.get("message") else "")
+    return None
+
+
+# ----------------------------
+# 동시 점검
+# ----------------------------
+async def _probe_all(
+    targets: List[Dict], concurrency: int, per_provider: int, timeout: float
+) -> List[Tuple[int, Optional[str], float]]:
+    """targets → [(연결 id, 오류 사유 또는 None 또는 RATE_LIMITED, 지연 초)]"""
+    total = asyncio.Semaphore(concurrency)
+    limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def one(t: Dict):
+        limit = limits.setdefault(t["provider"], asyncio.Semaphore(per_provider))
+        async with limit, total:
+            if not await rate_limits.aacquire(f"pos:{t['provider']}"):
+                return t["id"], RATE_LIMITED, 0.0
+            started = time.perf_counter()
+            try:
+                status, body = await asyncio.wait_for(
+                    _get(t["url"], t["headers"]), timeout
+                )
+                error = _health_error(status, body)
+            except asyncio.TimeoutError:
+                error = f"timeout after {timeout:g}s"
+            except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+                error = f"connection error: {e}"[:300]
+            return t["id"], error, time.perf_counter() - started
+
+    return await asyncio.gather(*(one(t) for t in targets))
+
+
+def _targets(providers: Optional[Sequence[str]] = None):
+    """활성 연결 → (점검 대상 목록, base URL 미설정으로 건너뛴 수)"""
+    base_urls = settings.POS_API_BASE_URLS
+    qs = PosConnection.objects.filter(status="active")
+    if providers:
+        qs = qs.filter(provider__code__in=list(providers))
+    targets, skipped = [], 0
+    for conn_id, public_id, store, code, credentials in qs.order_by("id").values_list(
+        "id", "public_id", "store_external_id", "provider__code", "credentials"
+    ):
+        base = (base_urls.get(code) or "").rstrip("/")
+        if not base:
+            skipped += 1
+            continue
+        api_key = (credentials or {}).get("api_key", "")
+        targets.append(
+            {
+                "id": conn_id,
+                "public_id": public_id,
+                "store": store,
+                "provider": code,
+                "url": f"{base}/stores/{quote(store, safe='')}/health",
+                "headers": {"Authorization": f"Bearer {api_key}"},
+            }
+        )
+    return targets, skipped
+
+
+def _write_errors(errors: Dict[int, Optional[str]]) -> None:
+    """{연결 id: 오류 사유 또는 None} → last_error (CASE WHEN, 청크 단위)"""
+    items = sorted(errors.items())
+    for start in range(0, len(items), CHUNK):
+        chunk = items[start : start + CHUNK]
+        PosConnection.objects.filter(id__in=[c for c, _ in chunk]).update(
+            last_error=Case(
+                *[When(Q(id=c), then=Value(e)) for c, e in chunk],
+                default=Value(None),
+                output_field=TextField(),
+            )
+        )
+
+
+def probe(
+    providers: Optional[Sequence[str]] = None,
+    concurrency: Optional[int] = None,
+    per_provider: Optional[int] = None,
+    timeout: Optional[float] = None,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    활성 연결 전체 점검
+    통계 dict 반환: total, ok, failed, skipped, rate_limited, elapsed,
+                    p50_ms, p95_ms, by_provider, failures [(public_id, 벤더, 매장, 사유)]
+    - skipped: base URL 미설정, rate_limited: 속도 제한으로 이번에 점검하지 않음
+    """
+    conf = settings.POS_PROBE
+    concurrency = max(1, concurrency or conf["concurrency"])
+    per_provider = max(1, per_provider or conf["per_provider"])
+    timeout = timeout or conf["timeout"]
+
+    started = time.perf_counter()
+    targets, skipped = _targets(providers)
+    stats = {
+        "total": len(targets),
+        "ok": 0,
+        "failed": 0,
+        "skipped": skipped,
+        "rate_limited": 0,
+        "by_provider": {},
+        "failures": [],
+        "p50_ms": 0,
+        "p95_ms": 0,
+    }
+    if dry_run or not targets:
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    results = asyncio.run(_probe_all(targets, concurrency, per_provider, timeout))
+    now = timezone.now()
+
+    by_id = {t["id"]: t for t in targets}
+    errors: Dict[int, Optional[str]] = {}
+    seen = {}
+    latencies = sorted(r[2] for r in results if r[1] != RATE_LIMITED)
+    for conn_id, error, _ in results:
+        t = by_id[conn_id]
+        by = stats["by_provider"].setdefault(
+            t["provider"], {"ok": 0, "failed": 0, "rate_limited": 0}
+        )
+        if error == RATE_LIMITED:
+            stats["rate_limited"] += 1
+            by["rate_limited"] += 1
+            continue
+        errors[conn_id] = error
+        if error is None:
+            seen[conn_id] = now
+            stats["ok"] += 1
+            by["ok"] += 1
+        else:
+            stats["failed"] += 1
+            by["failed"] += 1
+            stats["failures"].append((t["public_id"], t["provider"], t["store"], error))
+
+    with transaction.atomic():
+        heartbeats.write(seen)
+        _write_errors(errors)
+
+    def pct(p):
+        if not latencies:
+            return 0
+        return round(
+            latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1
+        )
+
+    stats["p50_ms"], stats["p95_ms"] = pct(0.50), pct(0.95)
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
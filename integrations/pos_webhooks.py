@@ -0,0 +1,439 @@
+# integrations/pos_webhooks.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - POS 웹훅 수신(서명 검증 + staging 적재)과 배치 반영(매출/DailyPerformance)
+#
+# 수신 (요청당 작업 최소화):
+# 1) 연결 public_id → (id, 서명 키) 를 프로세스 캐시에서 조회 (TTL)
+#    - 찾은 활성 연결만 캐시 (없는 id 를 캐시하면 방금 만든 연결의 웹훅이 TTL 동안 404)
+# 2) X-Pos-Timestamp / X-Pos-Signature 검증
+#    - signature = "sha256=" + hex(HMAC-SHA256(secret, f"{timestamp}.".encode() + body))
+#    - hmac.compare_digest 로 비교, 타임스탬프 허용 오차 밖이면 거부
+# 3) PosWebhookEvent 에 원문 INSERT (ON CONFLICT DO NOTHING → 재전송 중복 제거)
+#    - JSON 파싱도 하지 않음 (배치에서)
+#    - 이 프로세스가 이미 받은 event_id 는 메모리 캐시(idempotency.seen)로 바로 202
+#    - 그룹 커밋: 동시에 들어온 요청들의 행을 쓰기 스레드가 한 번에 INSERT/커밋
+#      (커밋 후 응답하므로 202 를 받은 이벤트는 유실되지 않음)
+#
+# 배치 (process_pos_webhooks):
+# 1) 미처리 행을 id 순으로 batch_size 만큼 잠금(SKIP LOCKED 지원 DB)해서 가져옴
+# 2) 본문 파싱 → (연결, 일자) / (캠페인, 일자) 별로 금액을 메모리에서 합산
+# 3) 없는 행은 ignore_conflicts 로 먼저 만들고, 대상 행을 pk 순으로 잠근 뒤
+#    합산값을 더해 bulk_update (여러 워커가 동시에 돌아도 증가분 유실 없음)
+#    - 반영 전에 (연결, event_id) 를 같은 트랜잭션에서 IdempotencyKey 로 선점
+#      → staging 행을 정리(--purge-days)한 뒤 늦게 온 재전송도 두 번 더하지 않음
+# 4) 처리한 이벤트 processed_at 표시 (형식 오류/중복은 error 에 사유)
+#
+# 이벤트 본문 예:
+#   {"type": "order.paid", "amount": 12000,
+#    "occurred_at": "2026-10-19T12:30:00+09:00", "campaign_id": 3}
+#   - type: order.paid | order.refunded
+#   - campaign_id(선택): 같은 매장(store_external_id) 캠페인이면 DailyPerformance.sales 반영
+# -----------------------------------------------------------------------------
+import hashlib
+import hmac
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django import db
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from campaigns.models import Campaign
+from reports.models import DailyPerformance
+
+from . import heartbeats, idempotency
+from .models import PosConnection, PosDailySales, PosWebhookEvent
+
+TIMESTAMP_HEADER = "HTTP_X_POS_TIMESTAMP"
+SIGNATURE_HEADER = "HTTP_X_POS_SIGNATURE"
+EVENT_ID_HEADER = "HTTP_X_POS_EVENT_ID"
+SIGNATURE_PREFIX = "sha256="
+
+EVENT_TYPES = {"order.paid", "order.refunded"}
+IDEMPOTENCY_SCOPE = "pos_webhook"
+
+
+class WebhookRejected(Exception):
+    """수신 거부 (status: 응답 코드)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ----------------------------
+# 서명
+# ----------------------------
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    mac = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256)
+    return SIGNATURE_PREFIX + mac.hexdigest()
+
+
+def verify(
+    secret: str,
+    timestamp: str,
+    signature: str,
+    body: bytes,
+    now: Optional[float] = None,
+) -> bool:
+    if not (secret and timestamp and signature):
+        return False
+    try:
+        ts = int(timestamp)
+    except ValueError:
+        return False
+    now = time.time() if now is None else now
+    if abs(now - ts) > settings.POS_WEBHOOK_TOLERANCE_SECONDS:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), signature)
+
+
+# ----------------------------
+# 연결 서명 키 캐시
+# ----------------------------
+_secrets: Dict[str, Tuple[float, Optional[int], str]] = {}
+_secrets_lock = threading.Lock()
+
+
+def lookup(public_id: str) -> Tuple[Optional[int], str]:
+    """public_id → (연결 id, 서명 키) — 활성 연결이 아니면 (None, "", 캐시 안 함)"""
+    hit = _secrets.get(public_id)
+    now = time.monotonic()
+    if hit is not None and hit[0] > now:
+        return hit[1], hit[2]
+    row = (
+        PosConnection.objects.filter(public_id=public_id, status="active")
+        .values_list("id", "webhook_signing_secret")
+        .first()
+    )
+    if row is None:
+        return None, ""
+    conn_id, secret = row
+    with _secrets_lock:
+        _secrets[public_id] = (
+            now + settings.POS_WEBHOOK_SECRET_CACHE_TTL,
+            conn_id,
+            secret,
+        )
+    return conn_id, secret
+
+
+def forget(public_id: str) -> None:
+    """연결 해제/키 변경 시 이 프로세스 캐시에서 제거"""
+    with _secrets_lock:
+        _secrets.pop(public_id, None)
+
+
+# ----------------------------
+# 수신
+# ----------------------------
+def receive(public_id: str, meta: Dict, body: bytes) -> str:
+    """
+    서명 검증 후 staging 적재, event_id 반환
+    실패 시 WebhookRejected(401/404/413)
+    """
+    if len(body) > settings.POS_WEBHOOK_MAX_BODY_BYTES:
+        raise WebhookRejected(413, "Payload too large")
+    conn_id, secret = lookup(public_id)
+    if conn_id is None:
+        raise WebhookRejected(404, "POS connection not found")
+    if not verify(
+        secret, meta.get(TIMESTAMP_HEADER, ""), meta.get(SIGNATURE_HEADER, ""), body
+    ):
+        raise WebhookRejected(401, "Invalid signature")
+
+    event_id = (meta.get(EVENT_ID_HEADER) or "")[:100]
+    if not event_id:
+        event_id = hashlib.sha256(body).hexdigest()
+    idem_key = f"{conn_id}:{event_id}"
+    if idempotency.seen(IDEMPOTENCY_SCOPE, idem_key):
+        return event_id  # 재전송: 이미 적재함
+    event = PosWebhookEvent(
+        connection_id=conn_id,
+        event_id=event_id,
+        body=body.decode("utf-8", errors="replace"),
+    )
+    if settings.POS_WEBHOOK_GROUP_COMMIT:
+        _writer.submit(event)
+    else:
+        PosWebhookEvent.objects.bulk_create([event], ignore_conflicts=True)
+    idempotency.remember(IDEMPOTENCY_SCOPE, idem_key)
+    return event_id
+
+
+class _GroupWriter:
+    """
+    staging INSERT 그룹 커밋
+    - 요청 스레드는 행을 큐에 넣고 커밋될 때까지 대기 (응답 전 영속화 보장)
+    - 쓰기 스레드 1개가 쌓인 행을 모아 INSERT 1번 + 커밋 1번
+    - 쓰기 스레드는 요청 주기 밖이라 배치마다 close_old_connections()
+      (CONN_MAX_AGE 가 지났거나 끊긴 연결을 정리)
+    - 대기 시간을 일부러 두지 않음: 직전 커밋 중에 도착한 요청끼리 자연스럽게 묶임
+      (동시 요청이 없으면 단건 INSERT 와 같음)
+    """
+
+    def __init__(self, max_batch: int = 500):
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, event: PosWebhookEvent) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="pos-webhook-writer", daemon=True
+                    )
+                    self._thread.start()
+        done = threading.Event()
+        slot = [done, None]
+        self._queue.put((event, slot))
+        done.wait()
+        if slot[1] is not None:
+            raise slot[1]
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            db.close_old_connections()
+            error = None
+            try:
+                PosWebhookEvent.objects.bulk_create(
+                    [event for event, _ in items], ignore_conflicts=True
+                )
+            except Exception as e:  # 요청 스레드로 전달 → 500, 연결은 새로 맺음
+                error = e
+                db.connection.close()
+            for _, slot in items:
+                slot[1] = error
+                slot[0].set()
+
+
+_writer = _GroupWriter()
+
+
+# ----------------------------
+# 배치 반영
+# ----------------------------
+def parse_event(body: str, received_at):
+    """본문 → (type, 금액, 일자, campaign_id) (형식 오류는 ValueError)"""
+    return parse_record(json.loads(body), received_at)
+
+
+def parse_record(data: Dict, default_at):
+    """
+    매출 레코드 dict → (type, 금액, 일자, campaign_id)
+    - 웹훅 본문과 벤더 매출 API(백필) 레코드가 같은 형식
+    - occurred_at 이 없으면 default_at 기준
+    """
+    if not isinstance(data, dict):
+        raise ValueError("body must be a JSON object")
+    kind = data.get("type")
+    if kind not in EVENT_TYPES:
+        raise ValueError(f"unknown type: {kind}")
+    amount = data.get("amount")
+    if isinstance(amount, bool) or not isinstance(amount, int) or amount < 0:
+        raise ValueError("amount must be a non-negative integer")
+
+    occurred = default_at
+    if data.get("occurred_at"):
+        occurred = parse_datetime(str(data["occurred_at"]))
+        if occurred is None:
+            raise ValueError("occurred_at must be ISO 8601")
+        if timezone.is_naive(occurred):
+            occurred = timezone.make_aware(occurred)
+    campaign_id = data.get("campaign_id")
+    if campaign_id is not None and not isinstance(campaign_id, int):
+        raise ValueError("campaign_id must be an integer")
+    return kind, amount, timezone.localdate(occurred), campaign_id
+
+
+def add_daily_sales(deltas: Dict[Tuple[int, object], List[int]], stores: Dict) -> int:
+    """
+    (연결 id, 일자) → [sales, refunds, orders] 증가분을 PosDailySales 에 더함
+    - 트랜잭션 안에서 호출 (행 잠금), 백필(pos_backfill)도 사용
+    """
+    if not deltas:
+        return 0
+    PosDailySales.objects.bulk_create(
+        [
+            PosDailySales(connection_id=c, store_external_id=stores[c], date=d)
+            for c, d in deltas
+        ],
+        ignore_conflicts=True,
+    )
+    rows = list(
+        PosDailySales.objects.select_for_update()
+        .filter(
+            connection_id__in={c for c, _ in deltas},
+            date__in={d for _, d in deltas},
+        )
+        .order_by("pk")
+    )
+    changed = []
+    now = timezone.now()
+    for row in rows:
+        delta = deltas.get((row.connection_id, row.date))
+        if delta is None:
+            continue
+        row.sales += delta[0]
+        row.refunds += delta[1]
+        row.orders += delta[2]
+        row.updated_at = now
+        changed.append(row)
+    PosDailySales.objects.bulk_update(
+        changed, ["sales", "refunds", "orders", "updated_at"]
+    )
+    return len(changed)
+
+
+def _apply_performance(deltas: Dict[Tuple[int, object], int]) -> int:
+    """(캠페인 id, 일자) → 매출 증감을 DailyPerformance.sales 에 반영 (0 미만 불가)"""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return 0
+    DailyPerformance.objects.bulk_create(
+        [DailyPerformance(campaign_id=c, date=d) for c, d in deltas],
+        ignore_conflicts=True,
+    )
+    rows = list(
+        DailyPerformance.objects.select_for_update()
+        .filter(
+            campaign_id__in={c for c, _ in deltas},
+            date__in={d for _, d in deltas},
+        )
+        .order_by("pk")
+    )
+    changed = []
+    for row in rows:
+        delta = deltas.get((row.campaign_id, row.date))
+        if delta is None:
+            continue
+        row.sales = max(0, row.sales + delta)
+        changed.append(row)
+    DailyPerformance.objects.bulk_update(changed, ["sales"])
+    return len(changed)
+
+
+def process_pending(batch_size: int = 1000) -> Dict[str, int]:
+    """
+    미처리 이벤트 최대 batch_size 건을 한 트랜잭션으로 반영
+    통계 dict 반환: events, applied, invalid, duplicates, sales_rows, performance_rows
+    """
+    stats = {
+        "events": 0,
+        "applied": 0,
+        "invalid": 0,
+        "duplicates": 0,
+        "sales_rows": 0,
+        "performance_rows": 0,
+    }
+    with transaction.atomic():
+        events = list(
+            PosWebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True)
+            .order_by("id")
+            .only("id", "connection_id", "event_id", "body", "received_at")[:batch_size]
+        )
+        if not events:
+            return stats
+        stats["events"] = len(events)
+
+        conn_ids = {e.connection_id for e in events}
+        stores = dict(
+            PosConnection.objects.filter(id__in=conn_ids).values_list(
+                "id", "store_external_id"
+            )
+        )
+
+        parsed = []
+        invalid: List[PosWebhookEvent] = []
+        for event in events:
+            try:
+                parsed.append((event, parse_event(event.body, event.received_at)))
+            except (ValueError, TypeError) as e:
+                event.error = str(e)[:500]
+                invalid.append(event)
+
+        # 재전송 중복: 이미 반영한 (연결, event_id) 는 건너뜀
+        claimed = idempotency.claim_many(
+            IDEMPOTENCY_SCOPE, [f"{e.connection_id}:{e.event_id}" for e, _ in parsed]
+        )
+        duplicates: List[PosWebhookEvent] = []
+        fresh = []
+        for event, values in parsed:
+            if f"{event.connection_id}:{event.event_id}" in claimed:
+                fresh.append((event, values))
+            else:
+                event.error = "duplicate delivery"
+                duplicates.append(event)
+        parsed = fresh
+
+        # 캠페인 귀속은 같은 매장 캠페인만 인정
+        campaign_ids = {p[3] for _, p in parsed if p[3] is not None}
+        campaign_store = dict(
+            Campaign.objects.filter(id__in=campaign_ids).values_list(
+                "id", "store_external_id"
+            )
+        )
+
+        sales: Dict[Tuple[int, object], List[int]] = defaultdict(lambda: [0, 0, 0])
+        performance: Dict[Tuple[int, object], int] = defaultdict(int)
+        for event, (kind, amount, day, campaign_id) in parsed:
+            delta = sales[(event.connection_id, day)]
+            if kind == "order.paid":
+                delta[0] += amount
+                delta[2] += 1
+            else:
+                delta[1] += amount
+            store = stores.get(event.connection_id)
+            if campaign_id is not None and campaign_store.get(campaign_id) == store:
+                performance[(campaign_id, day)] += (
+                    amount if kind == "order.paid" else -amount
+                )
+
+        stats["sales_rows"] = add_daily_sales(sales, stores)
+        stats["performance_rows"] = _apply_performance(performance)
+
+        now = timezone.now()
+        PosWebhookEvent.objects.filter(id__in=[e.id for e, _ in parsed]).update(
+            processed_at=now
+        )
+        for event in invalid + duplicates:
+            event.processed_at = now
+        PosWebhookEvent.objects.bulk_update(
+            invalid + duplicates, ["processed_at", "error"]
+        )
+        stats["applied"] = len(parsed)
+        stats["invalid"] = len(invalid)
+        stats["duplicates"] = len(duplicates)
+
+        # 연결별 마지막 수신 시각 (헬스체크용)
+        last_seen: Dict[int, object] = {}
+        for event in events:
+            seen = last_seen.get(event.connection_id)
+            if seen is None or event.received_at > seen:
+                last_seen[event.connection_id] = event.received_at
+        heartbeats.write(last_seen)
+    return stats
+
+
+def purge_processed(older_than) -> int:
+    """반영이 끝난 지 오래된 staging 행 삭제"""
+    deleted, _ = PosWebhookEvent.objects.filter(
+        processed_at__isnull=False, processed_at__lt=older_than
+    ).delete()
+    return deleted
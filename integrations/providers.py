@@ -0,0 +1,456 @@
+# integrations/providers.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 외부 프로바이더(Facebook / Instagram Graph API) HTTP 호출 어댑터
+#
+# 특징:
+# - 프로바이더마다 어댑터 1개 = requests.Session 1개 (커넥션 풀, keep-alive)
+# - 타임아웃 (connect, read) 분리 설정
+# - 재시도: 연결 오류 / 429 / 5xx → 지수 백오프 + full jitter (429 는 Retry-After 우선)
+#   · POST 는 요청이 전달되지 않은 연결 오류만 재시도 (code 교환은 1회용)
+# - 서킷 브레이커: 연속 실패 breaker_failures 회 → breaker_reset 초 동안 즉시 실패
+#   → 이후 1건만 시험(half-open), 성공하면 닫힘
+#   · 429 는 프로바이더가 정상 응답한 것 → 실패로 세지 않음 (속도 제한은 rate_limits 가 담당)
+#   · 브레이커를 속도 제한보다 먼저 확인 → 열려 있으면 토큰을 쓰거나 기다리지 않고 바로 실패
+# - 영구 실패(permanent) 판정: OAuth2 invalid_grant 계열, Graph 는 code 190(토큰 무효)만
+#   · Graph 속도 제한(4/17/32/613/80xxx), 2500, is_transient=true 등은 일시 실패
+# - 토큰 갱신: Facebook 은 fb_exchange_token, Instagram 은 ig_refresh_token
+#   (Graph 에는 refresh_token 이 없으므로 장기 access_token 자체를 다시 교환)
+# - 프로바이더별 지연 시간 통계 (건수/오류/평균/p50/p95/최대)
+# - 속도 제한: 시도마다 rate_limits 토큰 버킷(프로바이더 + account)에서 차감
+#   · 429 는 버킷을 Retry-After 만큼 비워 다른 워커도 같이 대기
+#   · limited=False: 버킷(DB)을 건드리지 않음 → 호출 쪽이 메인 스레드에서 미리 차감하고
+#     워커 스레드에서는 HTTP 만 하는 경우 (token_refresh)
+#
+# 설정:
+# - INTEGRATIONS_OAUTH[code]["graph_base"] 가 비어 있으면 services 의 더미 응답 사용
+# - INTEGRATIONS_HTTP: 타임아웃/재시도/풀 크기/브레이커 값
+#
+# 로컬 테스트:
+#   poetry run python manage.py run_token_stub_server --port 8766
+#   FB_GRAPH_BASE=http://127.0.0.1:8766 IG_GRAPH_BASE=http://127.0.0.1:8766 ...
+# -----------------------------------------------------------------------------
+import random
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Dict, Optional, Type
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from . import rate_limits
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+_PERMANENT_ERRORS = {"invalid_grant", "invalid_token", "unauthorized_client"}
+# Graph API error.code: 190 = access token 무효/만료/해지 (다른 코드는 재시도/재요청 대상)
+_GRAPH_PERMANENT_CODES = {190}
+
+
+class ProviderError(Exception):
+    """
+    프로바이더 호출 실패
+    - permanent=True: 토큰/코드 자체가 무효 → 재시도해도 실패
+    - permanent=False: 네트워크/5xx/429/브레이커 열림 등 일시적 실패
+    - status: 응답이 있었으면 HTTP 상태 코드
+    """
+
+    def __init__(
+        self, message: str, permanent: bool = False, status: Optional[int] = None
+    ):
+        super().__init__(message)
+        self.permanent = permanent
+        self.status = status
+
+
+def graph_error(code: str, error: Dict, status: Optional[int] = None) -> ProviderError:
+    """Graph API {"error": {...}} → ProviderError (code 190 만 영구 실패, is_transient 우선)"""
+    try:
+        error_code = int(error.get("code"))
+    except (TypeError, ValueError):
+        error_code = None
+    permanent = not error.get("is_transient") and error_code in _GRAPH_PERMANENT_CODES
+    return ProviderError(
+        f"{code}: {error.get('message') or status or 'request failed'}",
+        permanent=permanent,
+        status=status,
+    )
+
+
+class ProviderUnavailable(ProviderError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+# ----------------------------
+# 서킷 브레이커
+# ----------------------------
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failures: int, reset_after: float):
+        self.failures = max(1, failures)
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self._count = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_after:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial = False
+            # half-open: 동시에 1건만 시험
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._count = 0
+            self._trial = False
+
+    def release(self) -> None:
+        """결과를 세지 않고 half-open 시험 자리만 반납 (429, 호출 전 포기)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._count += 1
+            if self.state == self.HALF_OPEN or self._count >= self.failures:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
+# ----------------------------
+# 지연 시간 통계
+# ----------------------------
+class LatencyStats:
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.count += 1
+            self.errors += 0 if ok else 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            count, errors, total, top = self.count, self.errors, self.total, self.max
+
+        def pct(p):
+            return recent[min(len(recent) - 1, int(len(recent) * p))] if recent else 0
+
+        return {
+            "count": count,
+            "errors": errors,
+            "avg_ms": round(total / count * 1000, 1) if count else 0,
+            "p50_ms": round(pct(0.50) * 1000, 1),
+            "p95_ms": round(pct(0.95) * 1000, 1),
+            "max_ms": round(top * 1000, 1),
+        }
+
+
+# ----------------------------
+# 어댑터
+# ----------------------------
+class ProviderAdapter:
+    """OAuth2 + Graph 형태의 공통 호출 (프로바이더별로 상속해 경로/필드만 바꿈)"""
+
+    code = ""
+    # True: refresh_token 이 따로 없고 장기 access_token 으로 다시 교환 (Graph)
+    # → 연결 시 access_token 을 refresh_token 으로도 저장해 선제 갱신 대상이 되게 함
+    self_refreshing = False
+
+    def __init__(self, conf: Dict, http: Dict):
+        self.conf = conf
+        self.graph_base = (conf.get("graph_base") or "").rstrip("/")
+        self.timeout = (http["connect_timeout"], http["read_timeout"])
+        self.retries = max(0, http["retries"])
+        self.backoff = http["backoff"]
+        self.backoff_cap = http["backoff_cap"]
+        self.breaker = CircuitBreaker(http["breaker_failures"], http["breaker_reset"])
+        self.latency = LatencyStats()
+
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=http["pool_size"], max_retries=0
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.graph_base)
+
+    @property
+    def can_refresh(self) -> bool:
+        return bool(self.graph_base or self.conf.get("token_url"))
+
+    # ---- 저수준 호출 ----
+    def _retry_delay(self, attempt: int, resp=None) -> float:
+        retry_after = resp is not None and resp.headers.get("Retry-After")
+        if retry_after and str(retry_after).isdigit():
+            return min(self.backoff_cap, float(retry_after))
+        return random.uniform(0, min(self.backoff_cap, self.backoff * 2**attempt))
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        idempotent: Optional[bool] = None,
+        account: str = "",
+        limited: bool = True,
+        **kwargs,
+    ) -> Dict:
+        """
+        idempotent: 5xx 재시도 허용 여부 (기본: GET 만, 읽기 전용 batch POST 는 True)
+        account: 속도 제한 버킷을 나눌 계정 (광고 계정 등, 없으면 프로바이더 전체)
+        limited: False 면 속도 제한 버킷을 쓰지 않음 (호출 쪽이 이미 차감, DB 접근 없음)
+        """
+        url = path if path.startswith("http") else f"{self.graph_base}{path}"
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+        last_error: Optional[ProviderError] = None
+        for attempt in range(self.retries + 1):
+            # 브레이커 먼저: 열려 있으면 속도 제한 토큰을 쓰거나 기다리지 않음
+            if not self.breaker.allow():
+                raise ProviderUnavailable(f"{self.code}: circuit open")
+            if limited and not rate_limits.acquire(self.code, account):
+                self.breaker.release()  # half-open 시험 자리 반납
+                raise ProviderError(f"{self.code}: rate limit wait exceeded")
+            started = time.perf_counter()
+            resp = None
+            try:
+                resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except requests.ConnectionError as e:
+                # 연결 자체가 안 된 경우는 POST 도 재시도 가능
+                last_error = ProviderError(f"{self.code}: {e}")
+                retryable = True
+            except requests.RequestException as e:
+                last_error = ProviderError(f"{self.code}: {e}")
+                retryable = idempotent
+            else:
+                if resp.status_code < 400:
+                    self.latency.record(time.perf_counter() - started, ok=True)
+                    self.breaker.record_success()
+                    try:
+                        return resp.json()
+                    except ValueError:
+                        raise ProviderError(f"{self.code}: invalid JSON response")
+                if resp.status_code not in _RETRY_STATUS:
+                    # 4xx: 프로바이더는 정상 → 브레이커에 실패로 세지 않음
+                    self.latency.record(time.perf_counter() - started, ok=True)
+                    self.breaker.record_success()
+                    raise self._client_error(resp)
+                last_error = ProviderError(
+                    f"{self.code}: HTTP {resp.status_code}", status=resp.status_code
+                )
+                retryable = idempotent or resp.status_code == 429
+
+            self.latency.record(time.perf_counter() - started, ok=False)
+            if resp is not None and resp.status_code == 429:
+                # 속도 제한은 장애가 아님 → 연속 실패에 넣지 않음 (half-open 시험만 반납)
+                self.breaker.release()
+            else:
+                self.breaker.record_failure()
+            if not retryable or attempt >= self.retries:
+                break
+            delay = self._retry_delay(attempt, resp)
+            if resp is not None and resp.status_code == 429:
+                # 공유 버킷을 비우면 다음 acquire 가 대신 기다림
+                if limited and rate_limits.penalize(self.code, account, delay):
+                    continue
+            time.sleep(delay)
+        raise last_error
+
+    def _client_error(self, resp) -> ProviderError:
+        try:
+            data = resp.json()
+        except ValueError:
+            data = {}
+        error = data.get("error")
+        if isinstance(error, dict):  # Graph API: {"error": {"message", "code", ...}}
+            return graph_error(self.code, error, resp.status_code)
+        return ProviderError(
+            f"{self.code}: {error or resp.status_code} "
+            f"{data.get('error_description', '')}".rstrip(),
+            permanent=error in _PERMANENT_ERRORS,
+            status=resp.status_code,
+        )
+
+    @staticmethod
+    def _expires_at(data: Dict):
+        expires_in = int(data.get("expires_in") or 0)
+        return timezone.now() + timedelta(seconds=expires_in) if expires_in else None
+
+    # ---- OAuth ----
+    def exchange_code(self, code: str, redirect_uri: Optional[str]) -> Dict:
+        data = self.request(
+            "GET",
+            "/oauth/access_token",
+            params={
+                "client_id": self.conf.get("client_id", ""),
+                "client_secret": self.conf.get("client_secret", ""),
+                "redirect_uri": redirect_uri or "",
+                "code": code,
+            },
+        )
+        fallback = data["access_token"] if self.self_refreshing else ""
+        return {
+            "access_token": data["access_token"],
+            "refresh_token": data.get("refresh_token") or fallback,
+            "expires_at": self._expires_at(data),
+            "granted_scopes": data.get("granted_scopes", []),
+        }
+
+    def refresh_token(self, refresh_token: str, limited: bool = True) -> Dict:
+        token_url = self.conf.get("token_url") or "/oauth/token"
+        data = self.request(
+            "POST",
+            token_url,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": self.conf.get("client_id", ""),
+                "client_secret": self.conf.get("client_secret", ""),
+            },
+            limited=limited,
+        )
+        return self._refreshed(data, data.get("refresh_token") or refresh_token)
+
+    def _refreshed(self, data: Dict, refresh_token: str) -> Dict:
+        if not data.get("access_token"):
+            raise ProviderError(f"{self.code}: no access_token in response")
+        return {
+            "access_token": data["access_token"],
+            "refresh_token": refresh_token,
+            "expires_at": self._expires_at(data),
+        }
+
+    def fetch_account(self, access_token: str) -> Dict:
+        data = self.request(
+            "GET",
+            "/me",
+            params={"fields": "id,name", "access_token": access_token},
+        )
+        return {
+            "id": str(data["id"]),
+            "name": data.get("name", ""),
+            "handle": "",
+            "business": False,
+        }
+
+    def metrics(self) -> Dict:
+        return {**self.latency.snapshot(), "breaker": self.breaker.state}
+
+
+class FacebookAdapter(ProviderAdapter):
+    code = "facebook"
+    self_refreshing = True
+
+    def refresh_token(self, refresh_token: str, limited: bool = True) -> Dict:
+        # 장기 사용자 토큰 → 새 장기 토큰 (새 토큰이 다음 갱신의 refresh_token)
+        data = self.request(
+            "GET",
+            self.conf.get("token_url") or "/oauth/access_token",
+            params={
+                "grant_type": "fb_exchange_token",
+                "client_id": self.conf.get("client_id", ""),
+                "client_secret": self.conf.get("client_secret", ""),
+                "fb_exchange_token": refresh_token,
+            },
+            limited=limited,
+        )
+        return self._refreshed(data, data.get("access_token", ""))
+
+
+class InstagramAdapter(ProviderAdapter):
+    code = "instagram"
+    self_refreshing = True
+
+    def refresh_token(self, refresh_token: str, limited: bool = True) -> Dict:
+        # 만료 전 장기 토큰 → 60일 연장된 새 토큰
+        data = self.request(
+            "GET",
+            self.conf.get("token_url") or "/refresh_access_token",
+            params={"grant_type": "ig_refresh_token", "access_token": refresh_token},
+            limited=limited,
+        )
+        return self._refreshed(data, data.get("access_token", ""))
+
+    def fetch_account(self, access_token: str) -> Dict:
+        data = self.request(
+            "GET",
+            "/me",
+            params={
+                "fields": "id,username,name,account_type",
+                "access_token": access_token,
+            },
+        )
+        username = data.get("username", "")
+        return {
+            "id": str(data["id"]),
+            "name": data.get("name") or username,
+            "handle": f"@{username}" if username else "",
+            "business": data.get("account_type") in ("BUSINESS", "MEDIA_CREATOR"),
+        }
+
+
+ADAPTERS: Dict[str, Type[ProviderAdapter]] = {
+    "facebook": FacebookAdapter,
+    "instagram": InstagramAdapter,
+}
+
+_instances: Dict[str, ProviderAdapter] = {}
+_instances_lock = threading.Lock()
+
+
+def get_adapter(provider: str) -> ProviderAdapter:
+    """프로바이더별 어댑터 (프로세스당 1개 → 세션/브레이커/통계 공유)"""
+    adapter = _instances.get(provider)
+    if adapter is not None:
+        return adapter
+    with _instances_lock:
+        adapter = _instances.get(provider)
+        if adapter is None:
+            conf = getattr(settings, "INTEGRATIONS_OAUTH", {}).get(provider) or {}
+            cls = ADAPTERS.get(provider, ProviderAdapter)
+            adapter = _instances[provider] = cls(conf, settings.INTEGRATIONS_HTTP)
+            adapter.code = adapter.code or provider
+    return adapter
+
+
+def reset_adapters() -> None:
+    """설정이 바뀐 뒤(테스트 등) 어댑터를 다시 만들도록 비움"""
+    with _instances_lock:
+        for adapter in _instances.values():
+            adapter.session.close()
+        _instances.clear()
+
+
+def metrics() -> Dict[str, Dict]:
+    """{provider: 지연 시간 통계 + 브레이커 상태} (이 프로세스에서 호출한 것만)"""
+    return {code: adapter.metrics() for code, adapter in sorted(_instances.items())}
@@ -0,0 +1,195 @@
+# integrations/rate_limits.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 외부 프로바이더 호출 속도 제한 (프로바이더 + 계정 단위 토큰 버킷)
+#   → gunicorn 워커 여러 개 + 배치 명령이 동시에 호출해도 합계가 한도를 넘지 않음
+#
+# 방식:
+# - 버킷 상태는 RateLimitBucket 행 1개 (tokens, refilled_at) → 모든 프로세스가 공유
+# - 차감은 조건부 UPDATE 한 번 (읽고-쓰기 경합 없음, 행 잠금 시간 최소)
+#     tokens = min(burst, tokens + 경과초 * rate) - cost
+#     WHERE key = ? AND min(burst, tokens + 경과초 * rate) >= cost
+#   → 1행 갱신이면 통과, 아니면 남은 토큰을 읽어 "몇 초 뒤 가능한지" 계산
+# - 429 를 받으면 penalize() 로 버킷을 음수로 만들어 다른 워커도 같이 쉼
+#
+# 사용:
+# - try_acquire(): 기다리지 않음 (True/False)
+# - acquire(): 토큰이 생길 때까지 sleep (최대 max_wait 초)
+# - aacquire(): asyncio 용 (DB 접근은 sync_to_async, 대기는 asyncio.sleep)
+# - ProviderAdapter.request() 가 시도마다 acquire → 어댑터 호출은 자동 적용
+#
+# 설정: PROVIDER_RATE_LIMITS (설정 없는 프로바이더는 제한 없음, DB 접근도 없음)
+# -----------------------------------------------------------------------------
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Least
+from django.db.models.lookups import GreaterThanOrEqual
+
+from .models import RateLimitBucket
+
+_stats: Dict[str, Dict[str, float]] = defaultdict(
+    lambda: {"granted": 0, "throttled": 0, "timeouts": 0, "waited_s": 0.0}
+)
+_stats_lock = threading.Lock()
+
+
+def limit_for(code: str) -> Optional[Tuple[float, float]]:
+    """프로바이더 code → (rate, burst), "pos:brand_a" 는 "pos" 설정도 확인"""
+    limits = getattr(settings, "PROVIDER_RATE_LIMITS", {})
+    conf = limits.get(code) or limits.get(code.partition(":")[0])
+    if not conf or conf.get("rate", 0) <= 0:
+        return None
+    return float(conf["rate"]), max(1.0, float(conf.get("burst") or conf["rate"]))
+
+
+def bucket_key(code: str, account: str = "") -> str:
+    return f"{code}:{account}" if account else code
+
+
+def _count(key: str, field: str, amount: float = 1) -> None:
+    with _stats_lock:
+        _stats[key][field] += amount
+
+
+# ----------------------------
+# 차감
+# ----------------------------
+def _take(code: str, account: str = "", cost: float = 1.0) -> float:
+    """토큰 차감 시도 → 0.0 이면 통과, 아니면 다시 시도할 때까지 기다릴 초"""
+    limit = limit_for(code)
+    if limit is None:
+        return 0.0
+    rate, burst = limit
+    if cost > burst:
+        raise ValueError(f"cost {cost} exceeds burst {burst} for {code}")
+    key = bucket_key(code, account)
+
+    for _ in range(2):
+        now = time.time()
+        available = Least(
+            Value(burst),
+            F("tokens") + Greatest(Value(now) - F("refilled_at"), Value(0.0)) * rate,
+        )
+        granted = (
+            RateLimitBucket.objects.filter(key=key)
+            .filter(GreaterThanOrEqual(available, cost))
+            .update(
+                tokens=available - cost,
+                refilled_at=Greatest(F("refilled_at"), Value(now)),
+            )
+        )
+        if granted:
+            _count(key, "granted")
+            return 0.0
+        row = (
+            RateLimitBucket.objects.filter(key=key)
+            .values_list("tokens", "refilled_at")
+            .first()
+        )
+        if row is not None:
+            tokens, refilled_at = row
+            tokens = min(burst, tokens + max(0.0, now - refilled_at) * rate)
+            _count(key, "throttled")
+            return max(0.001, (cost - tokens) / rate)
+        # 첫 호출: 가득 찬 버킷 생성 (동시에 만들면 한쪽은 무시) 후 다시 차감
+        RateLimitBucket.objects.bulk_create(
+            [RateLimitBucket(key=key, tokens=burst, refilled_at=now)],
+            ignore_conflicts=True,
+        )
+    return 1.0 / rate
+
+
+def try_acquire(code: str, account: str = "", cost: float = 1.0) -> bool:
+    """기다리지 않고 토큰 차감 (없으면 False)"""
+    return _take(code, account, cost) == 0.0
+
+
+def _jitter(code: str) -> float:
+    # 같은 시각에 깨어난 워커들이 한꺼번에 UPDATE 하지 않도록 토큰 1개 간격 안에서 분산
+    limit = limit_for(code)
+    return random.uniform(0, 1.0 / limit[0]) if limit else 0.0
+
+
+def acquire(
+    code: str,
+    account: str = "",
+    cost: float = 1.0,
+    max_wait: Optional[float] = None,
+) -> bool:
+    """토큰이 생길 때까지 대기 후 차감, max_wait 초 안에 못 얻으면 False"""
+    max_wait = settings.PROVIDER_RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+    deadline = time.monotonic() + max_wait
+    key = bucket_key(code, account)
+    while True:
+        wait = _take(code, account, cost)
+        if not wait:
+            return True
+        wait += _jitter(code)
+        if time.monotonic() + wait > deadline:
+            _count(key, "timeouts")
+            return False
+        _count(key, "waited_s", wait)
+        time.sleep(wait)
+
+
+async def aacquire(
+    code: str,
+    account: str = "",
+    cost: float = 1.0,
+    max_wait: Optional[float] = None,
+) -> bool:
+    """acquire() 의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+    if limit_for(code) is None:
+        return True
+    max_wait = settings.PROVIDER_RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+    deadline = time.monotonic() + max_wait
+    key = bucket_key(code, account)
+    take = sync_to_async(_take)
+    while True:
+        wait = await take(code, account, cost)
+        if not wait:
+            return True
+        wait += _jitter(code)
+        if time.monotonic() + wait > deadline:
+            _count(key, "timeouts")
+            return False
+        _count(key, "waited_s", wait)
+        await asyncio.sleep(wait)
+
+
+def penalize(code: str, account: str, seconds: float) -> bool:
+    """
+    429(Retry-After) 를 받았을 때: seconds 동안 토큰이 생기지 않도록 버킷을 비움
+    (제한 설정이 없는 프로바이더면 False → 호출 쪽이 직접 기다림)
+    """
+    limit = limit_for(code)
+    if limit is None:
+        return False
+    now = time.time()
+    key = bucket_key(code, account)
+    RateLimitBucket.objects.bulk_create(
+        [RateLimitBucket(key=key, tokens=limit[1], refilled_at=now)],
+        ignore_conflicts=True,
+    )
+    RateLimitBucket.objects.filter(key=key).update(
+        tokens=Least(F("tokens"), Value(-max(0.0, seconds) * limit[0])),
+        refilled_at=Greatest(F("refilled_at"), Value(now)),
+    )
+    return True
+
+
+def metrics() -> Dict[str, Dict]:
+    """{버킷 키: 통과/대기/시간초과 건수, 대기 초} (이 프로세스 기준)"""
+    with _stats_lock:
+        return {
+            key: {**value, "waited_s": round(value["waited_s"], 2)}
+            for key, value in sorted(_stats.items())
+        }
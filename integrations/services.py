@@ -6,6 +6,8 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils import timezone
 
+from .providers import get_adapter
+
 
 def _get_provider_conf(provider: str) -> dict:
     conf = getattr(settings, "INTEGRATIONS_OAUTH", {}).get(provider)
@@ -39,16 +41,20 @@ def build_oauth_url(
 
 # ---
 
-# 실제 연동 시, 여기서 provider별 토큰 교환/계정 조회 API를 호출하도록 교체
+# 프로바이더 호출은 integrations.providers 어댑터로 (풀링/재시도/서킷 브레이커)
+# INTEGRATIONS_OAUTH[provider]["graph_base"] 가 비어 있으면 아래 더미 응답 사용 (개발용)
 
 
 def exchange_code_for_token(
     provider: str, code: str, redirect_uri: Optional[str] = None
 ) -> Dict:
     """
-    더미: code -> access_token 교환
-    실제 구현에서는 provider별 토큰 엔드포인트 호출
+    code -> access_token 교환
+    실패 시 ProviderError (permanent=True 면 code 무효)
     """
+    adapter = get_adapter(provider)
+    if adapter.enabled:
+        return adapter.exchange_code(code, redirect_uri)
     return {
         "access_token": f"access_{provider}_{code}",
         "refresh_token": f"refresh_{provider}_{code}",
@@ -59,9 +65,12 @@ def exchange_code_for_token(
 
 def fetch_account_info(provider: str, access_token: str) -> Dict:
     """
-    더미: access_token으로 계정 기본 정보 조회
-    실제 구현에서는 provider Graph/API 호출
+    access_token으로 계정 기본 정보 조회
+    반환: {"id", "name", "handle", "business"}
     """
+    adapter = get_adapter(provider)
+    if adapter.enabled:
+        return adapter.fetch_account(access_token)
     # 예시 Instagram 비즈니스 계정 정보
     return {
         "id": "17841400000000000",
@@ -69,3 +78,26 @@ def fetch_account_info(provider: str, access_token: str) -> Dict:
         "handle": "@brand_official",
         "business": True,
     }
+
+
+# --- 토큰 갱신
+
+
+def refresh_access_token(
+    provider: str, refresh_token: str, limited: bool = True
+) -> Dict:
+    """
+    refresh_token -> 새 access_token (OAuth2 refresh_token grant)
+    - 반환: {"access_token", "refresh_token"(없으면 기존 값), "expires_at"}
+    - 실패 시 ProviderError (permanent=True 면 refresh_token 무효)
+    - limited=False: 속도 제한 토큰은 호출 쪽이 이미 차감 (워커 스레드용)
+    """
+    adapter = get_adapter(provider)
+    if adapter.can_refresh:
+        return adapter.refresh_token(refresh_token, limited=limited)
+    now = timezone.now()
+    return {
+        "access_token": f"{provider}_access_{int(now.timestamp())}",
+        "refresh_token": refresh_token,
+        "expires_at": now + timedelta(days=60),
+    }
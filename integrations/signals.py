@@ -0,0 +1,29 @@
+# integrations/signals.py
+# -----------------------------------------------------------------------------
+# 프로바이더 카탈로그(integrations.catalog) 무효화
+# - Provider / PosProvider 저장·삭제(관리자 화면, 시드 등) → 커밋 후 스냅샷 폐기
+#   (커밋 전에 다시 읽으면 바뀌기 전 값이 캐시되므로 on_commit)
+# -----------------------------------------------------------------------------
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import catalog
+from .models import PosProvider, Provider
+
+
+def _invalidate_catalog(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(catalog.invalidate)
+
+
+def connect_catalog_signals():
+    """시그널 중복 연결 방지 + 연결"""
+    pairs = [
+        (post_save, _invalidate_catalog, Provider),
+        (post_delete, _invalidate_catalog, Provider),
+        (post_save, _invalidate_catalog, PosProvider),
+        (post_delete, _invalidate_catalog, PosProvider),
+    ]
+    for signal, handler, sender in pairs:
+        uid = f"integrations_{handler.__name__}_{sender.__name__}"
+        signal.connect(handler, sender=sender, dispatch_uid=uid, weak=False)
@@ -1,3 +1,97 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from integrations import providers, rate_limits, token_refresh
+from integrations.models import Integration, Provider, RateLimitBucket
+
+GRAPH_BASE = "https://graph.test.local/v20.0"
+
+
+class _ExchangeTransport(BaseAdapter):
+    """fb_exchange_token 요청에 새 장기 토큰으로 응답하는 가짜 전송 어댑터"""
+
+    def send(self, request, **kwargs):
+        resp = Response()
+        resp.status_code = 200
+        resp.headers["Content-Type"] = "application/json"
+        resp._content = json.dumps(
+            {"access_token": "fresh-token", "expires_in": 5184000}
+        ).encode()
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+@override_settings(
+    INTEGRATIONS_OAUTH={"facebook": {"graph_base": GRAPH_BASE}},
+    PROVIDER_RATE_LIMITS={"facebook": {"rate": 0.01, "burst": 10}},
+)
+class RefreshDueRateLimitTests(TestCase):
+    """속도 제한이 설정된 상태의 refresh_due: 버킷 차감은 메인 스레드에서만"""
+
+    def setUp(self):
+        providers.reset_adapters()
+        self.addCleanup(providers.reset_adapters)
+        providers.get_adapter("facebook").session.mount(
+            "https://", _ExchangeTransport()
+        )
+        user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="x"
+        )
+        provider = Provider.objects.create(code="facebook", label="Facebook")
+        soon = timezone.now() + timedelta(minutes=5)
+        for i in range(4):
+            Integration.objects.create(
+                user=user,
+                provider=provider,
+                public_id=f"fb-{i}",
+                account_id=str(i),
+                access_token=f"old-{i}",
+                refresh_token=f"old-{i}",
+                token_expires_at=soon,
+            )
+
+    def test_tokens_taken_on_main_thread(self):
+        threads = []
+        take = rate_limits._take
+
+        def recording_take(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return take(*args, **kwargs)
+
+        with mock.patch.object(rate_limits, "_take", recording_take):
+            stats = token_refresh.refresh_due(
+                window=timedelta(minutes=30), max_workers=4
+            )
+
+        self.assertEqual(stats["refreshed"], 4)
+        self.assertEqual(stats["failed"], 0)
+        self.assertEqual(len(threads), 4)
+        self.assertTrue(all(t is threading.main_thread() for t in threads))
+        bucket = RateLimitBucket.objects.get(key="facebook")
+        self.assertAlmostEqual(bucket.tokens, 10 - 4, delta=0.5)
+        self.assertFalse(
+            Integration.objects.exclude(access_token="fresh-token").exists()
+        )
+
+    def test_wait_exceeded_is_recorded_as_failure(self):
+        rate_limits.penalize("facebook", "", 60)
+        with override_settings(PROVIDER_RATE_LIMIT_MAX_WAIT=0):
+            stats = token_refresh.refresh_due(window=timedelta(minutes=30))
+
+        self.assertEqual(stats["failed"], 4)
+        self.assertEqual(stats["refreshed"], 0)
+        integ = Integration.objects.get(public_id="fb-0")
+        self.assertEqual(integ.access_token, "old-0")
+        self.assertIn("rate limit", integ.extra.get("refresh_error", ""))
@@ -0,0 +1,286 @@
+# integrations/token_refresh.py
+# -----------------------------------------------------------------------------
+# 목적:
+# - 만료가 가까운 연동 토큰을 사용자 요청 전에 미리 갱신 (refresh_integration_tokens)
+#
+# 흐름:
+# 1) (status, token_expires_at) 인덱스로 "활성 + window 안에 만료" 연동 id 를 스캔
+# 2) batch_size 단위로 선점(claim) 후 ThreadPoolExecutor 에서 갱신 요청
+#    - 선점: select_for_update(skip_locked) + refresh_locked_until 임대
+#      → 동시에 도는 다른 실행/단건 갱신 API 는 같은 연동을 건너뜀
+#        (refresh_token 이 회전하는 프로바이더에서 같은 토큰을 두 번 쓰지 않도록)
+#    - 워커 스레드는 HTTP 만 수행 (DB 접근은 메인 스레드에서만)
+#      · 속도 제한(rate_limits) 토큰도 제출 전에 메인 스레드에서 차감하고
+#        어댑터는 limited=False 로 호출 → 워커는 버킷 행을 건드리지 않음
+#      · 한도 안에 토큰을 못 얻은 연동은 제출하지 않고 일시 실패로 기록
+#      · 혹시 열린 DB 연결은 워커가 끝날 때 닫음
+#    - 프로바이더별 세마포어로 동시 요청 수 제한 + 프로바이더를 번갈아 제출
+#    - HTTP 는 integrations.providers 어댑터 (프로바이더별 커넥션 풀/재시도/브레이커)
+# 3) 결과를 연동마다 조건부 UPDATE 로 기록 (WHERE refresh_token = 요청에 쓴 토큰)
+#    - 그 사이 토큰이 바뀌었으면(재연결 등) 쓰지 않음 → conflict
+#    - 성공: access_token / refresh_token / token_expires_at 만 갱신
+#    - 영구 실패(invalid_grant): status='revoked' + 사유
+#    - 일시 실패: extra.refresh_error 기록 → 다음 스캔에서 재시도
+#    - extra 는 스캔 시점 값이 아니라 잠근 현재 행에 키만 더하거나 뺌
+#
+# 로컬 테스트:
+#   poetry run python manage.py run_token_stub_server --port 8766
+#   FB_GRAPH_BASE=http://127.0.0.1:8766 IG_GRAPH_BASE=http://127.0.0.1:8766 \
+#   poetry run python manage.py refresh_integration_tokens
+# -----------------------------------------------------------------------------
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import rate_limits
+from .models import Integration
+from .providers import ProviderError
+from .services import refresh_access_token
+
+# 결과별로 기록하는 컬럼 (extra 는 따로 병합)
+RESULT_FIELDS = {
+    "refreshed": ["access_token", "refresh_token", "token_expires_at"],
+    "revoked": ["status", "disconnected_at", "disconnect_reason"],
+    "failed": [],
+}
+
+
+def due_queryset(
+    window: timedelta,
+    now=None,
+    providers: Optional[Sequence[str]] = None,
+):
+    """활성 + 만료 시각이 now + window 이전 + refresh_token 보유 (만료 임박 순)"""
+    now = now or timezone.now()
+    qs = Integration.objects.filter(
+        status="active", token_expires_at__lte=now + window
+    ).exclude(refresh_token="")
+    if providers:
+        qs = qs.filter(provider__code__in=list(providers))
+    return qs.order_by("token_expires_at", "id")
+
+
+def _interleave(integrations: Iterable[Integration]) -> List[Integration]:
+    """프로바이더별로 번갈아 배치 → 한 프로바이더가 워커를 독차지하지 않도록"""
+    groups: Dict[str, List[Integration]] = {}
+    for integ in integrations:
+        groups.setdefault(integ.provider.code, []).append(integ)
+    return [integ for row in zip_longest(*groups.values()) for integ in row if integ]
+
+
+# ----------------------------
+# 선점 (임대)
+# ----------------------------
+def claim(ids: Sequence[int], now=None) -> List[int]:
+    """
+    임대가 비어 있거나 만료된 활성 연동을 선점하고 선점한 id 반환
+    - PostgreSQL: 다른 실행이 잠근 행은 skip_locked 로 건너뜀
+    - 잠금이 없는 DB(SQLite)도 임대 조건부 UPDATE 후 내 임대 값으로 다시 확인
+    """
+    now = now or timezone.now()
+    until = now + timedelta(seconds=settings.TOKEN_REFRESH_LEASE_SECONDS)
+    free = Q(refresh_locked_until__isnull=True) | Q(refresh_locked_until__lt=now)
+    with transaction.atomic():
+        candidates = list(
+            Integration.objects.select_for_update(skip_locked=True)
+            .filter(free, id__in=list(ids), status="active")
+            .values_list("id", flat=True)
+        )
+        if not candidates:
+            return []
+        Integration.objects.filter(free, id__in=candidates).update(
+            refresh_locked_until=until
+        )
+        return list(
+            Integration.objects.filter(
+                id__in=candidates, refresh_locked_until=until
+            ).values_list("id", flat=True)
+        )
+
+
+def release(ids: Sequence[int]) -> None:
+    if ids:
+        Integration.objects.filter(id__in=list(ids)).update(refresh_locked_until=None)
+
+
+# ----------------------------
+# 결과 반영
+# ----------------------------
+def apply_result(integ: Integration, result=None, error=None, now=None) -> str:
+    """
+    갱신 결과를 인스턴스의 토큰/상태 필드에 반영 (저장은 save_result)
+    반환: "refreshed" | "revoked" | "failed"
+    """
+    now = now or timezone.now()
+    if error is None:
+        integ.access_token = result["access_token"]
+        integ.refresh_token = result.get("refresh_token") or integ.refresh_token
+        integ.token_expires_at = result.get("expires_at")
+        return "refreshed"
+    if getattr(error, "permanent", False):
+        integ.status = "revoked"
+        integ.disconnected_at = now
+        integ.disconnect_reason = f"token refresh failed: {error}"
+        return "revoked"
+    return "failed"
+
+
+def _merge_extra(extra: Dict, error, now) -> Dict:
+    extra = dict(extra or {})
+    if error is None:
+        extra.pop("refresh_error", None)
+        extra["token_refreshed_at"] = now.isoformat()
+    else:
+        extra["refresh_error"] = str(error)
+        extra["refresh_failed_at"] = now.isoformat()
+    return extra
+
+
+def save_result(
+    integ: Integration, used_token: str, outcome: str, error=None, now=None
+) -> bool:
+    """
+    used_token 으로 갱신을 요청한 결과를 기록 + 임대 해제
+    - WHERE refresh_token = used_token: 그 사이 토큰이 바뀌었으면 쓰지 않고 False
+    - 토큰/상태는 결과별 컬럼만, extra 는 잠근 현재 행에 키만 병합
+    """
+    now = now or timezone.now()
+    current = Integration.objects.filter(pk=integ.pk, refresh_token=used_token)
+    with transaction.atomic():
+        row = current.select_for_update().values("extra").first()
+        if row is None:
+            return False
+        values = {f: getattr(integ, f) for f in RESULT_FIELDS[outcome]}
+        return (
+            current.update(
+                extra=_merge_extra(row["extra"], error, now),
+                refresh_locked_until=None,
+                **values,
+            )
+            == 1
+        )
+
+
+def refresh_one(integ: Integration) -> str:
+    """
+    단건 갱신 + 저장 (POST /integrations/{id}/refresh 용)
+    반환: apply_result 결과 | "busy"(다른 실행이 갱신 중) | "conflict"(그 사이 토큰 변경)
+    """
+    if not claim([integ.pk]):
+        return "busy"
+    used_token = integ.refresh_token
+    result, error = None, None
+    try:
+        result = refresh_access_token(integ.provider.code, used_token)
+    except ProviderError as e:
+        error = e
+    except Exception:
+        release([integ.pk])
+        raise
+    outcome = apply_result(integ, result, error)
+    if not save_result(integ, used_token, outcome, error):
+        release([integ.pk])
+        integ.refresh_from_db()
+        return "conflict"
+    return outcome
+
+
+def refresh_due(
+    window: Optional[timedelta] = None,
+    per_provider: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    batch_size: int = 200,
+    providers: Optional[Sequence[str]] = None,
+    dry_run: bool = False,
+    on_batch=None,
+) -> Dict:
+    """
+    만료 임박 연동을 모두 갱신
+    통계 dict 반환: due, refreshed, failed, revoked, by_provider
+    """
+    window = window or timedelta(minutes=settings.TOKEN_REFRESH_WINDOW_MINUTES)
+    per_provider = max(1, per_provider or settings.TOKEN_REFRESH_PER_PROVIDER)
+    max_workers = max(1, max_workers or settings.TOKEN_REFRESH_MAX_WORKERS)
+
+    # 스캔 시점 스냅샷 (갱신된 행은 window 밖으로 나가므로 id 목록으로 고정)
+    due = list(
+        due_queryset(window, providers=providers).values_list("id", "provider__code")
+    )
+    ids = [pk for pk, _ in due]
+    stats = {"due": len(ids), "refreshed": 0, "failed": 0, "revoked": 0}
+    stats.update(busy=0, conflict=0)
+    stats["by_provider"] = {}
+    for _, code in due:
+        by = stats["by_provider"].setdefault(
+            code, {"due": 0, "refreshed": 0, "failed": 0, "revoked": 0}
+        )
+        by["due"] += 1
+    if dry_run or not ids:
+        return stats
+
+    limits: Dict[str, threading.BoundedSemaphore] = {}
+
+    def call(code: str, refresh_token: str):
+        with limits[code]:
+            try:
+                return refresh_access_token(code, refresh_token, limited=False), None
+            except ProviderError as e:
+                return None, e
+            except Exception as e:  # 예상 못 한 오류도 일시 실패로 기록
+                return None, ProviderError(f"{code}: {e}")
+            finally:
+                connection.close()
+
+    def submit(pool: ThreadPoolExecutor, integ: Integration, refresh_token: str):
+        # 속도 제한 토큰은 메인 스레드에서 차감 (워커 스레드는 DB 에 접근하지 않음)
+        code = integ.provider.code
+        if not rate_limits.acquire(code):
+            error = ProviderError(f"{code}: rate limit wait exceeded")
+            future = Future()
+            future.set_result((None, error))
+            return future
+        return pool.submit(call, code, refresh_token)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start : start + batch_size]
+            claimed = claim(chunk)
+            # 다른 실행이 갱신 중이거나 그 사이 비활성화된 연동
+            stats["busy"] += len(chunk) - len(claimed)
+            if not claimed:
+                continue
+            batch = _interleave(
+                Integration.objects.filter(id__in=claimed)
+                .select_related("provider")
+                .order_by("token_expires_at", "id")
+            )
+            for integ in batch:
+                code = integ.provider.code
+                if code not in limits:
+                    limits[code] = threading.BoundedSemaphore(per_provider)
+            # 요청에 쓴 토큰 (조건부 UPDATE 의 기준)
+            used = {integ.pk: integ.refresh_token for integ in batch}
+            futures = [submit(pool, integ, used[integ.pk]) for integ in batch]
+
+            now = timezone.now()
+            lost = []
+            for integ, future in zip(batch, futures):
+                result, error = future.result()
+                outcome = apply_result(integ, result, error, now)
+                if not save_result(integ, used[integ.pk], outcome, error, now):
+                    lost.append(integ.pk)
+                    stats["conflict"] += 1
+                    continue
+                stats[outcome] += 1
+                stats["by_provider"][integ.provider.code][outcome] += 1
+            release(lost)
+            if on_batch:
+                on_batch(stats)
+    return stats
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# 인사이트 규칙 엔진 벤치마크
+# - 합성 매장 N곳(기본 10,000)의 28일 성과 frame 을 만들어 규칙 평가 속도 측정
+# - 순차(workers=1) vs 프로세스 풀(workers=W) 비교, 두 결과가 같은지도 확인
+# - DB 는 사용하지 않음 (ai_insights.engine.evaluate 의 계산 경로만 측정)
+#
+# 사용:
+#   poetry run python manage.py runscript bench_insight_engine
+#   poetry run python manage.py runscript bench_insight_engine --script-args 10000 8
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from ai_insights.engine import DEFAULT_DAYS, evaluate
+
+CHANNELS = ["instagram", "facebook", "naver"]
+
+
+def _synthetic_frame(rng: random.Random, n: int, start: date, days: int):
+    base = rng.randint(50_000, 500_000)
+    weekend_boost = rng.choice([1.0, 1.0, 1.8, 0.5])
+    surge = rng.choice([1.0, 1.0, 1.0, 1.5, 0.6])
+    channels = {}
+    for ch in rng.sample(CHANNELS, rng.randint(1, len(CHANNELS))):
+        decay = rng.choice([1.0, 1.0, 0.6])
+        spend = [rng.randint(8_000, 20_000) for _ in range(days)]
+        sales = [
+            int(s * rng.uniform(2.5, 4.0) * (decay if i >= days - 7 else 1.0))
+            for i, s in enumerate(spend)
+        ]
+        channels[ch] = {"sales": sales, "spend": spend}
+
+    sales = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        v = base * rng.uniform(0.85, 1.15)
+        if day.weekday() >= 5:
+            v *= weekend_boost
+        if i >= days - 7:
+            v *= surge
+        sales.append(int(v))
+    spend = [sum(c["spend"][i] for c in channels.values()) for i in range(days)]
+    return {
+        "store": f"store_{n:05d}",
+        "start": start,
+        "days": days,
+        "sales": sales,
+        "spend": spend,
+        "clicks": [s // 300 for s in spend],
+        "impressions": [s // 10 for s in spend],
+        "channels": channels,
+    }
+
+
+def _bench(frames, workers):
+    started = time.perf_counter()
+    results = [r for batch in evaluate(iter(frames), workers) for r in batch]
+    return time.perf_counter() - started, results
+
+
+def run(*args):
+    n = int(args[0]) if args else 10_000
+    workers = int(args[1]) if len(args) > 1 else (os.cpu_count() or 1)
+    rng = random.Random(42)
+    start = date(2025, 8, 1)
+    frames = [_synthetic_frame(rng, i, start, DEFAULT_DAYS) for i in range(n)]
+
+    t_serial, serial = _bench(frames, 1)
+    t_pool, pooled = _bench(frames, workers)
+    assert serial == pooled, "process pool result differs from serial run"
+
+    by_rule = {}
+    for _, findings in serial:
+        for f in findings:
+            by_rule[f["rule"]] = by_rule.get(f["rule"], 0) + 1
+
+    print(f"stores={n} days={DEFAULT_DAYS} findings={sum(by_rule.values())}")
+    for rule, cnt in sorted(by_rule.items()):
+        print(f"  {rule}: {cnt}")
+    print(f"  serial        : {t_serial:.2f}s ({n / t_serial:,.0f} stores/s)")
+    print(f"  pool(workers={workers}): {t_pool:.2f}s ({n / t_pool:,.0f} stores/s)")
+
+
+if __name__ == "__main__":
+    run(*sys.argv[1:])
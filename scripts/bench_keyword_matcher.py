@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# 키워드 매처 마이크로 벤치마크
+# - 선형 스캔(키워드마다 `in` 검사) vs Aho–Corasick(KeywordMatcher) 비교
+# - 두 방식의 결과가 같은지도 함께 확인
+#
+# 사용:
+#   poetry run python manage.py runscript bench_keyword_matcher
+#   poetry run python manage.py runscript bench_keyword_matcher --script-args 200000
+import random
+import sys
+import time
+
+from ai_insights.icons import TITLE_KEYWORD_EMOJI, TITLE_MATCHER
+from ai_insights.keyword_matcher import KeywordMatcher
+
+WORDS = [
+    "매출",
+    "상승",
+    "캠페인",
+    "제안",
+    "점심",
+    "브런치",
+    "고객",
+    "sns",
+    "재방문",
+    "오피스",
+    "테이크아웃",
+    "주말",
+    "데이터",
+    "분석",
+    "전환율",
+    "해피아워",
+]
+
+
+def _linear_factory(table):
+    upper = [(kw.upper(), emo) for kw, emo in table]
+
+    def linear(title):
+        t = title.upper()
+        for kw, emo in upper:
+            if kw in t:
+                return emo
+        return None
+
+    return linear
+
+
+def _bench(fn, texts):
+    started = time.perf_counter()
+    out = [fn(t) for t in texts]
+    return time.perf_counter() - started, out
+
+
+def _compare(label, table, matcher, texts):
+    t_linear, out_linear = _bench(_linear_factory(table), texts)
+    t_ac, out_ac = _bench(matcher.first, texts)
+    assert out_linear == out_ac, "matcher result differs from linear scan"
+
+    n = len(texts)
+    print(f"[{label}] texts={n} keywords={len(table)}")
+    print(f"  linear scan : {t_linear * 1e6 / n:.2f} us/text")
+    print(f"  aho-corasick: {t_ac * 1e6 / n:.2f} us/text")
+
+
+def run(*args):
+    n = int(args[0]) if args else 100_000
+    rng = random.Random(42)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(3, 12))) for _ in range(n)]
+
+    # 1) 현재 제목 키워드 표
+    _compare("title table", TITLE_KEYWORD_EMOJI, TITLE_MATCHER, texts)
+
+    # 2) 표가 커졌을 때 (합성 키워드 640개 + 기존 표)
+    synthetic = [(f"{w}{i}", "🔖") for i in range(40) for w in WORDS[:25]]
+    big_table = synthetic + TITLE_KEYWORD_EMOJI
+    big_matcher = KeywordMatcher(big_table, ignore_case=True)
+    _compare("large table", big_table, big_matcher, texts[: max(1, n // 10)])
+
+
+if __name__ == "__main__":
+    run(*sys.argv[1:])
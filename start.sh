@@ -4,4 +4,4 @@ echo "Applying Django migrations..."
 python manage.py migrate --noinput
 
 echo "Starting Gunicorn server..."
-exec gunicorn MoPT_backend.wsgi:application --bind 0.0.0.0:$PORT --workers 3
+exec gunicorn MoPT_backend.wsgi:application --bind 0.0.0.0:$PORT --workers 3 --threads ${GUNICORN_THREADS:-8}
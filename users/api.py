@@ -2,12 +2,14 @@ from datetime import timezone as dt_timezone
 from typing import Any, Dict, List, Optional
 
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from ninja import Query, Router, Schema
 from ninja.errors import HttpError
 from pydantic import BaseModel
 
+from home import counters
 from integrations.models import Integration  # 모델은 integrations에서 import
 
 from .models import (
@@ -51,6 +53,57 @@ def _to_iso_utc_z(dt):
     return dt.astimezone(dt_timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+# ---요청 단위 사용자 로더
+def _get_user(request, user_id: int, *related: str):
+    """
+    user_id 사용자 (없으면 404) — 같은 요청 안에서는 한 번만 조회
+    related: 같이 JOIN 할 1:1 관계 (예: "profile", "notification_settings")
+    """
+    loaded = request.__dict__.setdefault("_users_by_id", {})
+    user = loaded.get(user_id)
+    if user is None:
+        User = get_user_model()
+        try:
+            user = User.objects.select_related(*related).get(id=user_id)
+        except User.DoesNotExist:
+            raise HttpError(404, "User not found")
+        loaded[user_id] = user
+    return user
+
+
+def _one_to_one(user, attr: str, model, create: bool = False):
+    """
+    select_related 로 붙여 온 1:1 행
+    - 없으면 조회(GET)는 저장하지 않은 기본값 인스턴스, 수정은 create=True 로 생성
+      (행은 사용자 생성 시그널 / backfill_user_rows 가 만들어 둠)
+    """
+    try:
+        return getattr(user, attr)
+    except model.DoesNotExist:
+        if not create:
+            return model(user=user)
+        obj, _ = model.objects.get_or_create(user=user)
+        setattr(user, attr, obj)
+        return obj
+
+
+def _integration_item(integ: Integration) -> Dict[str, Any]:
+    return {
+        "integration_id": integ.public_id,
+        "provider": integ.provider.code,
+        "provider_label": integ.provider.label,
+        "account": {
+            "id": integ.account_id,
+            "name": integ.account_name or None,
+            "handle": integ.account_handle or None,
+            "avatar_url": (integ.extra or {}).get("avatar_url"),
+        },
+        "permissions": integ.permissions or [],
+        "connected_at": _to_iso_utc_z(integ.connected_at),
+        "status": integ.status,
+    }
+
+
 @users_router.get("/{user_id}/integrations", response=IntegrationListResponse)
 def list_user_integrations(request, user_id: int):
     qs = (
@@ -58,27 +111,7 @@ def list_user_integrations(request, user_id: int):
         .filter(user_id=user_id)
         .order_by("-connected_at")
     )
-
-    items: List[Dict[str, Any]] = []
-    for integ in qs:
-        items.append(
-            {
-                "integration_id": integ.public_id,
-                "provider": integ.provider.code,
-                "provider_label": integ.provider.label,
-                "account": {
-                    "id": integ.account_id,
-                    "name": integ.account_name or None,
-                    "handle": integ.account_handle or None,
-                    "avatar_url": (integ.extra or {}).get("avatar_url"),
-                },
-                "permissions": integ.permissions or [],
-                "connected_at": _to_iso_utc_z(integ.connected_at),
-                "status": integ.status,
-            }
-        )
-
-    return {"data": items}
+    return {"data": [_integration_item(integ) for integ in qs]}
 
 
 # ---연동해제
@@ -151,14 +184,10 @@ def get_user_profile(request, user_id: int):
     상세 프로필 조회
     GET /api/v1/users/{user_id}/profile
     """
-    User = get_user_model()
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        raise HttpError(404, "User not found")
+    user = _get_user(request, user_id, "profile")
 
-    # 프로필이 없으면 자동 생성(DB에서 가져오되 없으면 기본값)
-    profile, _ = UserProfile.objects.get_or_create(user=user)
+    # 읽기 전용: 프로필 행이 없으면 메모리 기본값
+    profile = _one_to_one(user, "profile", UserProfile)
 
     return UserProfileOut(
         nickname=profile.nickname or user.get_username(),
@@ -189,13 +218,8 @@ def update_user_profile(request, user_id: int, payload: UserProfileUpdateIn):
     PATCH /api/v1/users/{user_id}/profile
     body: { nickname?, profileImage? }
     """
-    User = get_user_model()
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        raise HttpError(404, "User not found")
-
-    profile, _ = UserProfile.objects.get_or_create(user=user)
+    user = _get_user(request, user_id, "profile")
+    profile = _one_to_one(user, "profile", UserProfile, create=True)
 
     # 변경 파트 (값이 전달된 항목만 업데이트)
     if payload.nickname is not None:
@@ -206,6 +230,10 @@ def update_user_profile(request, user_id: int, payload: UserProfileUpdateIn):
 
     profile.save()
 
+    return _profile_full_out(user, profile)
+
+
+def _profile_full_out(user, profile: UserProfile) -> UserProfileFullOut:
     return UserProfileFullOut(
         nickname=profile.nickname or user.get_username(),
         email=user.email or "",
@@ -234,13 +262,12 @@ class NotificationSettingsOut(Schema):
 # --- 현재 알림 설정값 조회 (GET) ---
 @router.get("/{user_id}/settings/notifications", response=NotificationSettingsOut)
 def get_notification_settings(request, user_id: int):
-    User = get_user_model()
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        raise HttpError(404, "User not found")
+    user = _get_user(request, user_id, "notification_settings")
+    settings = _one_to_one(user, "notification_settings", UserNotificationSetting)
+    return _notification_out(settings)
 
-    settings, _ = UserNotificationSetting.objects.get_or_create(user=user)
+
+def _notification_out(settings: UserNotificationSetting) -> NotificationSettingsOut:
     return NotificationSettingsOut(
         marketing_alerts=settings.marketing_alerts,
         ai_insights_notification=settings.ai_insights_notification,
@@ -253,23 +280,16 @@ def get_notification_settings(request, user_id: int):
 def update_notification_settings(
     request, user_id: int, payload: NotificationSettingsIn
 ):
-    User = get_user_model()
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        raise HttpError(404, "User not found")
-
-    settings, _ = UserNotificationSetting.objects.get_or_create(user=user)
+    user = _get_user(request, user_id, "notification_settings")
+    settings = _one_to_one(
+        user, "notification_settings", UserNotificationSetting, create=True
+    )
     settings.marketing_alerts = payload.marketing_alerts
     settings.ai_insights_notification = payload.ai_insights_notification
     settings.weekly_report_notification = payload.weekly_report_notification
     settings.save()
 
-    return NotificationSettingsOut(
-        marketing_alerts=settings.marketing_alerts,
-        ai_insights_notification=settings.ai_insights_notification,
-        weekly_report_notification=settings.weekly_report_notification,
-    )
+    return _notification_out(settings)
 
 
 # ---현재 요금제 조회
@@ -282,17 +302,15 @@ class SubscriptionOut(Schema):
 
 @router.get("/{user_id}/billing/subscription", response=SubscriptionOut)
 def get_subscription(request, user_id: int):
-    User = get_user_model()
+    user = _get_user(request, user_id, "subscription")
     try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        raise HttpError(404, "User not found")
-
-    try:
-        sub = Subscription.objects.get(user=user)
+        sub = user.subscription
     except Subscription.DoesNotExist:
         raise HttpError(404, "Subscription not found")
+    return _subscription_out(sub)
 
+
+def _subscription_out(sub: Subscription) -> SubscriptionOut:
     return SubscriptionOut(
         plan_name=sub.plan_name,
         monthly_price=sub.monthly_price,
@@ -314,26 +332,20 @@ class PaymentMethodOut(Schema):
 # --- 결제 카드 목록 조회 ---
 @router.get("/{user_id}/billing/payment-methods", response=List[PaymentMethodOut])
 def list_payment_methods(request, user_id: int):
-
-    User = get_user_model()
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        raise HttpError(404, "User not found")
-
+    user = _get_user(request, user_id)
     methods = PaymentMethod.objects.filter(user=user).order_by(
         "-is_default", "-created_at"
     )
+    return [_payment_method_out(m) for m in methods]
 
-    return [
-        PaymentMethodOut(
-            method_id=m.method_id,
-            card_type=m.card_type,
-            masked_number=m.masked_number,  # 모델의 @property 사용
-            is_default=m.is_default,
-        )
-        for m in methods
-    ]
+
+def _payment_method_out(m: PaymentMethod) -> PaymentMethodOut:
+    return PaymentMethodOut(
+        method_id=m.method_id,
+        card_type=m.card_type,
+        masked_number=m.masked_number,  # 모델의 @property 사용
+        is_default=m.is_default,
+    )
 
 
 class BillingHistoryItem(Schema):
@@ -349,24 +361,83 @@ def get_billing_history(request, user_id: int):
     결제 내역 조회
     GET /api/v1/users/{user_id}/billing/history
     """
+    user = _get_user(request, user_id)
+    invoices = BillingInvoice.objects.filter(user=user).order_by("-paid_at")
+    return [_invoice_out(inv) for inv in invoices]
+
+
+def _invoice_out(inv: BillingInvoice) -> BillingHistoryItem:
+    # 명세서 형식: payment_date는 "YYYY-MM-DD"
+    return BillingHistoryItem(
+        invoice_id=inv.invoice_id,
+        payment_date=inv.paid_at.date().isoformat(),
+        amount=inv.amount,
+        plan_name=inv.plan_name,
+    )
+
+
+# ---내 계정 화면 한 번에 조회
+class AccountOverviewOut(Schema):
+    profile: UserProfileFullOut
+    notifications: NotificationSettingsOut
+    subscription: Optional[SubscriptionOut] = None  # 구독 없으면 null
+    payment_methods: List[PaymentMethodOut]
+    billing_history: List[BillingHistoryItem]
+    integrations: List[IntegrationListItemOut]
+
+
+@router.get("/{user_id}/account", response=AccountOverviewOut)
+def get_account_overview(request, user_id: int):
+    """
+    내 계정 화면 전체 (프로필/알림 설정/요금제/결제수단/결제내역/연동 목록)
+    GET /api/v1/users/{user_id}/account
+    - 쿼리 4번 고정: 사용자+1:1 행 JOIN 1번, 목록 prefetch 3번 (쓰기 없음)
+    """
     User = get_user_model()
     try:
-        user = User.objects.get(id=user_id)
+        user = (
+            User.objects.select_related(
+                "profile", "notification_settings", "subscription"
+            )
+            .prefetch_related(
+                Prefetch(
+                    "payment_methods",
+                    queryset=PaymentMethod.objects.order_by(
+                        "-is_default", "-created_at"
+                    ),
+                ),
+                Prefetch(
+                    "billing_invoices",
+                    queryset=BillingInvoice.objects.order_by("-paid_at"),
+                ),
+                Prefetch(
+                    "integrations",
+                    queryset=Integration.objects.select_related("provider").order_by(
+                        "-connected_at"
+                    ),
+                ),
+            )
+            .get(id=user_id)
+        )
     except User.DoesNotExist:
         raise HttpError(404, "User not found")
+    request.__dict__.setdefault("_users_by_id", {})[user_id] = user
 
-    invoices = BillingInvoice.objects.filter(user=user).order_by("-paid_at")
+    try:
+        subscription = _subscription_out(user.subscription)
+    except Subscription.DoesNotExist:
+        subscription = None
 
-    # 명세서 형식: payment_date는 "YYYY-MM-DD"
-    return [
-        BillingHistoryItem(
-            invoice_id=inv.invoice_id,
-            payment_date=inv.paid_at.date().isoformat(),
-            amount=inv.amount,
-            plan_name=inv.plan_name,
-        )
-        for inv in invoices
-    ]
+    return AccountOverviewOut(
+        profile=_profile_full_out(user, _one_to_one(user, "profile", UserProfile)),
+        notifications=_notification_out(
+            _one_to_one(user, "notification_settings", UserNotificationSetting)
+        ),
+        subscription=subscription,
+        payment_methods=[_payment_method_out(m) for m in user.payment_methods.all()],
+        billing_history=[_invoice_out(inv) for inv in user.billing_invoices.all()],
+        integrations=[_integration_item(i) for i in user.integrations.all()],
+    )
 
 
 # 공지사항목록조회
@@ -402,7 +473,8 @@ def list_user_notices(request, user_id: int, page: int = 1, limit: int = 6):
 
     qs = Notice.objects.all().order_by("-created_at")
 
-    total = qs.count()
+    # 전체 개수는 카운터 캐시에서 O(1) 조회
+    total = counters.get_count(counters.NOTICES_TOTAL)
     start = (page - 1) * limit
     end = start + limit
     slice_qs = qs[start:end]
@@ -442,9 +514,7 @@ def get_notice_detail(request, user_id: int, notice_id: str):
     - notice_id 는 Notice.public_id
     """
     # (선택) 유저 존재 확인 — 없으면 404
-    User = get_user_model()
-    if not User.objects.filter(id=user_id).exists():
-        raise HttpError(404, "User not found")
+    _get_user(request, user_id)
 
     # 공지 조회
     try:
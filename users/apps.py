@@ -6,10 +6,11 @@ class UsersConfig(AppConfig):
     name = "users"
 
     def ready(self):
-        # post_migrate 시그널 연결만 담당
-        from .signals import connect_post_migrate
+        # post_migrate 시드 + 사용자 생성 시 프로필/알림 설정 행 생성 시그널 연결
+        from .signals import connect_post_migrate, connect_user_row_signals
 
         connect_post_migrate()
+        connect_user_row_signals()
 
         # 마이그레이션/관리 명령 중엔 건너뛰기(원하면 제거 가능)
         import sys
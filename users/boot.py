@@ -1,7 +1,11 @@
 # users/boot.py
+from typing import Iterable, Optional, Tuple
+
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from .models import UserNotificationSetting, UserProfile
+
 
 def ensure_seed_users():
     """
@@ -28,3 +32,26 @@ def ensure_seed_users():
                 "is_superuser": False,
             },
         )
+
+
+def ensure_user_rows(user_ids: Optional[Iterable[int]] = None) -> Tuple[int, int]:
+    """
+    사용자별 1:1 행(프로필 / 알림 설정)이 없으면 기본값으로 생성 (idempotent)
+    - user_ids 를 주면 그 사용자만, 없으면 전체
+    - 반환: (만든 프로필 수, 만든 알림 설정 수)
+    """
+    User = get_user_model()
+    ids = User.objects.values_list("id", flat=True)
+    if user_ids is not None:
+        ids = ids.filter(id__in=list(user_ids))
+    created = []
+    for model in (UserProfile, UserNotificationSetting):
+        missing = list(ids.exclude(id__in=model.objects.values("user_id")))
+        # 동시에 다른 곳에서 만들었으면 무시 (user 는 OneToOne → unique)
+        model.objects.bulk_create(
+            [model(user_id=uid) for uid in missing],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        created.append(len(missing))
+    return created[0], created[1]
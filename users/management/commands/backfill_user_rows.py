@@ -0,0 +1,50 @@
+# users/management/commands/backfill_user_rows.py
+# ------------------------------------------------------------
+# 목적:
+# - 프로필(UserProfile) / 알림 설정(UserNotificationSetting) 행이 없는 사용자에게
+#   기본값 행을 만들어 줍니다. (users.boot.ensure_user_rows)
+# - 새 사용자는 post_save 시그널이 바로 만들기 때문에, 시그널 도입 전 사용자나
+#   bulk_create/raw SQL 등 시그널을 타지 않고 만든 사용자에 한 번 실행
+#
+# 사용 예:
+#   poetry run python manage.py backfill_user_rows
+#   poetry run python manage.py backfill_user_rows --dry-run
+# ------------------------------------------------------------
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from users.boot import ensure_user_rows
+from users.models import UserNotificationSetting, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Create missing profile / notification-setting rows for existing users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="만들지 않고 행이 없는 사용자 수만 출력합니다.",
+        )
+
+    def handle(self, *args, **opts):
+        User = get_user_model()
+        users = User.objects.all()
+        if opts["dry_run"]:
+            self.stdout.write(self.style.WARNING("** DRY-RUN 모드로 실행합니다 **"))
+            for label, model in (
+                ("프로필", UserProfile),
+                ("알림 설정", UserNotificationSetting),
+            ):
+                missing = users.exclude(id__in=model.objects.values("user_id")).count()
+                self.stdout.write(f"{label} 없는 사용자: {missing}")
+            self.stdout.write(self.style.SUCCESS("완료."))
+            return
+
+        profiles, notification_settings = ensure_user_rows()
+
+        self.stdout.write(self.style.SUCCESS("=== backfill_user_rows 결과 ==="))
+        self.stdout.write(f"사용자: {users.count()}")
+        self.stdout.write(f"프로필 생성: {profiles}")
+        self.stdout.write(f"알림 설정 생성: {notification_settings}")
+        self.stdout.write(self.style.SUCCESS("완료."))
@@ -1,7 +1,8 @@
 # users/signals.py
 import os
 
-from django.db.models.signals import post_migrate
+from django.conf import settings
+from django.db.models.signals import post_migrate, post_save
 
 
 # 시드 실행 함수
@@ -30,3 +31,28 @@ def connect_post_migrate():
     dispatch_uid = "users_post_migrate_seed"
     post_migrate.disconnect(_run_seed, sender=None, dispatch_uid=dispatch_uid)
     post_migrate.connect(_run_seed, sender=None, dispatch_uid=dispatch_uid, weak=False)
+
+
+# 사용자 생성 시 프로필 / 알림 설정 행을 바로 만듦
+# → 조회(GET) 엔드포인트는 get_or_create 없이 읽기만 함
+#   (bulk_create 등 시그널을 안 타는 생성은 backfill_user_rows 로 채움)
+def _create_user_rows(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    from .models import UserNotificationSetting, UserProfile
+
+    # 새 사용자라 행이 없음 → 조회 없이 INSERT 2번 (이미 있으면 무시)
+    for model in (UserProfile, UserNotificationSetting):
+        model.objects.bulk_create([model(user=instance)], ignore_conflicts=True)
+
+
+def connect_user_row_signals():
+    """
+    시그널 중복 연결 방지 + 연결
+    """
+    post_save.connect(
+        _create_user_rows,
+        sender=settings.AUTH_USER_MODEL,
+        dispatch_uid="users_create_user_rows",
+        weak=False,
+    )